@@ -0,0 +1,41 @@
+"""add_streak_summaries
+
+Revision ID: 3f1c2b9d7e41
+Revises: a68d4197aae1
+Create Date: 2026-10-18 09:12:40.418213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2b9d7e41'
+down_revision: Union[str, Sequence[str], None] = 'a68d4197aae1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('streak_summaries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('habit_id', sa.Integer(), nullable=True),
+    sa.Column('last_run_start', sa.Date(), nullable=True),
+    sa.Column('last_run_end', sa.Date(), nullable=True),
+    sa.Column('longest_run_start', sa.Date(), nullable=True),
+    sa.Column('longest_run_end', sa.Date(), nullable=True),
+    sa.Column('longest_run_length', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['habit_id'], ['habits.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('uq_streakSummary_scope', 'streak_summaries', [sa.text('coalesce(habit_id, 0)')], unique=True)
+    # rows are filled by the build_streak_summaries revision, once the entry date keys exist
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_streakSummary_scope', table_name='streak_summaries')
+    op.drop_table('streak_summaries')
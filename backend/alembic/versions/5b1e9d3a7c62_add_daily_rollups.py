@@ -0,0 +1,49 @@
+"""add_daily_rollups
+
+Revision ID: 5b1e9d3a7c62
+Revises: d2a97f3c5b80
+Create Date: 2026-10-18 16:52:37.481920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e9d3a7c62'
+down_revision: Union[str, Sequence[str], None] = 'd2a97f3c5b80'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('daily_rollups',
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('completion_sum', sa.Float(), nullable=False),
+    sa.Column('completed_count', sa.Integer(), nullable=False),
+    sa.Column('active_habit_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('date')
+    )
+    # backfill, same aggregate as backend.app.rollups
+    op.execute("""
+        INSERT INTO daily_rollups (date, completion_sum, completed_count, active_habit_count)
+        SELECT
+            habit_entries.date,
+            sum(CASE
+                WHEN habits.type = 'simple' THEN CASE WHEN habit_entries.value >= 1 THEN 100.0 ELSE 0.0 END
+                WHEN habits.type = 'measurable' AND habits.target > 0 THEN min(100.0, habit_entries.value / habits.target * 100)
+                ELSE 0.0
+            END),
+            sum(CASE WHEN habit_entries.is_completed = 1 THEN 1 ELSE 0 END),
+            count(*)
+        FROM habit_entries JOIN habits ON habit_entries.habit_id = habits.id
+        GROUP BY habit_entries.date
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_rollups')
@@ -0,0 +1,41 @@
+"""unique_habit_entry_per_day
+
+Revision ID: 8c4e0a6b2d17
+Revises: 3f1c2b9d7e41
+Create Date: 2026-10-18 10:03:27.551904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4e0a6b2d17'
+down_revision: Union[str, Sequence[str], None] = '3f1c2b9d7e41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # keep the most recently written row for every (habit_id, date) pair
+    op.execute(
+        """
+        DELETE FROM habit_entries
+        WHERE id NOT IN (
+            SELECT max(id) FROM habit_entries GROUP BY habit_id, date
+        )
+        """
+    )
+    op.drop_index('idx_habitId_date', table_name='habit_entries')
+    op.create_index('uq_habitEntry_habitId_date', 'habit_entries', ['habit_id', 'date'], unique=True)
+    # duplicates may have been part of a streak run, summaries are rebuilt by the build_streak_summaries revision
+    op.execute("DELETE FROM streak_summaries")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_habitEntry_habitId_date', table_name='habit_entries')
+    op.create_index('idx_habitId_date', 'habit_entries', ['habit_id', 'date'], unique=False)
@@ -0,0 +1,46 @@
+"""add_entry_date_keys
+
+Revision ID: 8c4f2e6a1d95
+Revises: 5b1e9d3a7c62
+Create Date: 2026-10-18 18:21:05.214377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4f2e6a1d95'
+down_revision: Union[str, Sequence[str], None] = '5b1e9d3a7c62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# copied rather than imported, so the migration keeps working if the model changes
+DAY_ORDINAL_SQL = "CAST(julianday(date) - 1721424.5 AS INTEGER)"
+WEEK_KEY_SQL = "CAST(strftime('%Y', date) AS INTEGER) * 100 + CAST(strftime('%W', date) AS INTEGER)"
+MONTH_KEY_SQL = "CAST(strftime('%Y', date) AS INTEGER) * 100 + CAST(strftime('%m', date) AS INTEGER)"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # VIRTUAL columns need no backfill, their values are only stored in the indexes below
+    op.add_column('habit_entries', sa.Column('day_ordinal', sa.Integer(), sa.Computed(DAY_ORDINAL_SQL, persisted=False), nullable=True))
+    op.add_column('habit_entries', sa.Column('week_key', sa.Integer(), sa.Computed(WEEK_KEY_SQL, persisted=False), nullable=True))
+    op.add_column('habit_entries', sa.Column('month_key', sa.Integer(), sa.Computed(MONTH_KEY_SQL, persisted=False), nullable=True))
+    op.create_index('idx_habitId_completed_dayOrdinal', 'habit_entries', ['habit_id', 'is_completed', 'day_ordinal'], unique=False)
+    op.create_index('idx_completed_dayOrdinal', 'habit_entries', ['is_completed', 'day_ordinal'], unique=False)
+    op.create_index('idx_habitId_weekKey_completed', 'habit_entries', ['habit_id', 'week_key', 'is_completed', 'day_ordinal'], unique=False)
+    op.create_index('idx_habitId_monthKey_completed', 'habit_entries', ['habit_id', 'month_key', 'is_completed', 'day_ordinal'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_habitId_monthKey_completed', table_name='habit_entries')
+    op.drop_index('idx_habitId_weekKey_completed', table_name='habit_entries')
+    op.drop_index('idx_completed_dayOrdinal', table_name='habit_entries')
+    op.drop_index('idx_habitId_completed_dayOrdinal', table_name='habit_entries')
+    op.drop_column('habit_entries', 'month_key')
+    op.drop_column('habit_entries', 'week_key')
+    op.drop_column('habit_entries', 'day_ordinal')
@@ -0,0 +1,71 @@
+"""build_streak_summaries
+
+Revision ID: b4d8e2f6a913
+Revises: e7a3c5d9b214
+Create Date: 2026-10-18 21:04:16.502318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4d8e2f6a913'
+down_revision: Union[str, Sequence[str], None] = 'e7a3c5d9b214'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # one summary per habit plus the overall row, same runs as backend.app.streaks.rebuild_summary;
+    # reads no longer build missing summaries
+    op.execute("""
+        INSERT INTO streak_summaries (habit_id, last_run_start, last_run_end, longest_run_start, longest_run_end, longest_run_length)
+        WITH completed_days AS (
+            SELECT habit_id, date, day_ordinal FROM habit_entries WHERE is_completed = 1
+            UNION ALL
+            SELECT DISTINCT NULL, date, day_ordinal FROM habit_entries WHERE is_completed = 1
+        ),
+        runs AS (
+            SELECT habit_id, min(date) AS run_start, max(date) AS run_end, count(*) AS run_length
+            FROM (
+                SELECT habit_id, date, day_ordinal - row_number() OVER (PARTITION BY habit_id ORDER BY day_ordinal) AS run_id
+                FROM completed_days
+            )
+            GROUP BY habit_id, run_id
+        ),
+        ranked_runs AS (
+            SELECT
+                runs.*,
+                row_number() OVER (PARTITION BY habit_id ORDER BY run_end DESC) AS last_rank,
+                row_number() OVER (PARTITION BY habit_id ORDER BY run_length DESC, run_end DESC) AS longest_rank
+            FROM runs
+        ),
+        scopes AS (
+            SELECT id AS habit_id FROM habits
+            UNION ALL
+            SELECT NULL
+        )
+        SELECT
+            scopes.habit_id,
+            last_run.run_start,
+            last_run.run_end,
+            longest_run.run_start,
+            longest_run.run_end,
+            coalesce(longest_run.run_length, 0)
+        FROM scopes
+        LEFT JOIN ranked_runs AS last_run ON last_run.habit_id IS scopes.habit_id AND last_run.last_rank = 1
+        LEFT JOIN ranked_runs AS longest_run ON longest_run.habit_id IS scopes.habit_id AND longest_run.longest_rank = 1
+        WHERE NOT EXISTS (
+            SELECT 1 FROM streak_summaries WHERE coalesce(streak_summaries.habit_id, 0) = coalesce(scopes.habit_id, 0)
+        )
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # the rows stay valid for the previous revision, which only built missing ones lazily
+    pass
@@ -0,0 +1,29 @@
+"""rename_rollup_entry_count
+
+Revision ID: c9f3a1e7d520
+Revises: b4d8e2f6a913
+Create Date: 2026-10-18 21:37:52.114906
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9f3a1e7d520'
+down_revision: Union[str, Sequence[str], None] = 'b4d8e2f6a913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # the column always held count(*) of the day's entries, not the habits active that day
+    op.alter_column('daily_rollups', 'active_habit_count', new_column_name='entry_count')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('daily_rollups', 'entry_count', new_column_name='active_habit_count')
@@ -0,0 +1,29 @@
+"""drop_habit_date_covering_index
+
+Revision ID: d1e6b8c4f372
+Revises: c9f3a1e7d520
+Create Date: 2026-10-18 22:05:31.740129
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1e6b8c4f372'
+down_revision: Union[str, Sequence[str], None] = 'c9f3a1e7d520'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # same leading key as uq_habitEntry_habitId_date, every upsert maintained both
+    op.drop_index('idx_habitId_date_completed_value', table_name='habit_entries')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('idx_habitId_date_completed_value', 'habit_entries', ['habit_id', 'date', 'is_completed', 'value'], unique=False)
@@ -0,0 +1,30 @@
+"""index_streak_summary_habit_id
+
+Revision ID: e3b7d9a1f648
+Revises: d1e6b8c4f372
+Create Date: 2026-10-18 23:12:47.318904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b7d9a1f648'
+down_revision: Union[str, Sequence[str], None] = 'd1e6b8c4f372'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # uq_streakSummary_scope indexes coalesce(habit_id, 0), deleting a habit filtered on the plain column
+    # and scanned the table three times (summary delete, relationship load, foreign key check)
+    op.create_index('idx_streakSummary_habitId', 'streak_summaries', ['habit_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_streakSummary_habitId', table_name='streak_summaries')
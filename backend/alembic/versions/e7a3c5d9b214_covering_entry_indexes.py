@@ -0,0 +1,44 @@
+"""covering_entry_indexes
+
+Revision ID: e7a3c5d9b214
+Revises: 8c4f2e6a1d95
+Create Date: 2026-10-18 19:07:42.836150
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a3c5d9b214'
+down_revision: Union[str, Sequence[str], None] = '8c4f2e6a1d95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index('idx_date', table_name='habit_entries')
+    op.drop_index('idx_isCompleted', table_name='habit_entries')
+    op.drop_index('idx_habitId_completed', table_name='habit_entries')
+    op.drop_index('idx_habitId_completed_dayOrdinal', table_name='habit_entries')
+    op.drop_index('idx_completed_dayOrdinal', table_name='habit_entries')
+    op.create_index('idx_habitId_date_completed_value', 'habit_entries', ['habit_id', 'date', 'is_completed', 'value'], unique=False)
+    op.create_index('idx_date_habitId_completed_value', 'habit_entries', ['date', 'habit_id', 'is_completed', 'value'], unique=False)
+    op.create_index('idx_completedOnly_habitId_dayOrdinal', 'habit_entries', ['habit_id', 'day_ordinal'], unique=False, sqlite_where=sa.text('is_completed = 1'))
+    op.create_index('idx_completedOnly_dayOrdinal', 'habit_entries', ['day_ordinal'], unique=False, sqlite_where=sa.text('is_completed = 1'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_completedOnly_dayOrdinal', table_name='habit_entries')
+    op.drop_index('idx_completedOnly_habitId_dayOrdinal', table_name='habit_entries')
+    op.drop_index('idx_date_habitId_completed_value', table_name='habit_entries')
+    op.drop_index('idx_habitId_date_completed_value', table_name='habit_entries')
+    op.create_index('idx_completed_dayOrdinal', 'habit_entries', ['is_completed', 'day_ordinal'], unique=False)
+    op.create_index('idx_habitId_completed_dayOrdinal', 'habit_entries', ['habit_id', 'is_completed', 'day_ordinal'], unique=False)
+    op.create_index('idx_habitId_completed', 'habit_entries', ['habit_id', 'is_completed'], unique=False)
+    op.create_index('idx_isCompleted', 'habit_entries', ['is_completed'], unique=False)
+    op.create_index('idx_date', 'habit_entries', ['date'], unique=False)
@@ -0,0 +1,201 @@
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from datetime import date
+from typing import Callable, Iterable, NamedTuple
+
+from backend.app.config import (
+    INSIGHTS_CACHE_ENABLED,
+    INSIGHTS_CACHE_BACKEND,
+    INSIGHTS_CACHE_MAX_ENTRIES,
+    INSIGHTS_CACHE_TTL_SECONDS,
+)
+
+
+class CacheEntry(NamedTuple):
+    value: object
+    expires_at: float
+    habit_id: int | None  # None: depends on every habit
+    start_date: date | None  # None: depends on the whole history
+    end_date: date | None
+
+    def depends_on(self, habit_id: int | None, day: date | None) -> bool:
+        if habit_id is not None and self.habit_id is not None and self.habit_id != habit_id:
+            return False
+        if day is None or self.start_date is None:
+            return True
+        return self.start_date <= day <= self.end_date
+
+
+class CacheBackend:
+    def get(self, key: str) -> CacheEntry | None:
+        raise NotImplementedError
+
+    def set(self, key: str, entry: CacheEntry, generation: int):
+        raise NotImplementedError
+
+    def invalidate(self, changes: Iterable[tuple[int | None, date | None]]) -> int:
+        raise NotImplementedError
+
+    def generation(self) -> int:
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        raise NotImplementedError
+
+
+class LocalCacheBackend(CacheBackend):
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                self._counters["expirations"] += 1
+                self._counters["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return entry
+
+    def set(self, key: str, entry: CacheEntry, generation: int):
+        with self._lock:
+            # a write landed while the value was computed, it may already be stale
+            if generation != self._generation:
+                return
+
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def invalidate(self, changes: Iterable[tuple[int | None, date | None]]) -> int:
+        changes = list(changes)
+        with self._lock:
+            self._generation += 1
+            stale_keys = [
+                key for key, entry in self._entries.items()
+                if any(entry.depends_on(habit_id, day) for habit_id, day in changes)
+            ]
+            for key in stale_keys:
+                del self._entries[key]
+            self._counters["invalidations"] += len(stale_keys)
+            return len(stale_keys)
+
+    def generation(self) -> int:
+        return self._generation
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "local",
+                "size": len(self._entries),
+                "max_size": self.max_entries,
+                **self._counters,
+            }
+
+
+# a backend shared between workers (e.g. a cache server client) registers a factory here
+CACHE_BACKENDS: dict[str, Callable[[int], CacheBackend]] = {
+    "local": LocalCacheBackend,
+}
+
+
+def register_cache_backend(name: str, factory: Callable[[int], CacheBackend]):
+    CACHE_BACKENDS[name] = factory
+
+
+insight_cache: CacheBackend = CACHE_BACKENDS[INSIGHTS_CACHE_BACKEND](INSIGHTS_CACHE_MAX_ENTRIES)
+
+
+# the data version the current request's ETag was built from, set by etag.etag_guard. Values are cached per
+# data version: invalidation only reaches the worker that handled the write, and another worker must not serve
+# a body older than the ETag it sends with it
+request_data_version: ContextVar[int | None] = ContextVar("request_data_version", default=None)
+
+
+def _get_data_version(db) -> int:
+    data_version = request_data_version.get()
+    if data_version is None:
+        # called outside an ETag guarded request (reports, benches)
+        from backend.app.crud import get_data_version
+        data_version = get_data_version(db)
+    return data_version
+
+
+def _make_key(endpoint: str, params: dict, data_version: int) -> str:
+    return f"{endpoint}@{data_version}?" + "&".join(f"{name}={params[name]}" for name in sorted(params))
+
+
+def cached(
+        endpoint: str,
+        habit_arg: str | None = None,
+        start_arg: str | None = None,
+        end_arg: str | None = None
+):
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(db, *args, **kwargs):
+            if not INSIGHTS_CACHE_ENABLED:
+                return fn(db, *args, **kwargs)
+
+            bound = signature.bind(db, *args, **kwargs)
+            bound.apply_defaults()
+            params = {name: value for name, value in bound.arguments.items() if name != "db"}
+            key = _make_key(endpoint, params, _get_data_version(db))
+
+            entry = insight_cache.get(key)
+            if entry is not None:
+                return entry.value
+
+            generation = insight_cache.generation()
+            value = fn(db, *args, **kwargs)
+            insight_cache.set(
+                key,
+                CacheEntry(
+                    value=value,
+                    expires_at=time.monotonic() + INSIGHTS_CACHE_TTL_SECONDS,
+                    habit_id=params[habit_arg] if habit_arg else None,
+                    start_date=params[start_arg] if start_arg else None,
+                    end_date=params[end_arg] if end_arg else None,
+                ),
+                generation
+            )
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate_entries(changes: Iterable[tuple[int, date]]):
+    insight_cache.invalidate(changes)
+
+
+def invalidate_habit(habit_id: int):
+    insight_cache.invalidate([(habit_id, None)])
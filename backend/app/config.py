@@ -1,18 +1,97 @@
 import os
-from dotenv import load_dotenv
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+DOTENV_PATH = BASE_DIR / ".env"
+# deployments configured through the environment alone skip importing python-dotenv
+if DOTENV_PATH.exists():
+    from dotenv import load_dotenv
+
+    load_dotenv(dotenv_path=DOTENV_PATH)
+
 DB_NAME = "habit-tracker.db"
-DB_PATH = BASE_DIR / DB_NAME
+DB_PATH = Path(os.getenv("DB_PATH", BASE_DIR / DB_NAME))
 DB_URL = f"sqlite:///{DB_PATH}"
-
-DOTENV_PATH = BASE_DIR / ".env"
-load_dotenv(dotenv_path=DOTENV_PATH)
+ASYNC_DB_URL = f"sqlite+aiosqlite:///{DB_PATH}"
 
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
 OPENROUTER_MODEL = os.getenv("OPENROUTER_MODEL")
 OPENROUTER_URL = os.getenv("OPENROUTER_URL")
 FRONTEND_URL = os.getenv("FRONTEND_URL")
-LOCAL_CORS_ORIGIN = os.getenv("LOCAL_CORS_ORIGIN")
\ No newline at end of file
+LOCAL_CORS_ORIGIN = os.getenv("LOCAL_CORS_ORIGIN")
+
+# quote upstream: one pooled client per worker, calls past the concurrency limit or while the breaker is open
+# get the default quote
+QUOTE_CONNECT_TIMEOUT_SECONDS = float(os.getenv("QUOTE_CONNECT_TIMEOUT_SECONDS", 3))
+QUOTE_READ_TIMEOUT_SECONDS = float(os.getenv("QUOTE_READ_TIMEOUT_SECONDS", 10))
+QUOTE_MAX_CONCURRENCY = int(os.getenv("QUOTE_MAX_CONCURRENCY", 4))
+QUOTE_BREAKER_FAILURES = int(os.getenv("QUOTE_BREAKER_FAILURES", 3))
+QUOTE_BREAKER_RESET_SECONDS = float(os.getenv("QUOTE_BREAKER_RESET_SECONDS", 30))
+# pre-generated quotes per habit name set, refilled in the background once fewer than the watermark are left
+QUOTE_CACHE_ENABLED = os.getenv("QUOTE_CACHE_ENABLED", "true").lower() == "true"
+QUOTE_POOL_SIZE = int(os.getenv("QUOTE_POOL_SIZE", 5))
+QUOTE_POOL_LOW_WATERMARK = int(os.getenv("QUOTE_POOL_LOW_WATERMARK", 2))
+QUOTE_CACHE_MAX_KEYS = int(os.getenv("QUOTE_CACHE_MAX_KEYS", 16))
+QUOTE_CACHE_KEY_TTL_SECONDS = float(os.getenv("QUOTE_CACHE_KEY_TTL_SECONDS", 60))
+
+# serve requests through SQLAlchemy asyncio (aiosqlite) instead of the sync engine, Alembic always stays sync
+DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() == "true"
+
+# in-process cache for insight responses, invalidated by the crud write paths
+INSIGHTS_CACHE_ENABLED = os.getenv("INSIGHTS_CACHE_ENABLED", "true").lower() == "true"
+INSIGHTS_CACHE_BACKEND = os.getenv("INSIGHTS_CACHE_BACKEND", "local")
+INSIGHTS_CACHE_MAX_ENTRIES = int(os.getenv("INSIGHTS_CACHE_MAX_ENTRIES", 1024))
+INSIGHTS_CACHE_TTL_SECONDS = float(os.getenv("INSIGHTS_CACHE_TTL_SECONDS", 60))
+
+# per-route limits plus a per-client budget that expensive routes draw more from. "memory" keeps the counters
+# in each worker (bounded LRU), "sqlite" shares them between the workers of a host through RATE_LIMIT_SQLITE_PATH
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_STORAGE = os.getenv("RATE_LIMIT_STORAGE", "memory").lower()
+RATE_LIMIT_CLIENT_BUDGET = os.getenv("RATE_LIMIT_CLIENT_BUDGET", "300/minute")
+RATE_LIMIT_MEMORY_MAX_KEYS = int(os.getenv("RATE_LIMIT_MEMORY_MAX_KEYS", 10000))
+RATE_LIMIT_SQLITE_PATH = Path(os.getenv("RATE_LIMIT_SQLITE_PATH", BASE_DIR / "rate-limits.db"))
+# a store that cannot answer (the sqlite file locked past its busy timeout) lets the request through when true,
+# otherwise the request gets a 429 with Retry-After: 1
+RATE_LIMIT_FAIL_OPEN = os.getenv("RATE_LIMIT_FAIL_OPEN", "true").lower() == "true"
+
+# concurrent identical insight and grid reads share one database call
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+
+# default engine for the per-habit insights, "sql" or "numpy" (needs numpy installed), requests can override it
+INSIGHTS_ENGINE = os.getenv("INSIGHTS_ENGINE", "sql").lower()
+
+# SQLite performance profile, applied to every new connection in database.py
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", -64 * 1024))  # negative values are KiB
+SQLITE_TEMP_STORE = os.getenv("SQLITE_TEMP_STORE", "MEMORY")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+
+# per uvicorn worker, every worker keeps its own pool
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 3600))
+
+# PDF exports are rendered by a bounded process pool and served from disk
+EXPORT_DIR = Path(os.getenv("EXPORT_DIR", BASE_DIR / "exports"))
+EXPORT_MAX_WORKERS = int(os.getenv("EXPORT_MAX_WORKERS", 2))
+EXPORT_JOB_TIMEOUT_SECONDS = float(os.getenv("EXPORT_JOB_TIMEOUT_SECONDS", 120))
+EXPORT_RETENTION_SECONDS = float(os.getenv("EXPORT_RETENTION_SECONDS", 24 * 3600))
+
+# per-route latency histograms, SQL statement counts and Server-Timing headers, served at /metrics
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+# statements slower than this are logged with their route, 0 turns the log off
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", 200))
+
+# opt-in sampling profiler: requests from PROFILING_ALLOWED_IPS with `X-Profile: 1` or `?profile=1` that carry
+# PROFILING_TOKEN in `X-Profile-Token` are profiled and their collapsed stacks written under PROFILE_DIR. The IPs
+# are the peer address, behind a reverse proxy that is the proxy's, so the token is what authorizes a profile;
+# nothing is installed when disabled or without a token
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+PROFILING_ALLOWED_IPS = {ip.strip() for ip in os.getenv("PROFILING_ALLOWED_IPS", "127.0.0.1,::1").split(",") if ip.strip()}
+PROFILING_INTERVAL_MS = float(os.getenv("PROFILING_INTERVAL_MS", 2))
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", BASE_DIR / "profiles"))
@@ -1,11 +1,34 @@
+from collections import defaultdict
 from datetime import date
-from sqlalchemy import select, update
+from typing import List
+from sqlalchemy import select, update, delete, and_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException
 
-from backend.app import models, schemas
+from backend.app import cache, models, rollups, schemas, streaks
+from backend.app.services import quote_cache
 
+# one bound parameter per date, well below SQLite's variable limit
+BATCH_DELETE_CHUNK_SIZE = 400
+DATA_VERSION_ID = 1
+
+
+def get_data_version(db: Session) -> int:
+    return db.scalar(select(models.DataVersion.version).filter_by(id=DATA_VERSION_ID)) or 0
+
+def _bump_data_version(db: Session):
+    bumped = db.execute(
+        update(models.DataVersion).where(
+            models.DataVersion.id == DATA_VERSION_ID
+        ).values(
+            version=models.DataVersion.version + 1
+        )
+    )
+    if not bumped.rowcount:
+        db.add(models.DataVersion(id=DATA_VERSION_ID, version=1))
 
 def get_habit(db: Session, habit_id: int):
     return db.scalar(select(models.Habit).filter_by(id=habit_id))
@@ -31,10 +54,15 @@ def create_habit(db: Session, habit: schemas.CreateHabit):
         if habit.type == models.HabitType.measurable:
             new_habit.target=habit.target
             new_habit.unit=habit.unit
+        # no entries yet, so no runs; later writes keep the summary up to date
+        new_habit.streak_summary = models.StreakSummary(longest_run_length=0)
 
         db.add(new_habit)
+        _bump_data_version(db)
         db.commit()
         db.refresh(new_habit)
+        cache.invalidate_habit(new_habit.id)
+        quote_cache.invalidate_habit_names()
         return new_habit
 
     except SQLAlchemyError:
@@ -48,8 +76,11 @@ def update_habit(db: Session, curr_habit: models.Habit, habit_update: schemas.Cr
         curr_habit.color = habit_update.color
 
         if curr_habit.type == models.HabitType.simple:
+            _bump_data_version(db)
             db.commit()
             db.refresh(curr_habit)
+            cache.invalidate_habit(curr_habit.id)
+            quote_cache.invalidate_habit_names()
             return curr_habit
 
 
@@ -71,11 +102,23 @@ def update_habit(db: Session, curr_habit: models.Habit, habit_update: schemas.Cr
                 is_completed= models.HabitEntry.value >= curr_habit.target
             )
             db.execute(update_entries_query)
+            db.flush()
+            streaks.rebuild_summary(db, curr_habit.id)
+            streaks.rebuild_summary(db, None)
+            rollups.refresh_habit(db, curr_habit.id)
 
+        _bump_data_version(db)
         db.commit()
         db.refresh(curr_habit)
+        cache.invalidate_habit(curr_habit.id)
+        quote_cache.invalidate_habit_names()
         return curr_habit
 
+    except StaleDataError:
+        # deleted by another request after the router loaded it, the update matched no row
+        db.rollback()
+        raise HTTPException(404, "Habit not found")
+
     except SQLAlchemyError:
         db.rollback()
         raise HTTPException(500, "Failed to update habit")
@@ -83,14 +126,57 @@ def update_habit(db: Session, curr_habit: models.Habit, habit_update: schemas.Cr
 
 def delete_habit(db: Session, curr_habit: models.Habit):
     try:
+        # statements instead of the ORM cascade: the first delete takes the write lock, so an entry or summary
+        # another request writes for this habit can no longer land between loading its children and deleting
+        # the habit (a foreign key error), and RETURNING gives the days whose rollups change
+        habit_days = db.scalars(
+            delete(models.HabitEntry).where(
+                models.HabitEntry.habit_id == curr_habit.id
+            ).returning(
+                models.HabitEntry.date
+            )
+        ).all()
+        db.execute(delete(models.StreakSummary).where(models.StreakSummary.habit_id == curr_habit.id))
         db.delete(curr_habit)
+        db.flush()
+        streaks.rebuild_summary(db, None)
+        rollups.refresh_days(db, habit_days)
+        _bump_data_version(db)
         db.commit()
+        cache.invalidate_habit(curr_habit.id)
+        quote_cache.invalidate_habit_names()
         return curr_habit
 
     except SQLAlchemyError:
         db.rollback()
         raise HTTPException(500, "Failed to delete habit")
 
+def _is_entry_completed(habit: models.Habit, value: float) -> bool:
+    if habit.type == models.HabitType.simple:
+        if value == 1:
+            return True
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid value for simple habit, only binary 0/1 allowed"
+        )
+
+    if value <= 0:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid value, must be positive"
+        )
+    return value >= habit.target
+
+def _upsert_entries_statement():
+    upsert_query = sqlite_insert(models.HabitEntry)
+    return upsert_query.on_conflict_do_update(
+        index_elements=[models.HabitEntry.habit_id, models.HabitEntry.date],
+        set_={
+            "value": upsert_query.excluded.value,
+            "is_completed": upsert_query.excluded.is_completed
+        }
+    )
+
 def create_or_update_entry(db: Session, entry: schemas.CreateHabitEntry):
     try:
         habit = get_habit(db, habit_id=entry.habit_id)
@@ -100,80 +186,182 @@ def create_or_update_entry(db: Session, entry: schemas.CreateHabitEntry):
                 detail="Habit not found"
             )
 
-        select_entry = select(models.HabitEntry).filter_by(
-            habit_id=entry.habit_id,
-            date=entry.date
+        entry_key = and_(
+            models.HabitEntry.habit_id == entry.habit_id,
+            models.HabitEntry.date == entry.date
         )
-        curr_entry = db.scalar(select_entry)
 
         if entry.value == 0:
-            if curr_entry:
-                db.delete(curr_entry)
+            deleted = db.execute(delete(models.HabitEntry).where(entry_key))
+            if deleted.rowcount:
+                streaks.record_entry_change(db, entry.habit_id, entry.date, completed=False)
+                rollups.refresh_days(db, [entry.date])
+                _bump_data_version(db)
                 db.commit()
+                cache.invalidate_entries([(entry.habit_id, entry.date)])
             return None
 
-        completed = False
-        if habit.type == models.HabitType.simple:
-            if entry.value == 1:
-                completed = True
-            else:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Invalid value for simple habit, only binary 0/1 allowed"
-                )
-        else:
-            if entry.value <= 0:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Invalid value, must be positive"
-                )
-            if entry.value >= habit.target:
-                completed = True
-
-        if curr_entry:
-            curr_entry.value = entry.value
-            curr_entry.is_completed = completed
-        else:
-            curr_entry = models.HabitEntry(
-                habit_id=entry.habit_id,
-                date=entry.date,
-                value=entry.value,
-                is_completed=completed
-            )
-            db.add(curr_entry)
+        completed = _is_entry_completed(habit, entry.value)
+
+        upsert_entry_query = _upsert_entries_statement().values(
+            habit_id=entry.habit_id,
+            date=entry.date,
+            value=entry.value,
+            is_completed=completed
+        ).returning(
+            models.HabitEntry
+        ).execution_options(
+            populate_existing=True
+        )
+        curr_entry = db.scalar(upsert_entry_query)
 
+        streaks.record_entry_change(db, entry.habit_id, entry.date, completed=completed)
+        rollups.refresh_days(db, [entry.date])
+        _bump_data_version(db)
         db.commit()
-        db.refresh(curr_entry)
+        cache.invalidate_entries([(entry.habit_id, entry.date)])
         return curr_entry
 
     except SQLAlchemyError:
         db.rollback()
         raise HTTPException(500, "Failed to log habit entry")
 
-def get_habit_table_data(db: Session, start_date: date, end_date: date):
+def create_or_update_entries(db: Session, entries: List[schemas.CreateHabitEntry]) -> List[schemas.BatchEntryResult]:
     try:
-        habits = get_all_habits(db)
+        habit_ids = {entry.habit_id for entry in entries}
+        habits = {
+            habit.id: habit
+            for habit in db.scalars(select(models.Habit).filter(models.Habit.id.in_(habit_ids)))
+        }
+
+        results = []
+        latest_item_by_key = {}
+        for index, entry in enumerate(entries):
+            habit = habits.get(entry.habit_id)
+            if habit is None:
+                results.append(schemas.BatchEntryResult(index=index, status=schemas.BatchEntryStatus.FAILED, detail="Habit not found"))
+                continue
+
+            completed = False
+            if entry.value != 0:
+                try:
+                    completed = _is_entry_completed(habit, entry.value)
+                except HTTPException as e:
+                    results.append(schemas.BatchEntryResult(index=index, status=schemas.BatchEntryStatus.FAILED, detail=e.detail))
+                    continue
+
+            key = (entry.habit_id, entry.date)
+            if key in latest_item_by_key:
+                superseded = latest_item_by_key[key][0]
+                results[superseded] = schemas.BatchEntryResult(
+                    index=superseded,
+                    status=schemas.BatchEntryStatus.SKIPPED,
+                    detail="Superseded by a later item for the same habit and date"
+                )
+            latest_item_by_key[key] = (index, entry, completed)
+            results.append(None)
+
+        to_upsert, to_delete = [], []
+        for key, (index, entry, completed) in latest_item_by_key.items():
+            if entry.value == 0:
+                to_delete.append(key)
+                results[index] = schemas.BatchEntryResult(index=index, status=schemas.BatchEntryStatus.DELETED)
+            else:
+                to_upsert.append((index, entry, completed))
+
+        # one statement per habit, SQLite scans the whole table for a (habit_id, date) IN (...) row value list
+        days_to_delete_by_habit = defaultdict(list)
+        for habit_id, day in to_delete:
+            days_to_delete_by_habit[habit_id].append(day)
+        for habit_id, days in days_to_delete_by_habit.items():
+            for chunk_start in range(0, len(days), BATCH_DELETE_CHUNK_SIZE):
+                db.execute(
+                    delete(models.HabitEntry).where(
+                        models.HabitEntry.habit_id == habit_id,
+                        models.HabitEntry.date.in_(days[chunk_start:chunk_start + BATCH_DELETE_CHUNK_SIZE])
+                    )
+                )
+
+        if to_upsert:
+            upserted_ids = db.scalars(
+                _upsert_entries_statement().returning(models.HabitEntry.id, sort_by_parameter_order=True),
+                [
+                    {"habit_id": entry.habit_id, "date": entry.date, "value": entry.value, "is_completed": completed}
+                    for _, entry, completed in to_upsert
+                ]
+            ).all()
+            for (index, entry, _), entry_id in zip(to_upsert, upserted_ids):
+                results[index] = schemas.BatchEntryResult(
+                    index=index,
+                    status=schemas.BatchEntryStatus.SAVED,
+                    entry=schemas.GetHabitEntry(id=entry_id, habit_id=entry.habit_id, date=entry.date, value=entry.value)
+                )
 
-        entries_query = (
-            select(models.HabitEntry)
-            .filter(
+        touched_habit_ids = {habit_id for habit_id, _ in latest_item_by_key}
+        if touched_habit_ids:
+            for habit_id in touched_habit_ids:
+                streaks.rebuild_summary(db, habit_id)
+            streaks.rebuild_summary(db, None)
+            rollups.refresh_days(db, {day for _, day in latest_item_by_key})
+            _bump_data_version(db)
+
+        db.commit()
+        cache.invalidate_entries(latest_item_by_key.keys())
+        return results
+
+    except SQLAlchemyError:
+        db.rollback()
+        raise HTTPException(500, "Failed to log habit entries")
+
+def get_habit_table_data(db: Session, start_date: date, end_date: date) -> List[schemas.HabitTable]:
+    try:
+        # plain column tuples, no ORM objects are loaded or attached to Habit.entries
+        grid_query = select(
+            models.Habit.id,
+            models.Habit.name,
+            models.Habit.type,
+            models.Habit.color,
+            models.Habit.target,
+            models.Habit.unit,
+            models.HabitEntry.id.label("entry_id"),
+            models.HabitEntry.date,
+            models.HabitEntry.value
+        ).select_from(
+            models.Habit
+        ).outerjoin(
+            models.HabitEntry,
+            and_(
+                models.HabitEntry.habit_id == models.Habit.id,
                 models.HabitEntry.date >= start_date,
                 models.HabitEntry.date <= end_date
             )
+        ).order_by(
+            models.Habit.id,
+            models.HabitEntry.date
         )
-        entries = db.scalars(entries_query).all()
 
-        habit_entries_map = {}
-        for entry in entries:
-            if entry.habit_id not in habit_entries_map:
-                habit_entries_map[entry.habit_id] = []
-            habit_entries_map[entry.habit_id].append(entry)
+        habit_tables = []
+        current_habit = None
+        for habit_id, name, habit_type, color, target, unit, entry_id, entry_date, value in db.execute(grid_query):
+            if current_habit is None or current_habit.id != habit_id:
+                current_habit = schemas.HabitTable(
+                    id=habit_id,
+                    name=name,
+                    type=habit_type,
+                    color=color,
+                    target=target,
+                    unit=unit,
+                    entries=[]
+                )
+                habit_tables.append(current_habit)
 
-        for habit in habits:
-            habit.entries = habit_entries_map.get(habit.id, [])
+            if entry_id is not None:
+                current_habit.entries.append(
+                    schemas.GetHabitEntry(id=entry_id, habit_id=habit_id, date=entry_date, value=value)
+                )
 
-        return habits
+        return habit_tables
 
     except SQLAlchemyError:
         db.rollback()
-        raise HTTPException(500, "Failed to fetch habit table data")
\ No newline at end of file
+        raise HTTPException(500, "Failed to fetch habit table data")
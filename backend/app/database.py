@@ -1,18 +1,98 @@
 from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from backend.app.config import DB_URL
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from backend.app.config import (
+    DB_URL,
+    ASYNC_DB_URL,
+    DB_ASYNC,
+    SQLITE_JOURNAL_MODE,
+    SQLITE_SYNCHRONOUS,
+    SQLITE_MMAP_SIZE,
+    SQLITE_CACHE_SIZE,
+    SQLITE_TEMP_STORE,
+    SQLITE_BUSY_TIMEOUT_MS,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+)
+from backend.app.metrics import instrument_engine
+
+SQLITE_PRAGMAS = {
+    "journal_mode": SQLITE_JOURNAL_MODE,
+    "synchronous": SQLITE_SYNCHRONOUS,
+    "mmap_size": SQLITE_MMAP_SIZE,
+    "cache_size": SQLITE_CACHE_SIZE,
+    "temp_store": SQLITE_TEMP_STORE,
+    "busy_timeout": SQLITE_BUSY_TIMEOUT_MS,
+}
+
+POOL_OPTIONS = {
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT,
+    "pool_recycle": DB_POOL_RECYCLE,
+}
 
 engine = create_engine(
-    DB_URL, connect_args={"check_same_thread": False}
+    DB_URL,
+    connect_args={"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000},
+    poolclass=QueuePool,
+    **POOL_OPTIONS,
 )
 
 @event.listens_for(engine, "connect")
 def configure_sqlite_connection(dbapi_connection, _connection_record):
     cursor = dbapi_connection.cursor()
     cursor.execute("PRAGMA foreign_keys=ON")
+    for pragma, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {pragma}={value}")
     cursor.close()
 
+instrument_engine(engine)
+
+async_engine = None
+AsyncSessionLocal = None
+if DB_ASYNC:
+    async_engine = create_async_engine(
+        ASYNC_DB_URL,
+        connect_args={"timeout": SQLITE_BUSY_TIMEOUT_MS / 1000},
+        **POOL_OPTIONS,
+    )
+    event.listen(async_engine.sync_engine, "connect", configure_sqlite_connection)
+    instrument_engine(async_engine.sync_engine)
+    # objects are serialized after the session is gone, nothing may lazy load past a commit
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+_PRAGMA_VALUE_NAMES = {
+    "synchronous": {0: "OFF", 1: "NORMAL", 2: "FULL", 3: "EXTRA"},
+    "temp_store": {0: "DEFAULT", 1: "FILE", 2: "MEMORY"},
+}
+
+
+def get_sqlite_settings() -> dict:
+    with engine.connect() as connection:
+        settings = {}
+        for pragma in ["foreign_keys", *SQLITE_PRAGMAS]:
+            value = connection.exec_driver_sql(f"PRAGMA {pragma}").scalar()
+            settings[pragma] = _PRAGMA_VALUE_NAMES.get(pragma, {}).get(value, value)
+
+    settings["pool_size"] = engine.pool.size()
+    settings["max_overflow"] = DB_MAX_OVERFLOW
+    return settings
+
+
+def get_sqlite_settings_mismatches(settings: dict) -> list[str]:
+    mismatches = []
+    for pragma, expected in SQLITE_PRAGMAS.items():
+        actual = settings.get(pragma)
+        if str(actual).upper() != str(expected).upper():
+            mismatches.append(f"{pragma}={actual} (configured {expected})")
+    return mismatches
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
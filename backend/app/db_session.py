@@ -1,8 +1,34 @@
-from backend.app.database import SessionLocal
+from typing import Callable, TypeVar
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from backend.app.config import DB_ASYNC
+from backend.app.database import SessionLocal, AsyncSessionLocal
+from backend.app.profiling import track_thread
+
+T = TypeVar("T")
+
+DbSession = Session | AsyncSession
+
 
 def get_db_session():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db_session():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+get_db = get_async_db_session if DB_ASYNC else get_db_session
+
+
+async def run_db(db: DbSession, fn: Callable[..., T], *args, **kwargs) -> T:
+    # crud/insights functions take a sync Session first; on the async engine they run
+    # through run_sync (greenlet on the event loop), otherwise in the threadpool as before
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(track_thread(fn), db, *args, **kwargs)
\ No newline at end of file
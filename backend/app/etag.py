@@ -0,0 +1,38 @@
+import hashlib
+from fastapi import Request, Response, Depends
+
+from backend.app import crud
+from backend.app.cache import request_data_version
+from backend.app.db_session import DbSession, get_db, run_db
+
+
+class NotModified(Exception):
+    def __init__(self, etag: str):
+        self.etag = etag
+
+
+def _make_etag(request: Request, data_version: int) -> str:
+    query = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    digest = hashlib.sha1(f"{request.url.path}?{query}".encode()).hexdigest()[:16]
+    return f'"{data_version}-{digest}"'
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+async def etag_guard(request: Request, response: Response, db: DbSession = Depends(get_db)):
+    # GET responses are a pure function of the url and the stored data, the data version stands in for both
+    data_version = await run_db(db, crud.get_data_version)
+    # the cached body and a coalesced call are picked for this same version
+    request_data_version.set(data_version)
+    etag = _make_etag(request, data_version)
+
+    if _matches(request.headers.get("if-none-match"), etag):
+        raise NotModified(etag)
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
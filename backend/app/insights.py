@@ -1,11 +1,13 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case, and_, select, column, literal_column
+from sqlalchemy import func, case, and_, or_, select
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException
+from collections import defaultdict
 from datetime import date, datetime, timedelta
 from typing import List
 
-from backend.app import models, schemas
+from backend.app import models, schemas, streaks
+from backend.app.cache import cached
 
 
 def _get_habit_completion_percentage():
@@ -15,108 +17,49 @@ def _get_habit_completion_percentage():
         else_=0.0
     )
 
-def _calculate_streaks(db: Session, today_date: date, completed_dates) -> tuple[int, int]:
-    streak_groups = select(
-        column("date"),
-        (func.julianday(column("date")) - func.row_number().over(order_by=column("date"))).label("streak_group_id")
-    ).select_from(
-        completed_dates
-    ).cte("streak_groups")
-
-    streak_data = select(
-        func.count().label("streak_length"),
-        func.max(column("date")).label("end_date")
-    ).select_from(
-        streak_groups
-    ).group_by(
-        column("streak_group_id")
-    ).cte("streak_data")
-
-    today = today_date
-    yesterday = today - timedelta(days=1)
-
-    final_query = select(
-        func.max(
-            case(
-                (column("end_date").in_([today, yesterday]), column("streak_length")),
-                else_=0
-            )
-        ).label("current_streak"),
-        func.max(column("streak_length")).label("max_streak")
-    ).select_from(streak_data)
 
-    result = db.execute(final_query).first()
-    return result.current_streak or 0, result.max_streak or 0
+def _get_entry_completion_percentage(habit_type: models.HabitType, target: float | None, value: float) -> float:
+    # python twin of _get_habit_completion_percentage for rows already fetched
+    if habit_type == models.HabitType.simple:
+        return 100.0 if value >= 1 else 0.0
+    if habit_type == models.HabitType.measurable and target is not None and target > 0:
+        return min(100.0, (value / target) * 100)
+    return 0.0
 
 
 def _get_habit_streaks(db: Session, habit_id: int, today_date: date) -> tuple[int, int]:
-    completed_dates = select(
-        models.HabitEntry.date.label("date")
-    ).filter(
-        models.HabitEntry.habit_id == habit_id,
-        models.HabitEntry.is_completed == True
-    ).cte("completed_dates")
-
-    return _calculate_streaks(db, today_date, completed_dates)
+    return streaks.get_streaks(db, habit_id, today_date)
 
 
 def _get_overall_streaks(db: Session, today_date: date,) -> tuple[int, int]:
-    completed_dates = select(
-        models.HabitEntry.date.distinct().label("date")
-    ).filter(
-        models.HabitEntry.is_completed == True
-    ).cte("completed_dates")
-
-    return _calculate_streaks(db, today_date, completed_dates)
+    return streaks.get_streaks(db, None, today_date)
 
 
 def _get_calendar_stats(db: Session, total_habits: int, start_date: date, end_date: date) -> List[schemas.SingleCalendarDayStat]:
     if total_habits == 0:  # division by zero
         return []
 
+    # daily_rollups holds the per-day sums, kept up to date by the crud write paths
     daily_stats_query = select(
-        models.HabitEntry.date,
-        (func.sum(_get_habit_completion_percentage()) / total_habits).label('percentage')
-    ).join(
-        models.Habit,
-        models.HabitEntry.habit_id == models.Habit.id
+        models.DailyRollup.date,
+        models.DailyRollup.completion_sum
     ).filter(
-        models.HabitEntry.date >= start_date,
-        models.HabitEntry.date <= end_date
-    ).group_by(
-        models.HabitEntry.date
+        models.DailyRollup.date >= start_date,
+        models.DailyRollup.date <= end_date
     ).order_by(
-        models.HabitEntry.date
+        models.DailyRollup.date
     )
 
     daily_stats = db.execute(daily_stats_query).all()
-    return [schemas.SingleCalendarDayStat(date=stat.date, completed_percentage=round(stat.percentage, 2)) for stat in daily_stats]
+    return [
+        schemas.SingleCalendarDayStat(date=stat.date, completed_percentage=round(stat.completion_sum / total_habits, 2))
+        for stat in daily_stats
+    ]
 
 
-def _get_weekly_chart_data(db: Session, habit_id: int, start_date: date, end_date: date):
-    weekly_chart_data_query = select(
-        literal_column("strftime('%Y', date)").label('year'),
-        literal_column("strftime('%W', date)").label('week'),
-        func.sum(case((models.HabitEntry.is_completed == 1, 1), else_=0)).label('days_completed')
-    ).filter(
-        models.HabitEntry.habit_id == habit_id,
-        models.HabitEntry.date >= start_date,
-        models.HabitEntry.date <= end_date
-    ).group_by(
-        literal_column("strftime('%Y', date)"),
-        literal_column("strftime('%W', date)")
-    ).having(
-        literal_column("strftime('%Y', date)").is_not(None),
-        literal_column("strftime('%W', date)").is_not(None)
-    ).order_by(
-        literal_column("strftime('%Y', date)"),
-        literal_column("strftime('%W', date)")
-    )
-
-    weekly_chart_data = db.execute(weekly_chart_data_query)
-
+def _build_weekly_chart_data(weekly_rows, start_date: date, end_date: date) -> List[schemas.ChartDataPoint]:
     chart_data = []
-    for year, week, days_completed in weekly_chart_data:
+    for year, week, days_completed in weekly_rows:
         week_start = max(datetime.strptime(f'{year}-{week}-1', '%Y-%W-%w').date(), start_date)
         week_end = min(week_start + timedelta(days=6), end_date)
         total_possible = (week_end - week_start).days + 1
@@ -129,30 +72,9 @@ def _get_weekly_chart_data(db: Session, habit_id: int, start_date: date, end_dat
     return chart_data
 
 
-def _get_monthly_chart_data(db: Session, habit_id: int, start_date: date, end_date: date):
-    monthly_chart_data_query = select(
-        literal_column("strftime('%Y', date)").label('year'),
-        literal_column("strftime('%m', date)").label('month'),
-        func.sum(case((models.HabitEntry.is_completed == 1, 1), else_=0)).label('days_completed')
-    ).filter(
-        models.HabitEntry.habit_id == habit_id,
-        models.HabitEntry.date >= start_date,
-        models.HabitEntry.date <= end_date
-    ).group_by(
-        literal_column("strftime('%Y', date)"),
-        literal_column("strftime('%m', date)")
-    ).having(
-        literal_column("strftime('%Y', date)").is_not(None),
-        literal_column("strftime('%m', date)").is_not(None)
-    ).order_by(
-        literal_column("strftime('%Y', date)"),
-        literal_column("strftime('%m', date)")
-    )
-
-    monthly_chart_data = db.execute(monthly_chart_data_query)
-
+def _build_monthly_chart_data(monthly_rows, start_date: date, end_date: date) -> List[schemas.ChartDataPoint]:
     chart_data = []
-    for year, month, days_completed in monthly_chart_data:
+    for year, month, days_completed in monthly_rows:
         month_start = max(date(int(year), int(month), 1), start_date)
         if int(month) == 12:
             next_month = date(int(year) + 1, 1, 1)
@@ -170,6 +92,74 @@ def _get_monthly_chart_data(db: Session, habit_id: int, start_date: date, end_da
     return chart_data
 
 
+def _get_weekly_chart_data(db: Session, habit_id: int, start_date: date, end_date: date):
+    weekly_chart_data_query = select(
+        (models.HabitEntry.week_key // 100).label('year'),
+        (models.HabitEntry.week_key % 100).label('week'),
+        func.sum(case((models.HabitEntry.is_completed == 1, 1), else_=0)).label('days_completed')
+    ).filter(
+        # the week_key bounds keep this a range scan of the (habit_id, week_key, ...) covering index
+        models.HabitEntry.habit_id == habit_id,
+        models.HabitEntry.week_key >= models.get_week_key(start_date),
+        models.HabitEntry.week_key <= models.get_week_key(end_date),
+        models.HabitEntry.day_ordinal >= start_date.toordinal(),
+        models.HabitEntry.day_ordinal <= end_date.toordinal()
+    ).group_by(
+        models.HabitEntry.week_key
+    ).order_by(
+        models.HabitEntry.week_key
+    )
+
+    weekly_chart_data = db.execute(weekly_chart_data_query)
+    return _build_weekly_chart_data(weekly_chart_data, start_date, end_date)
+
+
+def _get_monthly_chart_data(db: Session, habit_id: int, start_date: date, end_date: date):
+    monthly_chart_data_query = select(
+        (models.HabitEntry.month_key // 100).label('year'),
+        (models.HabitEntry.month_key % 100).label('month'),
+        func.sum(case((models.HabitEntry.is_completed == 1, 1), else_=0)).label('days_completed')
+    ).filter(
+        # the month_key bounds keep this a range scan of the (habit_id, month_key, ...) covering index
+        models.HabitEntry.habit_id == habit_id,
+        models.HabitEntry.month_key >= models.get_month_key(start_date),
+        models.HabitEntry.month_key <= models.get_month_key(end_date),
+        models.HabitEntry.day_ordinal >= start_date.toordinal(),
+        models.HabitEntry.day_ordinal <= end_date.toordinal()
+    ).group_by(
+        models.HabitEntry.month_key
+    ).order_by(
+        models.HabitEntry.month_key
+    )
+
+    monthly_chart_data = db.execute(monthly_chart_data_query)
+    return _build_monthly_chart_data(monthly_chart_data, start_date, end_date)
+
+
+def _build_week_stats(today: date, completed_days: set[date]) -> List[schemas.SingleWeekDayStat]:
+    start_of_week = today - timedelta(days=today.weekday())
+    days_of_week = [schemas.WeekDay.MON, schemas.WeekDay.TUE, schemas.WeekDay.WED, schemas.WeekDay.THU, schemas.WeekDay.FRI, schemas.WeekDay.SAT, schemas.WeekDay.SUN]
+    current_week_stats = []
+
+    for i in range(7):
+        day_date = start_of_week + timedelta(days=i)
+        name = days_of_week[i]
+
+        if day_date > today:
+            status = schemas.DayStatus.PENDING
+        elif day_date in completed_days:
+            status = schemas.DayStatus.COMPLETED
+        elif day_date == today:
+            status = schemas.DayStatus.PENDING
+        else:
+            status = schemas.DayStatus.MISSED
+
+        current_week_stats.append(schemas.SingleWeekDayStat(day=name, status=status))
+
+    return current_week_stats
+
+
+@cached("overall/week")
 def get_sidebar_week_insights(db: Session, today_date: date) -> schemas.SidebarWeekInsights:
     try:
         today = today_date
@@ -192,23 +182,7 @@ def get_sidebar_week_insights(db: Session, today_date: date) -> schemas.SidebarW
 
         completed_days_this_week = {row.date for row in daily_status if row.completed}
 
-        days_of_week = [schemas.WeekDay.MON, schemas.WeekDay.TUE, schemas.WeekDay.WED, schemas.WeekDay.THU, schemas.WeekDay.FRI, schemas.WeekDay.SAT, schemas.WeekDay.SUN]
-        current_week_stats = []
-
-        for i in range(7):
-            day_date = start_of_week + timedelta(days=i)
-            name = days_of_week[i]
-
-            if day_date > today:
-                status = schemas.DayStatus.PENDING
-            elif day_date in completed_days_this_week:
-                status = schemas.DayStatus.COMPLETED
-            elif day_date == today:
-                status = schemas.DayStatus.PENDING
-            else:
-                status = schemas.DayStatus.MISSED
-
-            current_week_stats.append(schemas.SingleWeekDayStat(day=name, status=status))
+        current_week_stats = _build_week_stats(today, completed_days_this_week)
 
         return schemas.SidebarWeekInsights(
             current_overall_streak=current_overall_streak,
@@ -220,6 +194,7 @@ def get_sidebar_week_insights(db: Session, today_date: date) -> schemas.SidebarW
         raise HTTPException(status_code=500, detail="Failed to fetch sidebar week stats")
 
 
+@cached("overall/calendar", start_arg="start_date", end_arg="end_date")
 def get_sidebar_calendar_insights(
         db: Session,
         start_date: date,
@@ -241,6 +216,7 @@ def get_sidebar_calendar_insights(
         )
 
 
+@cached("habit/stats", habit_arg="habit_id")
 def get_habit_streaks_and_total_completions(
         db: Session,
         habit_id: int,
@@ -250,7 +226,9 @@ def get_habit_streaks_and_total_completions(
         current_streak, max_streak = _get_habit_streaks(db, habit_id, today_date)
 
         total_completions_query = select(
-            func.count(models.HabitEntry.date)
+            func.count()
+        ).select_from(
+            models.HabitEntry
         ).filter(
             models.HabitEntry.habit_id == habit_id,
             models.HabitEntry.is_completed == True
@@ -267,6 +245,7 @@ def get_habit_streaks_and_total_completions(
         raise HTTPException(status_code=500, detail="Failed to fetch habit stats")
 
 
+@cached("habit/chart", habit_arg="habit_id", start_arg="start_date", end_arg="end_date")
 def get_habit_chart_data(
         db: Session,
         habit_id: int,
@@ -289,6 +268,7 @@ def get_habit_chart_data(
         raise HTTPException(status_code=500, detail="Failed to fetch habit chart data")
 
 
+@cached("habit/heatmap", habit_arg="habit_id", start_arg="start_date", end_arg="end_date")
 def get_habit_heatmap_data(
         db: Session,
         habit_id: int,
@@ -318,3 +298,202 @@ def get_habit_heatmap_data(
 
     except SQLAlchemyError:
         raise HTTPException(status_code=500, detail="Failed to fetch habit heatmap data")
+
+
+@cached("dashboard")
+def get_dashboard_data(
+        db: Session,
+        sections: List[schemas.DashboardSection],
+        today_date: date | None = None,
+        calendar_start_date: date | None = None,
+        calendar_end_date: date | None = None,
+        grid_start_date: date | None = None,
+        grid_end_date: date | None = None
+) -> schemas.Dashboard:
+    ranges = {}
+    calendar_range = None
+    if schemas.DashboardSection.WEEK in sections:
+        if today_date is None:
+            raise HTTPException(status_code=400, detail="today_date is required for the week section")
+        ranges[schemas.DashboardSection.WEEK] = (today_date - timedelta(days=today_date.weekday()), today_date)
+    if schemas.DashboardSection.CALENDAR in sections:
+        if calendar_start_date is None or calendar_end_date is None:
+            raise HTTPException(status_code=400, detail="calendar_start_date and calendar_end_date are required for the calendar section")
+        calendar_range = (calendar_start_date, calendar_end_date)
+    if schemas.DashboardSection.GRID in sections:
+        if grid_start_date is None or grid_end_date is None:
+            raise HTTPException(status_code=400, detail="grid_start_date and grid_end_date are required for the grid section")
+        ranges[schemas.DashboardSection.GRID] = (grid_start_date, grid_end_date)
+
+    try:
+        dashboard = schemas.Dashboard()
+        if not ranges and calendar_range is None:
+            return dashboard
+
+        habits = db.execute(
+            select(
+                models.Habit.id,
+                models.Habit.name,
+                models.Habit.type,
+                models.Habit.color,
+                models.Habit.target,
+                models.Habit.unit
+            ).order_by(models.Habit.id)
+        ).all()
+
+        # one fetch shared by the entry based sections, only the requested date ranges are read
+        entries = []
+        if ranges:
+            entries = db.execute(select(
+                models.HabitEntry.id,
+                models.HabitEntry.habit_id,
+                models.HabitEntry.date,
+                models.HabitEntry.value,
+                models.HabitEntry.is_completed
+            ).filter(
+                or_(*[and_(models.HabitEntry.date >= start, models.HabitEntry.date <= end) for start, end in ranges.values()])
+            ).order_by(
+                models.HabitEntry.date
+            )).all()
+
+        if schemas.DashboardSection.WEEK in ranges:
+            start, end = ranges[schemas.DashboardSection.WEEK]
+            current_overall_streak, longest_overall_streak = _get_overall_streaks(db, today_date)
+            completed_days = {entry.date for entry in entries if entry.is_completed and start <= entry.date <= end}
+            dashboard.week = schemas.SidebarWeekInsights(
+                current_overall_streak=current_overall_streak,
+                longest_overall_streak=longest_overall_streak,
+                current_week_stats=_build_week_stats(today_date, completed_days)
+            )
+
+        if calendar_range is not None:
+            start, end = calendar_range
+            dashboard.calendar = schemas.SidebarCalendarInsights(
+                calendar_stats=_get_calendar_stats(db, len(habits), start, end)
+            )
+
+        if schemas.DashboardSection.GRID in ranges:
+            start, end = ranges[schemas.DashboardSection.GRID]
+            entries_by_habit = defaultdict(list)
+            for entry in entries:
+                if start <= entry.date <= end:
+                    entries_by_habit[entry.habit_id].append(
+                        schemas.GetHabitEntry(id=entry.id, habit_id=entry.habit_id, date=entry.date, value=entry.value)
+                    )
+            dashboard.grid = [
+                schemas.HabitTable(
+                    id=habit.id,
+                    name=habit.name,
+                    type=habit.type,
+                    color=habit.color,
+                    target=habit.target,
+                    unit=habit.unit,
+                    entries=entries_by_habit[habit.id]
+                )
+                for habit in habits
+            ]
+
+        return dashboard
+
+    except SQLAlchemyError:
+        raise HTTPException(status_code=500, detail="Failed to fetch dashboard data")
+
+
+def _get_run_streaks(completed_dates: List[date], today_date: date) -> tuple[int, int]:
+    # same result as streaks._calculate_streaks, for an ascending list of distinct dates
+    run_ends = (today_date, today_date - timedelta(days=1))
+    current_streak, longest_streak, run_length = 0, 0, 0
+
+    for i, day in enumerate(completed_dates):
+        if i > 0 and day == completed_dates[i - 1] + timedelta(days=1):
+            run_length += 1
+        else:
+            run_length = 1
+
+        is_run_end = i == len(completed_dates) - 1 or completed_dates[i + 1] != day + timedelta(days=1)
+        if is_run_end:
+            longest_streak = max(longest_streak, run_length)
+            if day in run_ends:
+                current_streak = max(current_streak, run_length)
+
+    return current_streak, longest_streak
+
+
+@cached("habit/details", habit_arg="habit_id")
+def get_habit_details(
+        db: Session,
+        habit_id: int,
+        today_date: date,
+        chart_view: str,
+        chart_start_date: date,
+        chart_end_date: date,
+        heatmap_start_date: date,
+        heatmap_end_date: date
+) -> schemas.HabitDetails:
+    try:
+        habit_entries_query = select(
+            models.Habit.type,
+            models.Habit.target,
+            models.HabitEntry.date,
+            models.HabitEntry.value,
+            models.HabitEntry.is_completed
+        ).select_from(
+            models.Habit
+        ).outerjoin(
+            models.HabitEntry,
+            models.HabitEntry.habit_id == models.Habit.id
+        ).filter(
+            models.Habit.id == habit_id
+        ).order_by(
+            models.HabitEntry.date
+        ).execution_options(
+            yield_per=1000
+        )
+
+        found = False
+        completed_dates = []
+        chart_buckets = {}
+        heatmap_data = []
+
+        for habit_type, target, entry_date, value, is_completed in db.execute(habit_entries_query):
+            found = True
+            if entry_date is None:
+                continue
+
+            if is_completed:
+                completed_dates.append(entry_date)
+
+            if chart_start_date <= entry_date <= chart_end_date:
+                if chart_view == "weekly":
+                    bucket = (entry_date.strftime('%Y'), entry_date.strftime('%W'))
+                else:
+                    bucket = (entry_date.strftime('%Y'), entry_date.strftime('%m'))
+                chart_buckets[bucket] = chart_buckets.get(bucket, 0) + (1 if is_completed else 0)
+
+            if heatmap_start_date <= entry_date <= heatmap_end_date:
+                percentage = _get_entry_completion_percentage(habit_type, target, value)
+                heatmap_data.append(schemas.HeatmapDataPoint(date=entry_date, value=round(percentage, 2)))
+
+        if not found:
+            raise HTTPException(status_code=404, detail="Habit not found")
+
+        current_streak, longest_streak = _get_run_streaks(completed_dates, today_date)
+
+        chart_rows = [(*bucket, days_completed) for bucket, days_completed in chart_buckets.items()]
+        if chart_view == "weekly":
+            chart_data = _build_weekly_chart_data(chart_rows, chart_start_date, chart_end_date)
+        else:  # monthly
+            chart_data = _build_monthly_chart_data(chart_rows, chart_start_date, chart_end_date)
+
+        return schemas.HabitDetails(
+            stats=schemas.HabitStats(
+                current_streak=current_streak,
+                longest_streak=longest_streak,
+                total_completions=len(completed_dates)
+            ),
+            chart=schemas.HabitChart(view=chart_view, data=chart_data),
+            heatmap=schemas.HabitHeatmap(heatmap_data=heatmap_data)
+        )
+
+    except SQLAlchemyError:
+        raise HTTPException(status_code=500, detail="Failed to fetch habit details")
@@ -0,0 +1,255 @@
+from datetime import date
+from typing import List, NamedTuple
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from fastapi import HTTPException
+
+from backend.app import models, schemas
+from backend.app.cache import cached
+
+# Same results as the per-habit functions in insights.py, computed from one fetch of a habit's
+# (date ordinal, value, completed) columns with array operations. NumPy is optional, the router
+# only imports this module when the numpy engine is selected.
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+class HabitColumns(NamedTuple):
+    found: bool
+    habit_type: models.HabitType | None
+    target: float | None
+    ordinals: np.ndarray  # ascending, one per entry
+    values: np.ndarray
+    completed: np.ndarray
+
+
+def _load_habit_columns(
+        db: Session,
+        habit_id: int,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        completed_only: bool = False
+) -> HabitColumns:
+    habit = db.execute(
+        select(models.Habit.type, models.Habit.target).filter(models.Habit.id == habit_id)
+    ).first()
+    if habit is None:
+        return HabitColumns(False, None, None, np.empty(0, np.int64), np.empty(0), np.empty(0, bool))
+
+    habit_entries_query = select(
+        models.HabitEntry.day_ordinal,
+        models.HabitEntry.value,
+        models.HabitEntry.is_completed
+    ).filter(
+        models.HabitEntry.habit_id == habit_id
+    ).order_by(
+        models.HabitEntry.date
+    )
+    if start_date is not None:
+        habit_entries_query = habit_entries_query.filter(
+            models.HabitEntry.date >= start_date,
+            models.HabitEntry.date <= end_date
+        )
+    if completed_only:
+        habit_entries_query = habit_entries_query.filter(models.HabitEntry.is_completed == True)
+
+    # converting per column is several times faster than np.array over the row objects
+    rows = db.execute(habit_entries_query).all()
+    ordinals, values, completed = zip(*rows) if rows else ((), (), ())
+    return HabitColumns(
+        found=True,
+        habit_type=habit.type,
+        target=habit.target,
+        ordinals=np.array(ordinals, dtype=np.int64),
+        values=np.array(values, dtype=np.float64),
+        completed=np.array(completed, dtype=bool),
+    )
+
+
+def _completion_percentages(columns: HabitColumns, values: np.ndarray) -> np.ndarray:
+    # array twin of insights._get_habit_completion_percentage
+    if columns.habit_type == models.HabitType.simple:
+        return np.where(values >= 1, 100.0, 0.0)
+    if columns.habit_type == models.HabitType.measurable and columns.target is not None and columns.target > 0:
+        return np.minimum(100.0, (values / columns.target) * 100)
+    return np.zeros(len(values))
+
+
+def _range_mask(ordinals: np.ndarray, start_date: date, end_date: date) -> np.ndarray:
+    return (ordinals >= start_date.toordinal()) & (ordinals <= end_date.toordinal())
+
+
+def _run_streaks(completed_ordinals: np.ndarray, today_date: date) -> tuple[int, int]:
+    # same result as insights._get_run_streaks
+    if len(completed_ordinals) == 0:
+        return 0, 0
+
+    run_breaks = np.flatnonzero(np.diff(completed_ordinals) != 1)
+    run_starts = np.concatenate(([0], run_breaks + 1))
+    run_ends = np.concatenate((run_breaks, [len(completed_ordinals) - 1]))
+    run_lengths = run_ends - run_starts + 1
+
+    today = today_date.toordinal()
+    current_runs = run_lengths[np.isin(completed_ordinals[run_ends], (today, today - 1))]
+    current_streak = int(current_runs.max()) if len(current_runs) else 0
+    return current_streak, int(run_lengths.max())
+
+
+def _calendar_fields(ordinals: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    days = (ordinals - EPOCH_ORDINAL).astype("datetime64[D]")
+    years = days.astype("datetime64[Y]")
+    months = days.astype("datetime64[M]").astype(np.int64) % 12 + 1
+    year_days = (days - years.astype("datetime64[D]")).astype(np.int64)
+    return years.astype(np.int64) + 1970, months, year_days
+
+
+def _chart_points(labels: List[str], days_completed: np.ndarray, bucket_starts: np.ndarray, bucket_ends: np.ndarray) -> List[schemas.ChartDataPoint]:
+    total_possible = bucket_ends - bucket_starts + 1
+    percentages = np.where(total_possible > 0, days_completed / np.maximum(total_possible, 1) * 100, 0.0)
+    return [
+        schemas.ChartDataPoint(date=label, value=round(percentage, 2))
+        for label, percentage in zip(labels, percentages.tolist())
+    ]
+
+
+def _weekly_chart_data(columns: HabitColumns, start_date: date, end_date: date) -> List[schemas.ChartDataPoint]:
+    mask = _range_mask(columns.ordinals, start_date, end_date)
+    ordinals, completed = columns.ordinals[mask], columns.completed[mask]
+    if len(ordinals) == 0:
+        return []
+
+    # strftime('%W'): weeks start on Monday, days before the first Monday of the year are week 0
+    years, _months, year_days = _calendar_fields(ordinals)
+    weekdays = (ordinals - 1) % 7  # Monday is 0
+    weeks = (year_days + 7 - weekdays) // 7
+
+    buckets, bucket_index = np.unique(years * 100 + weeks, return_inverse=True)
+    days_completed = np.bincount(bucket_index, weights=completed, minlength=len(buckets))
+
+    bucket_years, bucket_weeks = buckets // 100, buckets % 100
+    first_days = np.array([date(int(year), 1, 1).toordinal() for year in bucket_years], np.int64)
+    first_weekdays = (first_days - 1) % 7
+    # the Monday of each week, as datetime.strptime('%Y-%W-%w') resolves it
+    week_starts = np.where(
+        bucket_weeks == 0,
+        first_days - first_weekdays,
+        first_days + (7 - first_weekdays) % 7 + 7 * (bucket_weeks - 1)
+    )
+    week_starts = np.maximum(week_starts, start_date.toordinal())
+    week_ends = np.minimum(week_starts + 6, end_date.toordinal())
+
+    labels = [date.fromordinal(week_start).strftime('%b %d') for week_start in week_starts.tolist()]
+    return _chart_points(labels, days_completed, week_starts, week_ends)
+
+
+def _monthly_chart_data(columns: HabitColumns, start_date: date, end_date: date) -> List[schemas.ChartDataPoint]:
+    mask = _range_mask(columns.ordinals, start_date, end_date)
+    ordinals, completed = columns.ordinals[mask], columns.completed[mask]
+    if len(ordinals) == 0:
+        return []
+
+    years, months, _year_days = _calendar_fields(ordinals)
+    buckets, bucket_index = np.unique(years * 12 + (months - 1), return_inverse=True)
+    days_completed = np.bincount(bucket_index, weights=completed, minlength=len(buckets))
+
+    month_starts = (buckets - 1970 * 12).astype("datetime64[M]")
+    next_month_starts = month_starts + np.timedelta64(1, "M")
+    month_start_ordinals = month_starts.astype("datetime64[D]").astype(np.int64) + EPOCH_ORDINAL
+    month_end_ordinals = next_month_starts.astype("datetime64[D]").astype(np.int64) + EPOCH_ORDINAL - 1
+    month_start_ordinals = np.maximum(month_start_ordinals, start_date.toordinal())
+    month_end_ordinals = np.minimum(month_end_ordinals, end_date.toordinal())
+
+    labels = [date.fromordinal(month_start).strftime('%b %Y') for month_start in month_start_ordinals.tolist()]
+    return _chart_points(labels, days_completed, month_start_ordinals, month_end_ordinals)
+
+
+def _chart_data(columns: HabitColumns, view: str, start_date: date, end_date: date) -> List[schemas.ChartDataPoint]:
+    if view == "weekly":
+        return _weekly_chart_data(columns, start_date, end_date)
+    return _monthly_chart_data(columns, start_date, end_date)  # monthly
+
+
+def _heatmap_data(columns: HabitColumns, start_date: date, end_date: date) -> List[schemas.HeatmapDataPoint]:
+    mask = _range_mask(columns.ordinals, start_date, end_date)
+    percentages = _completion_percentages(columns, columns.values[mask])
+    return [
+        schemas.HeatmapDataPoint(date=date.fromordinal(ordinal), value=round(percentage, 2))
+        for ordinal, percentage in zip(columns.ordinals[mask].tolist(), percentages.tolist())
+    ]
+
+
+def _stats(columns: HabitColumns, today_date: date) -> schemas.HabitStats:
+    current_streak, longest_streak = _run_streaks(columns.ordinals[columns.completed], today_date)
+    return schemas.HabitStats(
+        current_streak=current_streak,
+        longest_streak=longest_streak,
+        total_completions=int(columns.completed.sum())
+    )
+
+
+@cached("habit/stats/numpy", habit_arg="habit_id")
+def get_habit_streaks_and_total_completions(
+        db: Session,
+        habit_id: int,
+        today_date: date
+) -> schemas.HabitStats:
+    try:
+        return _stats(_load_habit_columns(db, habit_id, completed_only=True), today_date)
+    except SQLAlchemyError:
+        raise HTTPException(status_code=500, detail="Failed to fetch habit stats")
+
+
+@cached("habit/chart/numpy", habit_arg="habit_id", start_arg="start_date", end_arg="end_date")
+def get_habit_chart_data(
+        db: Session,
+        habit_id: int,
+        view: str,
+        start_date: date,
+        end_date: date
+) -> schemas.HabitChart:
+    try:
+        columns = _load_habit_columns(db, habit_id, start_date, end_date)
+        return schemas.HabitChart(view=view, data=_chart_data(columns, view, start_date, end_date))
+    except SQLAlchemyError:
+        raise HTTPException(status_code=500, detail="Failed to fetch habit chart data")
+
+
+@cached("habit/heatmap/numpy", habit_arg="habit_id", start_arg="start_date", end_arg="end_date")
+def get_habit_heatmap_data(
+        db: Session,
+        habit_id: int,
+        start_date: date,
+        end_date: date
+) -> schemas.HabitHeatmap:
+    try:
+        columns = _load_habit_columns(db, habit_id, start_date, end_date)
+        return schemas.HabitHeatmap(heatmap_data=_heatmap_data(columns, start_date, end_date))
+    except SQLAlchemyError:
+        raise HTTPException(status_code=500, detail="Failed to fetch habit heatmap data")
+
+
+@cached("habit/details/numpy", habit_arg="habit_id")
+def get_habit_details(
+        db: Session,
+        habit_id: int,
+        today_date: date,
+        chart_view: str,
+        chart_start_date: date,
+        chart_end_date: date,
+        heatmap_start_date: date,
+        heatmap_end_date: date
+) -> schemas.HabitDetails:
+    try:
+        columns = _load_habit_columns(db, habit_id)
+        if not columns.found:
+            raise HTTPException(status_code=404, detail="Habit not found")
+
+        return schemas.HabitDetails(
+            stats=_stats(columns, today_date),
+            chart=schemas.HabitChart(view=chart_view, data=_chart_data(columns, chart_view, chart_start_date, chart_end_date)),
+            heatmap=schemas.HabitHeatmap(heatmap_data=_heatmap_data(columns, heatmap_start_date, heatmap_end_date))
+        )
+    except SQLAlchemyError:
+        raise HTTPException(status_code=500, detail="Failed to fetch habit details")
@@ -1,20 +1,52 @@
+import logging
+import math
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi.errors import RateLimitExceeded
 
-from backend.app.routers import entries, export, habits, insights, quote
-from backend.app.config import FRONTEND_URL, LOCAL_CORS_ORIGIN
+from backend.app.routers import dashboard, entries, export, habits, insights, quote
+from backend.app.config import FRONTEND_URL, LOCAL_CORS_ORIGIN, METRICS_ENABLED, PROFILING_ENABLED, PROFILING_TOKEN
+from backend.app.database import get_sqlite_settings, get_sqlite_settings_mismatches
+from backend.app.etag import NotModified
+from backend.app.metrics import RequestMetricsMiddleware, render_prometheus
+from backend.app.profiling import ProfilingMiddleware
+from backend.app.rate_limiter import RateLimitExceeded
+from backend.app.services import ai_quote, export_jobs
+
+logger = logging.getLogger("uvicorn.error")
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    settings = get_sqlite_settings()
+    logger.info("SQLite settings: %s", ", ".join(f"{key}={value}" for key, value in settings.items()))
+    for mismatch in get_sqlite_settings_mismatches(settings):
+        logger.warning("SQLite setting not applied: %s", mismatch)
+    yield
+    await ai_quote.close_client()
+    export_jobs.shutdown()
+
+
 app = FastAPI(
     title="Habityu",
     docs_url = None,
+    lifespan=lifespan,
 )
 
 @app.exception_handler(RateLimitExceeded)
 async def handle_rate_limit(request: Request, exc: RateLimitExceeded):
     return JSONResponse(
         status_code=429,
-        content={"detail": f"Rate limit exceeded: {exc.detail}"}
+        content={"detail": f"Rate limit exceeded: {exc.detail}"},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))}
+    )
+
+@app.exception_handler(NotModified)
+async def handle_not_modified(request: Request, exc: NotModified):
+    return Response(
+        status_code=304,
+        headers={"ETag": exc.etag, "Cache-Control": "no-cache"}
     )
 
 ALLOWED_ORIGINS = [FRONTEND_URL] if FRONTEND_URL else [LOCAL_CORS_ORIGIN]
@@ -25,9 +57,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["Content-Disposition"]
+    expose_headers=["Content-Disposition", "ETag", "Server-Timing", "X-Profile", "Retry-After"]
 )
 
+if PROFILING_ENABLED and not PROFILING_TOKEN:
+    logger.warning("PROFILING_ENABLED is set without PROFILING_TOKEN, the profiler is not installed")
+elif PROFILING_ENABLED:
+    # inside the metrics middleware, sampling overhead does not skew the recorded latencies
+    app.add_middleware(ProfilingMiddleware)
+
+if METRICS_ENABLED:
+    # added last so it runs outermost, the timings include CORS and the exception handlers
+    app.add_middleware(RequestMetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    def get_metrics() -> Response:
+        return Response(render_prometheus(), media_type="text/plain; version=0.0.4")
+
 @app.get("/health")
 def health_check() -> dict:
     return {"status": "healthy", "message": "Habityu API is running."}
@@ -36,4 +82,5 @@ app.include_router(habits.router, prefix="/api")
 app.include_router(entries.router, prefix="/api")
 app.include_router(insights.router, prefix="/api")
 app.include_router(export.router, prefix="/api")
-app.include_router(quote.router, prefix="/api")
\ No newline at end of file
+app.include_router(quote.router, prefix="/api")
+app.include_router(dashboard.router, prefix="/api")
\ No newline at end of file
@@ -0,0 +1,39 @@
+import argparse
+
+from backend.app import rollups, streaks
+from backend.app.database import SessionLocal
+
+
+def rebuild_streaks():
+    db = SessionLocal()
+    try:
+        rebuilt = streaks.rebuild_all_summaries(db)
+        print(f"Rebuilt {rebuilt} streak summaries")
+    finally:
+        db.close()
+
+
+def backfill_rollups():
+    db = SessionLocal()
+    try:
+        rebuilt = rollups.rebuild_all_rollups(db)
+        print(f"Rebuilt {rebuilt} daily rollups")
+    finally:
+        db.close()
+
+
+COMMANDS = {
+    "rebuild-streaks": rebuild_streaks,
+    "backfill-rollups": backfill_rollups,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Habityu database maintenance")
+    parser.add_argument("command", choices=COMMANDS.keys())
+    args = parser.parse_args()
+    COMMANDS[args.command]()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+import bisect
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from sqlalchemy import event
+
+from backend.app.cache import insight_cache
+from backend.app.config import METRICS_ENABLED, SLOW_QUERY_THRESHOLD_MS
+
+logger = logging.getLogger("uvicorn.error")
+
+# seconds, the Prometheus client defaults
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "unmatched"
+SLOW_QUERY_LOG_CHARS = 500
+
+
+class RequestStats:
+    def __init__(self, target: str):
+        self.target = target  # method and raw path, for the slow query log
+        self.route = UNMATCHED_ROUTE
+        self.statement_count = 0
+        self.sql_seconds = 0.0
+
+
+class RouteMetrics:
+    def __init__(self):
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.seconds = 0.0
+        self.statement_count = 0
+        self.sql_seconds = 0.0
+        self.status_counts = {}
+
+
+# the request's stats object, shared with the threadpool (and run_sync) calls it makes through the copied context
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+_lock = threading.Lock()
+_routes: dict[tuple[str, str], RouteMetrics] = {}
+_sql_totals = {"statements": 0, "seconds": 0.0, "slow_statements": 0}
+_single_flight_calls: dict[tuple[str, str], int] = {}
+
+
+def _before_cursor_execute(conn, _cursor, _statement, _parameters, _context, _executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, _cursor, statement, parameters, _context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.statement_count += 1
+        stats.sql_seconds += elapsed
+
+    slow = SLOW_QUERY_THRESHOLD_MS > 0 and elapsed * 1000 >= SLOW_QUERY_THRESHOLD_MS
+    with _lock:
+        _sql_totals["statements"] += 1
+        _sql_totals["seconds"] += elapsed
+        if slow:
+            _sql_totals["slow_statements"] += 1
+
+    if slow:
+        logger.warning(
+            "Slow query (%.1f ms, %s): %s %s",
+            elapsed * 1000,
+            stats.target if stats is not None else "outside a request",
+            " ".join(statement.split())[:SLOW_QUERY_LOG_CHARS],
+            f"[{len(parameters)} parameter sets]" if executemany else parameters,
+        )
+
+
+def instrument_engine(engine):
+    if not (METRICS_ENABLED or SLOW_QUERY_THRESHOLD_MS > 0):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _record_request(method: str, stats: RequestStats, status: int, seconds: float):
+    with _lock:
+        route_metrics = _routes.get((method, stats.route))
+        if route_metrics is None:
+            route_metrics = _routes[(method, stats.route)] = RouteMetrics()
+        bucket_idx = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        if bucket_idx < len(LATENCY_BUCKETS):
+            route_metrics.buckets[bucket_idx] += 1
+        route_metrics.count += 1
+        route_metrics.seconds += seconds
+        route_metrics.statement_count += stats.statement_count
+        route_metrics.sql_seconds += stats.sql_seconds
+        route_metrics.status_counts[status] = route_metrics.status_counts.get(status, 0) + 1
+
+
+def record_single_flight(function: str, coalesced: bool):
+    key = (function, "coalesced" if coalesced else "executed")
+    with _lock:
+        _single_flight_calls[key] = _single_flight_calls.get(key, 0) + 1
+
+
+def _server_timing(stats: RequestStats, seconds: float) -> bytes:
+    return (
+        f'app;dur={seconds * 1000:.1f}, '
+        f'db;dur={stats.sql_seconds * 1000:.1f};desc="{stats.statement_count} statements"'
+    ).encode("latin-1")
+
+
+_route_paths: dict = {}
+
+
+def get_route_template(scope) -> str:
+    # the router leaves the matched endpoint in the scope, labels use its path template, not the raw URL
+    if not _route_paths:
+        _route_paths.update(
+            (route.endpoint, route.path)
+            for route in scope["app"].routes
+            if hasattr(route, "endpoint")
+        )
+    return _route_paths.get(scope.get("endpoint"), UNMATCHED_ROUTE)
+
+
+class RequestMetricsMiddleware:
+    """Times every HTTP request, adds a Server-Timing header and feeds the /metrics histograms."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(f"{scope['method']} {scope['path']}")
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                stats.route = get_route_template(scope)
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", _server_timing(stats, time.perf_counter() - started)))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stats.reset(token)
+            stats.route = get_route_template(scope)
+            _record_request(scope["method"], stats, status, time.perf_counter() - started)
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{name}="{value}"' for name, value in labels.items())
+
+
+def render_prometheus() -> str:
+    lines = []
+
+    def metric(name: str, metric_type: str, help_text: str, samples: list[tuple[str, object]]):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for suffix_and_labels, value in samples:
+            lines.append(f"{name}{suffix_and_labels} {value}")
+
+    with _lock:
+        routes = sorted(_routes.items())
+        duration_samples, request_samples, statement_samples, sql_samples = [], [], [], []
+        for (method, route), route_metrics in routes:
+            cumulative = 0
+            for upper_bound, bucket_count in zip(LATENCY_BUCKETS, route_metrics.buckets):
+                cumulative += bucket_count
+                duration_samples.append((f"_bucket{{{_labels(method=method, route=route, le=upper_bound)}}}", cumulative))
+            duration_samples.append((f"_bucket{{{_labels(method=method, route=route, le='+Inf')}}}", route_metrics.count))
+            duration_samples.append((f"_sum{{{_labels(method=method, route=route)}}}", route_metrics.seconds))
+            duration_samples.append((f"_count{{{_labels(method=method, route=route)}}}", route_metrics.count))
+            for status, status_count in sorted(route_metrics.status_counts.items()):
+                request_samples.append((f"{{{_labels(method=method, route=route, status=status)}}}", status_count))
+            statement_samples.append((f"{{{_labels(method=method, route=route)}}}", route_metrics.statement_count))
+            sql_samples.append((f"{{{_labels(method=method, route=route)}}}", route_metrics.sql_seconds))
+        sql_totals = dict(_sql_totals)
+        single_flight_samples = [
+            (f"{{{_labels(function=function, result=result)}}}", call_count)
+            for (function, result), call_count in sorted(_single_flight_calls.items())
+        ]
+
+    metric("habityu_http_request_duration_seconds", "histogram", "HTTP request latency by route template.", duration_samples)
+    metric("habityu_http_requests_total", "counter", "HTTP requests by route template and status.", request_samples)
+    metric("habityu_http_request_sql_statements_total", "counter", "SQL statements issued while serving each route.", statement_samples)
+    metric("habityu_http_request_sql_duration_seconds_total", "counter", "SQL execution time while serving each route.", sql_samples)
+    metric("habityu_sql_statements_total", "counter", "SQL statements issued by this worker, in or outside requests.", [("", sql_totals["statements"])])
+    metric("habityu_sql_duration_seconds_total", "counter", "SQL execution time of this worker.", [("", sql_totals["seconds"])])
+    metric("habityu_sql_slow_statements_total", "counter", "Statements slower than SLOW_QUERY_THRESHOLD_MS.", [("", sql_totals["slow_statements"])])
+    metric("habityu_single_flight_calls_total", "counter", "Coalescable reads that executed or joined an identical call in flight.", single_flight_samples)
+
+    cache_stats = insight_cache.stats()
+    cache_labels = f"{{{_labels(backend=cache_stats['backend'])}}}"
+    for counter in ("hits", "misses", "evictions", "expirations", "invalidations"):
+        metric(f"habityu_insights_cache_{counter}_total", "counter", f"Insight cache {counter}.", [(cache_labels, cache_stats[counter])])
+    metric("habityu_insights_cache_entries", "gauge", "Responses held by the insight cache.", [(cache_labels, cache_stats["size"])])
+
+    return "\n".join(lines) + "\n"
@@ -1,5 +1,5 @@
 import enum
-from sqlalchemy import Column, Boolean, Integer, String, Float, Date, ForeignKey, Enum, Index
+from sqlalchemy import Column, Boolean, Integer, String, Float, Date, ForeignKey, Enum, Index, Computed, func, text
 from sqlalchemy.orm import relationship
 from backend.app.database import Base
 import datetime
@@ -22,16 +22,40 @@ class Habit(Base):
     unit = Column(String, nullable=True)
 
     entries = relationship("HabitEntry", back_populates="habit", cascade="all, delete-orphan")
+    streak_summary = relationship("StreakSummary", back_populates="habit", cascade="all, delete-orphan", uselist=False)
+
+
+DAY_ORDINAL_SQL = "CAST(julianday(date) - 1721424.5 AS INTEGER)"
+# not an ISO 8601 week: strftime('%W') weeks start on Monday, days before the year's first Monday are week 0,
+# and the year is the calendar year (2024-12-30 is 202453 and 2026-01-01 is 202600, both ISO week 1). It keeps
+# the buckets and labels the weekly chart grouped on with strftime('%Y')/strftime('%W') before the column existed
+WEEK_KEY_SQL = "CAST(strftime('%Y', date) AS INTEGER) * 100 + CAST(strftime('%W', date) AS INTEGER)"
+MONTH_KEY_SQL = "CAST(strftime('%Y', date) AS INTEGER) * 100 + CAST(strftime('%m', date) AS INTEGER)"
+
+
+def get_week_key(d: datetime.date) -> int:
+    # same value as WEEK_KEY_SQL, not d.isocalendar()
+    return d.year * 100 + int(d.strftime('%W'))
+
+
+def get_month_key(d: datetime.date) -> int:
+    return d.year * 100 + d.month
 
 
 class HabitEntry(Base):
     __tablename__ = "habit_entries"
 
     __table_args__ = (
-        Index('idx_date', 'date'),
-        Index('idx_habitId_date', 'habit_id', 'date'),
-        Index('idx_isCompleted', 'is_completed'),
-        Index('idx_habitId_completed', 'habit_id', 'is_completed'),
+        # the upsert target; per-habit date ranges read value/is_completed from the table through it, a covering
+        # twin with the same leading key cost every write a second B-tree for little read gain
+        Index('uq_habitEntry_habitId_date', 'habit_id', 'date', unique=True),
+        # covering index holding every column the per-day reads select, see backend/bench/query_plans.py
+        Index('idx_date_habitId_completed_value', 'date', 'habit_id', 'is_completed', 'value'),
+        # partial indexes only hold completed entries, the streak queries read nothing else
+        Index('idx_completedOnly_habitId_dayOrdinal', 'habit_id', 'day_ordinal', sqlite_where=text('is_completed = 1')),
+        Index('idx_completedOnly_dayOrdinal', 'day_ordinal', sqlite_where=text('is_completed = 1')),
+        Index('idx_habitId_weekKey_completed', 'habit_id', 'week_key', 'is_completed', 'day_ordinal'),
+        Index('idx_habitId_monthKey_completed', 'habit_id', 'month_key', 'is_completed', 'day_ordinal'),
     )
 
     id = Column(Integer, primary_key=True)
@@ -40,4 +64,48 @@ class HabitEntry(Base):
     is_completed = Column(Boolean, default=False, nullable=False)
     habit_id = Column(Integer, ForeignKey("habits.id"), nullable=False)
 
-    habit = relationship("Habit", back_populates="entries")
\ No newline at end of file
+    # integer keys derived from the YYYY-MM-DD date text, indexable unlike julianday()/strftime() in a query
+    day_ordinal = Column(Integer, Computed(DAY_ORDINAL_SQL, persisted=False))  # same as date.toordinal()
+    week_key = Column(Integer, Computed(WEEK_KEY_SQL, persisted=False))  # calendar year * 100 + Monday-based strftime('%W') week, see WEEK_KEY_SQL
+    month_key = Column(Integer, Computed(MONTH_KEY_SQL, persisted=False))  # year * 100 + month
+
+    habit = relationship("Habit", back_populates="entries")
+
+
+class StreakSummary(Base):
+    __tablename__ = "streak_summaries"
+
+    id = Column(Integer, primary_key=True)
+    habit_id = Column(Integer, ForeignKey("habits.id"), nullable=True)
+    last_run_start = Column(Date, nullable=True)
+    last_run_end = Column(Date, nullable=True)
+    longest_run_start = Column(Date, nullable=True)
+    longest_run_end = Column(Date, nullable=True)
+    longest_run_length = Column(Integer, nullable=False, default=0)
+
+    habit = relationship("Habit", back_populates="streak_summary")
+
+
+
+class DataVersion(Base):
+    __tablename__ = "data_versions"
+
+    # single row, bumped by every committed write so clients can revalidate cheaply
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+# one row per habit plus a single overall row (habit_id IS NULL)
+Index('uq_streakSummary_scope', func.coalesce(StreakSummary.habit_id, 0), unique=True)
+# plain column lookups: deleting a habit's summary, the habit.streak_summary load and the foreign key check
+# when a habit row is deleted, none of which the expression index above can serve
+Index('idx_streakSummary_habitId', StreakSummary.habit_id)
+
+
+class DailyRollup(Base):
+    __tablename__ = "daily_rollups"
+
+    date = Column(Date, primary_key=True)
+    completion_sum = Column(Float, nullable=False, default=0)  # sum of the completion percentage of every entry
+    completed_count = Column(Integer, nullable=False, default=0)
+    entry_count = Column(Integer, nullable=False, default=0)  # entries logged that day, completed or not
@@ -0,0 +1,167 @@
+import functools
+import hmac
+import logging
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from typing import Callable
+from urllib.parse import parse_qs
+
+from backend.app.config import PROFILE_DIR, PROFILING_ALLOWED_IPS, PROFILING_INTERVAL_MS, PROFILING_TOKEN
+from backend.app.metrics import get_route_template
+
+logger = logging.getLogger("uvicorn.error")
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_TOKEN_HEADER = b"x-profile-token"
+PROFILE_QUERY_FLAG = "profile"
+
+
+class StackSampler:
+    """Samples the stacks of the threads serving one request into collapsed (folded) stack counts."""
+
+    def __init__(self, interval: float, request_frame):
+        self.interval = interval
+        self.samples = Counter()
+        self.sample_count = 0
+        # the event loop thread also runs other requests, its samples only count while this request's frame is on the stack
+        self._loop_thread_id = threading.get_ident()
+        self._request_frame = request_frame
+        self._worker_thread_ids = set()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="habityu-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def add_thread(self, thread_id: int):
+        with self._lock:
+            self._worker_thread_ids.add(thread_id)
+
+    def remove_thread(self, thread_id: int):
+        with self._lock:
+            self._worker_thread_ids.discard(thread_id)
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                worker_thread_ids = list(self._worker_thread_ids)
+            self.sample_count += 1
+
+            loop_stack = _stack_until(frames.get(self._loop_thread_id), self._request_frame)
+            if loop_stack is not None:
+                self.samples[";".join(["event-loop", *loop_stack])] += 1
+            for thread_id in worker_thread_ids:
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self.samples[";".join(["worker", *_stack_until(frame, None)])] += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+def _frame_name(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}"
+
+
+def _stack_until(frame, root_frame) -> list[str] | None:
+    # root first, as flamegraph.pl and speedscope expect; None when root_frame is not on the stack
+    stack = []
+    while frame is not None:
+        stack.append(_frame_name(frame))
+        if frame is root_frame:
+            return stack[::-1]
+        frame = frame.f_back
+    return stack[::-1] if root_frame is None else None
+
+
+_active_sampler: ContextVar[StackSampler | None] = ContextVar("active_sampler", default=None)
+
+
+def track_thread(fn: Callable) -> Callable:
+    # wraps a callable handed to the threadpool so a profiled request also samples the worker thread running it
+    sampler = _active_sampler.get()
+    if sampler is None:
+        return fn
+
+    @functools.wraps(fn)
+    def tracked(*args, **kwargs):
+        thread_id = threading.get_ident()
+        sampler.add_thread(thread_id)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            sampler.remove_thread(thread_id)
+
+    return tracked
+
+
+def _has_profiling_token(headers) -> bool:
+    # the peer address alone is the proxy's behind a reverse proxy, only the shared secret authorizes a profile
+    token = next((value for name, value in headers if name == PROFILE_TOKEN_HEADER), b"")
+    return bool(PROFILING_TOKEN) and hmac.compare_digest(token, PROFILING_TOKEN.encode())
+
+
+def _profile_requested(scope) -> bool:
+    if (scope.get("client") or ("",))[0] not in PROFILING_ALLOWED_IPS:
+        return False
+    flagged = (
+        any(name == PROFILE_HEADER and value == b"1" for name, value in scope["headers"])
+        or parse_qs(scope.get("query_string", b"").decode("latin-1")).get(PROFILE_QUERY_FLAG) == ["1"]
+    )
+    return flagged and _has_profiling_token(scope["headers"])
+
+
+def _write_profile(scope, sampler: StackSampler) -> str:
+    # one directory per route template, e.g. GET_api_insights_habit_id_chart/20261018T120000-1a2b3c4d.folded
+    route_key = re.sub(r"[^A-Za-z0-9]+", "_", f"{scope['method']} {get_route_template(scope)}").strip("_")
+    file_name = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}.folded"
+    route_dir = PROFILE_DIR / route_key
+    route_dir.mkdir(parents=True, exist_ok=True)
+    (route_dir / file_name).write_text(sampler.folded())
+    return f"{route_key}/{file_name}"
+
+
+class ProfilingMiddleware:
+    """Runs requests flagged with `X-Profile: 1` or `?profile=1` from an allowed client holding the token under a stack sampler."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _profile_requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        sampler = StackSampler(PROFILING_INTERVAL_MS / 1000, sys._getframe())
+        token = _active_sampler.set(sampler)
+        sampler.start()
+        profile_written = False
+
+        async def send_with_profile(message):
+            nonlocal profile_written
+            # the response body is ready once it starts, the profile is written before the header points at it
+            if message["type"] == "http.response.start":
+                sampler.stop()
+                profile_written = True
+                profile_path = _write_profile(scope, sampler)
+                logger.info("Profile of %s %s (%d samples): %s", scope["method"], scope["path"], sampler.sample_count, profile_path)
+                message = {**message, "headers": [*message.get("headers", []), (PROFILE_HEADER, profile_path.encode("latin-1"))]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            _active_sampler.reset(token)
+            if not profile_written:
+                sampler.stop()
@@ -1,10 +1,258 @@
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+import functools
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, NamedTuple
 from fastapi import Request
+from starlette.concurrency import run_in_threadpool
+
+from backend.app.config import (
+    RATE_LIMIT_ENABLED,
+    RATE_LIMIT_STORAGE,
+    RATE_LIMIT_CLIENT_BUDGET,
+    RATE_LIMIT_MEMORY_MAX_KEYS,
+    RATE_LIMIT_SQLITE_PATH,
+    RATE_LIMIT_FAIL_OPEN,
+)
+from backend.app.profiling import track_thread
+
+logger = logging.getLogger("uvicorn.error")
+
+# GCRA: every key stores one number, its theoretical arrival time (TAT). A request costing `cost` moves the
+# TAT by cost * period / limit and is allowed while the new TAT stays within one period of now, so a check is
+# O(1) and a full budget can be spent in a burst.
+
+_RATE_PATTERN = re.compile(r"^\s*(\d+)\s*(?:/|per)\s*(\d*)\s*(second|minute|hour|day)s?\s*$")
+_PERIOD_SECONDS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+class RateLimit(NamedTuple):
+    limit: int
+    period_seconds: float
+    text: str
+
+    @property
+    def emission_interval(self) -> float:
+        return self.period_seconds / self.limit
+
+
+def parse_rate(rate: str) -> RateLimit:
+    # "60/minute", "10 per minute", "100/5 minutes"
+    match = _RATE_PATTERN.match(rate)
+    if match is None:
+        raise ValueError(f"Invalid rate limit {rate!r}")
+    limit, multiple, unit = int(match[1]), int(match[2] or 1), match[3]
+    return RateLimit(limit, multiple * _PERIOD_SECONDS[unit], f"{limit} per {multiple} {unit}")
+
+
+class Acquire(NamedTuple):
+    key: str
+    rate: RateLimit
+    cost: int
+
+
+class RateLimitExceeded(Exception):
+    def __init__(self, rate: RateLimit, retry_after: float):
+        super().__init__(rate.text)
+        self.detail = rate.text
+        self.retry_after = retry_after
+
+
+class RateLimitStoreUnavailable(Exception):
+    """The store could not answer, e.g. its SQLite file stayed locked by another worker past the busy timeout."""
+
+
+def _next_tats(acquires: list[Acquire], tats: list[float | None], now: float) -> tuple[list[float], float]:
+    # the new TAT of every key, and 0 when all fit or the seconds until the most limited one would
+    new_tats, retry_after = [], 0.0
+    for acquire, tat in zip(acquires, tats):
+        new_tat = max(tat or now, now) + acquire.cost * acquire.rate.emission_interval
+        new_tats.append(new_tat)
+        retry_after = max(retry_after, new_tat - acquire.rate.period_seconds - now)
+    return new_tats, retry_after
+
+
+class RateLimitStore:
+    # stores doing I/O are called from the threadpool, in-process stores answer on the event loop
+    blocking = False
+
+    def acquire(self, acquires: list[Acquire]) -> tuple[int, float]:
+        """Charges every key or none of them; returns the index of the limit that failed (-1 when all passed) and the retry delay.
+
+        Raises RateLimitStoreUnavailable when the store cannot answer.
+        """
+        raise NotImplementedError
+
+    def reset(self):
+        raise NotImplementedError
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """Per-process store, bounded by evicting the least recently used keys."""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._tats: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, acquires: list[Acquire]) -> tuple[int, float]:
+        now = time.monotonic()
+        with self._lock:
+            new_tats, retry_after = _next_tats(acquires, [self._tats.get(acquire.key) for acquire in acquires], now)
+            for idx, (acquire, new_tat) in enumerate(zip(acquires, new_tats)):
+                if new_tat - acquire.rate.period_seconds > now:
+                    return idx, retry_after
+            for acquire, new_tat in zip(acquires, new_tats):
+                self._tats[acquire.key] = new_tat
+                self._tats.move_to_end(acquire.key)
+            while len(self._tats) > self.max_keys:
+                self._tats.popitem(last=False)
+            return -1, 0.0
+
+    def reset(self):
+        with self._lock:
+            self._tats.clear()
+
+
+class SqliteRateLimitStore(RateLimitStore):
+    """Store in a small SQLite file every worker on the host opens, so the limits hold across workers."""
+
+    # expired keys (TAT in the past) are deleted every this many acquires
+    PRUNE_EVERY = 1000
+    # how long an acquire waits for another worker's write lock before the store counts as unavailable
+    BUSY_TIMEOUT_SECONDS = 1
+    blocking = True
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._acquires = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.BUSY_TIMEOUT_SECONDS, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")
+            connection.execute("CREATE TABLE IF NOT EXISTS rate_limits (key TEXT PRIMARY KEY, tat REAL NOT NULL) WITHOUT ROWID")
+            self._local.connection = connection
+        return connection
+
+    def acquire(self, acquires: list[Acquire]) -> tuple[int, float]:
+        try:
+            return self._acquire(acquires)
+        except sqlite3.OperationalError as error:
+            raise RateLimitStoreUnavailable(str(error)) from error
+
+    def _acquire(self, acquires: list[Acquire]) -> tuple[int, float]:
+        connection = self._connection()
+        # wall clock, the TATs are compared between processes
+        now = time.time()
+        keys = [acquire.key for acquire in acquires]
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            stored = dict(connection.execute(
+                f"SELECT key, tat FROM rate_limits WHERE key IN ({', '.join('?' * len(keys))})", keys
+            ).fetchall())
+            new_tats, retry_after = _next_tats(acquires, [stored.get(key) for key in keys], now)
+            for idx, (acquire, new_tat) in enumerate(zip(acquires, new_tats)):
+                if new_tat - acquire.rate.period_seconds > now:
+                    connection.execute("ROLLBACK")
+                    return idx, retry_after
+            connection.executemany(
+                "INSERT INTO rate_limits (key, tat) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET tat = excluded.tat",
+                zip(keys, new_tats)
+            )
+            self._acquires += 1
+            if self._acquires % self.PRUNE_EVERY == 0:
+                connection.execute("DELETE FROM rate_limits WHERE tat < ?", (now,))
+            connection.execute("COMMIT")
+            return -1, 0.0
+        except BaseException:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            raise
+
+    def reset(self):
+        self._connection().execute("DELETE FROM rate_limits")
+
+
+# a store shared between hosts (e.g. a cache server client) registers a factory here
+RATE_LIMIT_STORES: dict[str, Callable[[], RateLimitStore]] = {
+    "memory": lambda: MemoryRateLimitStore(RATE_LIMIT_MEMORY_MAX_KEYS),
+    "sqlite": lambda: SqliteRateLimitStore(str(RATE_LIMIT_SQLITE_PATH)),
+}
+
+
+def register_rate_limit_store(name: str, factory: Callable[[], RateLimitStore]):
+    RATE_LIMIT_STORES[name] = factory
+
 
 def _get_user_ip_address(request: Request) -> str:
-    return get_remote_address(request)
+    return request.client.host if request.client else "127.0.0.1"
+
+
+class RateLimiter:
+    """Per-route limits plus one budget per client that every limited route draws `cost` from."""
+
+    def __init__(
+        self,
+        key_func: Callable[[Request], str],
+        store: RateLimitStore,
+        client_budget: str,
+        enabled: bool = True,
+        fail_open: bool = True,
+    ):
+        self.key_func = key_func
+        self.store = store
+        self.client_budget = parse_rate(client_budget)
+        self.enabled = enabled
+        self.fail_open = fail_open
+
+    def check(self, request: Request, route_key: str, route_rate: RateLimit, cost: int):
+        client = self.key_func(request)
+        acquires = [
+            Acquire(f"{client}:{route_key}", route_rate, 1),
+            Acquire(f"{client}:*", self.client_budget, cost),
+        ]
+        try:
+            failed_idx, retry_after = self.store.acquire(acquires)
+        except RateLimitStoreUnavailable as error:
+            if self.fail_open:
+                logger.warning("Rate limit store unavailable, %s allowed unchecked: %s", route_key, error)
+                return
+            # rejected like an exceeded limit, the client backs off for a second instead of getting a 500
+            raise RateLimitExceeded(route_rate, 1) from error
+        if failed_idx >= 0:
+            raise RateLimitExceeded(acquires[failed_idx].rate, retry_after)
+
+    def limit(self, rate: str, cost: int = 1):
+        route_rate = parse_rate(rate)
+
+        def decorator(fn):
+            route_key = f"{fn.__module__}.{fn.__qualname__}"
+
+            @functools.wraps(fn)
+            async def wrapper(*args, request: Request, **kwargs):
+                if self.enabled and self.store.blocking:
+                    # a store waiting on a lock must not stall every other request on the event loop
+                    await run_in_threadpool(track_thread(self.check), request, route_key, route_rate, cost)
+                elif self.enabled:
+                    self.check(request, route_key, route_rate, cost)
+                return await fn(*args, request=request, **kwargs)
+
+            return wrapper
+
+        return decorator
+
 
-global_rate_limiter = Limiter(
+global_rate_limiter = RateLimiter(
     key_func=_get_user_ip_address,
-)
\ No newline at end of file
+    store=RATE_LIMIT_STORES[RATE_LIMIT_STORAGE](),
+    client_budget=RATE_LIMIT_CLIENT_BUDGET,
+    enabled=RATE_LIMIT_ENABLED,
+    fail_open=RATE_LIMIT_FAIL_OPEN,
+)
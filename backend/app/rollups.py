@@ -0,0 +1,60 @@
+from datetime import date
+from typing import Iterable, List
+from sqlalchemy import func, case, select, delete, insert
+from sqlalchemy.orm import Session
+
+from backend.app import models
+from backend.app.insights import _get_habit_completion_percentage
+
+# daily_rollups keeps one row per date with at least one entry, so the calendar reads a range of
+# precomputed rows instead of aggregating every entry. Writes recompute only the dates they touch.
+
+# one bound parameter per date, well below SQLite's variable limit
+ROLLUP_CHUNK_SIZE = 500
+
+
+def _rollup_query():
+    return select(
+        models.HabitEntry.date,
+        func.sum(_get_habit_completion_percentage()),
+        func.sum(case((models.HabitEntry.is_completed == True, 1), else_=0)),
+        func.count()
+    ).join(
+        models.Habit,
+        models.HabitEntry.habit_id == models.Habit.id
+    ).group_by(
+        models.HabitEntry.date
+    )
+
+
+def _insert_rollups(query):
+    return insert(models.DailyRollup).from_select(
+        ["date", "completion_sum", "completed_count", "entry_count"],
+        query
+    )
+
+
+def refresh_days(db: Session, days: Iterable[date]):
+    # expects the entry changes to be flushed, commit is left to the caller
+    days = sorted(set(days))
+    for chunk_start in range(0, len(days), ROLLUP_CHUNK_SIZE):
+        chunk = days[chunk_start:chunk_start + ROLLUP_CHUNK_SIZE]
+        db.execute(delete(models.DailyRollup).where(models.DailyRollup.date.in_(chunk)))
+        db.execute(_insert_rollups(_rollup_query().filter(models.HabitEntry.date.in_(chunk))))
+
+
+def get_habit_days(db: Session, habit_id: int) -> List[date]:
+    return db.scalars(
+        select(models.HabitEntry.date).filter(models.HabitEntry.habit_id == habit_id)
+    ).all()
+
+
+def refresh_habit(db: Session, habit_id: int):
+    refresh_days(db, get_habit_days(db, habit_id))
+
+
+def rebuild_all_rollups(db: Session) -> int:
+    db.execute(delete(models.DailyRollup))
+    db.execute(_insert_rollups(_rollup_query()))
+    db.commit()
+    return db.scalar(select(func.count()).select_from(models.DailyRollup))
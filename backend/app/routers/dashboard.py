@@ -0,0 +1,37 @@
+from typing import List
+from fastapi import Request, APIRouter, Depends, Query
+from datetime import date
+
+from backend.app import insights
+from backend.app import schemas
+from backend.app.db_session import DbSession, get_db
+from backend.app.etag import etag_guard
+from backend.app.rate_limiter import global_rate_limiter
+from backend.app.single_flight import run_db_coalesced
+
+router = APIRouter(
+    prefix="/dashboard",
+)
+
+@router.get("", response_model=schemas.Dashboard, dependencies=[Depends(etag_guard)])
+@global_rate_limiter.limit("60/minute")
+async def get_dashboard(
+    request: Request,
+    today_date: date | None = None,
+    calendar_start_date: date | None = None,
+    calendar_end_date: date | None = None,
+    grid_start_date: date | None = None,
+    grid_end_date: date | None = None,
+    sections: List[schemas.DashboardSection] = Query(default=list(schemas.DashboardSection)),
+    db: DbSession = Depends(get_db)
+):
+    return await run_db_coalesced(
+        db,
+        insights.get_dashboard_data,
+        sections=sections,
+        today_date=today_date,
+        calendar_start_date=calendar_start_date,
+        calendar_end_date=calendar_end_date,
+        grid_start_date=grid_start_date,
+        grid_end_date=grid_end_date
+    )
\ No newline at end of file
@@ -1,8 +1,8 @@
+from typing import List
 from fastapi import Request, APIRouter, Depends
-from sqlalchemy.orm import Session
 
 from backend.app import crud, schemas
-from backend.app.db_session import get_db_session
+from backend.app.db_session import DbSession, get_db, run_db
 from backend.app.rate_limiter import global_rate_limiter
 
 router = APIRouter(
@@ -11,9 +11,18 @@ router = APIRouter(
 
 @router.post("", response_model=schemas.GetHabitEntry | None)
 @global_rate_limiter.limit("60/minute")
-def create_or_update_entry(
+async def create_or_update_entry(
         request: Request,
         entry: schemas.CreateHabitEntry,
-        db: Session = Depends(get_db_session)
+        db: DbSession = Depends(get_db)
 ):
-    return crud.create_or_update_entry(db=db, entry=entry)
\ No newline at end of file
+    return await run_db(db, crud.create_or_update_entry, entry=entry)
+
+@router.post("/batch", response_model=List[schemas.BatchEntryResult])
+@global_rate_limiter.limit("10/minute", cost=5)
+async def create_or_update_entries(
+        request: Request,
+        batch: schemas.CreateHabitEntryBatch,
+        db: DbSession = Depends(get_db)
+):
+    return await run_db(db, crud.create_or_update_entries, entries=batch.entries)
\ No newline at end of file
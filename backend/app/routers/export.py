@@ -1,25 +1,66 @@
-from fastapi import Request, APIRouter, Depends
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from fastapi import Request, APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse, JSONResponse
 from datetime import date
 
-from backend.app.db_session import get_db_session
+from backend.app import crud, schemas
+from backend.app.db_session import DbSession, get_db, run_db
 from backend.app.rate_limiter import global_rate_limiter
-from backend.app.services.pdf_report import create_full_report
+from backend.app.services import export_jobs
 
 router = APIRouter(
     prefix="/export",
 )
 
-@router.get("/pdf")
-@global_rate_limiter.limit("10/minute")
-def export_pdf_report(request: Request, today_date: date, db: Session = Depends(get_db_session)):
-    pdf = create_full_report(db, today_date)
 
-    return StreamingResponse(
-        [pdf],
+def _report_response(job_id: str) -> FileResponse:
+    return FileResponse(
+        export_jobs.get_report_path(job_id),
         media_type="application/pdf",
-        headers={
-            "Content-Disposition": f"attachment; filename=habit_insights_report_{today_date}.pdf"
-        }
-    )
\ No newline at end of file
+        filename=export_jobs.get_report_filename(job_id),
+    )
+
+
+@router.post("/pdf", status_code=202)
+@global_rate_limiter.limit("10/minute", cost=10)
+async def create_pdf_report_job(
+        request: Request,
+        today_date: date,
+        period: schemas.ReportPeriod = schemas.ReportPeriod.WEEK,
+        db: DbSession = Depends(get_db)
+) -> schemas.ExportJob:
+    data_version = await run_db(db, crud.get_data_version)
+    job_id = export_jobs.submit_job(today_date, period, data_version)
+    return schemas.ExportJob(job_id=job_id, status=export_jobs.get_job_status(job_id))
+
+
+@router.get("/pdf/{job_id}", response_model=schemas.ExportJob)
+@global_rate_limiter.limit("60/minute")
+async def get_pdf_report(request: Request, job_id: str):
+    status = export_jobs.get_job_status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Export job not found.")
+    if status == schemas.ExportJobStatus.FAILED:
+        raise HTTPException(status_code=500, detail="Failed to generate the PDF report.")
+    if status == schemas.ExportJobStatus.PENDING:
+        return JSONResponse(status_code=202, content={"job_id": job_id, "status": status.value})
+
+    return _report_response(job_id)
+
+
+@router.get("/pdf")
+@global_rate_limiter.limit("10/minute", cost=10)
+async def export_pdf_report(
+        request: Request,
+        today_date: date,
+        period: schemas.ReportPeriod = schemas.ReportPeriod.WEEK,
+        db: DbSession = Depends(get_db)
+):
+    # kept for existing clients, waits on the same job pipeline without blocking a worker thread
+    data_version = await run_db(db, crud.get_data_version)
+    job_id = export_jobs.submit_job(today_date, period, data_version)
+
+    status = await export_jobs.wait_for_job(job_id)
+    if status != schemas.ExportJobStatus.DONE:
+        raise HTTPException(status_code=500, detail="Failed to generate the PDF report.")
+
+    return _report_response(job_id)
@@ -1,11 +1,12 @@
 from datetime import date
 from typing import List
 from fastapi import Request, APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
 
 from backend.app import crud, schemas
-from backend.app.db_session import get_db_session
+from backend.app.db_session import DbSession, get_db, run_db
+from backend.app.etag import etag_guard
 from backend.app.rate_limiter import global_rate_limiter
+from backend.app.single_flight import run_db_coalesced
 
 router = APIRouter(
     prefix="/habits",
@@ -13,43 +14,43 @@ router = APIRouter(
 
 @router.post("", response_model=schemas.GetHabit)
 @global_rate_limiter.limit("60/minute")
-def create_habit(
+async def create_habit(
         habit: schemas.CreateHabit,
         request: Request,
-        db: Session = Depends(get_db_session)
+        db: DbSession = Depends(get_db)
 ):
-    return crud.create_habit(db=db, habit=habit)
+    return await run_db(db, crud.create_habit, habit=habit)
 
-@router.get("/grid", response_model=List[schemas.HabitTable])
+@router.get("/grid", response_model=List[schemas.HabitTable], dependencies=[Depends(etag_guard)])
 @global_rate_limiter.limit("60/minute")
-def get_habit_table(
+async def get_habit_table(
     request: Request,
     start_date: date,
     end_date: date,
-    db: Session = Depends(get_db_session)
+    db: DbSession = Depends(get_db)
 ):
-    return crud.get_habit_table_data(db=db, start_date=start_date, end_date=end_date)
+    return await run_db_coalesced(db, crud.get_habit_table_data, start_date=start_date, end_date=end_date)
 
 @router.put("/{habit_id}", response_model=schemas.GetHabit)
 @global_rate_limiter.limit("60/minute")
-def update_habit(
+async def update_habit(
         request: Request,
         habit_id: int,
         habit_update: schemas.CreateHabit,
-        db: Session = Depends(get_db_session)
+        db: DbSession = Depends(get_db)
 ):
-    habit = crud.get_habit(db, habit_id=habit_id)
+    habit = await run_db(db, crud.get_habit, habit_id=habit_id)
     if habit is None:
         raise HTTPException(status_code=404, detail="Habit not found")
-    return crud.update_habit(db=db, curr_habit=habit, habit_update=habit_update)
+    return await run_db(db, crud.update_habit, curr_habit=habit, habit_update=habit_update)
 
 
 @router.delete("/{habit_id}", status_code=204)
 @global_rate_limiter.limit("60/minute")
-def delete_habit(request: Request, habit_id: int, db: Session = Depends(get_db_session)):
-    habit = crud.get_habit(db, habit_id=habit_id)
+async def delete_habit(request: Request, habit_id: int, db: DbSession = Depends(get_db)):
+    habit = await run_db(db, crud.get_habit, habit_id=habit_id)
     if habit is None:
         raise HTTPException(status_code=404, detail="Habit not found")
 
-    crud.delete_habit(db=db, curr_habit=habit)
+    await run_db(db, crud.delete_habit, curr_habit=habit)
     return
\ No newline at end of file
@@ -1,74 +1,105 @@
-from fastapi import Request, APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import Request, APIRouter, Depends, HTTPException
 from datetime import date
 
 from backend.app import insights
+from backend.app.cache import insight_cache
 from backend.app import schemas
-from backend.app.db_session import get_db_session
+from backend.app.config import INSIGHTS_ENGINE
+from backend.app.db_session import DbSession, get_db
+from backend.app.etag import etag_guard
 from backend.app.rate_limiter import global_rate_limiter
+from backend.app.single_flight import run_db_coalesced
 
 router = APIRouter(
     prefix="/insights",
 )
 
+
+def _get_insights_engine(engine: schemas.InsightsEngine | None):
+    if (engine or INSIGHTS_ENGINE) != schemas.InsightsEngine.NUMPY:
+        return insights
+
+    try:
+        from backend.app import insights_numpy
+    except ImportError:
+        raise HTTPException(status_code=400, detail="The numpy insights engine needs NumPy installed")
+    return insights_numpy
+
+
 @router.get(
     "/overall/week",
-    response_model=schemas.SidebarWeekInsights
+    response_model=schemas.SidebarWeekInsights,
+    dependencies=[Depends(etag_guard)]
 )
 @global_rate_limiter.limit("60/minute")
-def get_sidebar_week_insights(
+async def get_sidebar_week_insights(
     request: Request,
     today_date: date,
-    db: Session = Depends(get_db_session)
+    db: DbSession = Depends(get_db)
 ):
-    return insights.get_sidebar_week_insights(db=db, today_date=today_date)
+    return await run_db_coalesced(db, insights.get_sidebar_week_insights, today_date=today_date)
 
 @router.get(
     "/overall/calendar",
-    response_model=schemas.SidebarCalendarInsights
+    response_model=schemas.SidebarCalendarInsights,
+    dependencies=[Depends(etag_guard)]
 )
 @global_rate_limiter.limit("60/minute")
-def get_sidebar_calendar_insights(
+async def get_sidebar_calendar_insights(
     request: Request,
     start_date: date,
     end_date: date,
-    db: Session = Depends(get_db_session)
+    db: DbSession = Depends(get_db)
 ):
-    return insights.get_sidebar_calendar_insights(
-        db=db,
+    return await run_db_coalesced(
+        db,
+        insights.get_sidebar_calendar_insights,
         start_date=start_date,
         end_date=end_date
     )
 
+@router.get(
+    "/cache",
+    response_model=schemas.CacheStats
+)
+@global_rate_limiter.limit("60/minute")
+async def get_insights_cache_stats(request: Request):
+    return insight_cache.stats()
+
 @router.get(
     "/{habit_id}/stats",
-    response_model=schemas.HabitStats
+    response_model=schemas.HabitStats,
+    dependencies=[Depends(etag_guard)]
 )
 @global_rate_limiter.limit("60/minute")
-def get_habit_stats(
+async def get_habit_stats(
     request: Request,
     habit_id: int,
     today_date: date,
-    db: Session = Depends(get_db_session)
+    engine: schemas.InsightsEngine | None = None,
+    db: DbSession = Depends(get_db)
 ):
-    return insights.get_habit_streaks_and_total_completions(db=db, habit_id=habit_id, today_date=today_date)
+    return await run_db_coalesced(db, _get_insights_engine(engine).get_habit_streaks_and_total_completions, habit_id=habit_id, today_date=today_date)
 
 
 @router.get(
     "/{habit_id}/chart",
-    response_model=schemas.HabitChart
+    response_model=schemas.HabitChart,
+    dependencies=[Depends(etag_guard)]
 )
 @global_rate_limiter.limit("60/minute")
-def get_habit_chart(
+async def get_habit_chart(
     request: Request,
     habit_id: int,
     start_date: date,
     end_date: date,
     chart_view: str = "weekly",
-    db: Session = Depends(get_db_session)
+    engine: schemas.InsightsEngine | None = None,
+    db: DbSession = Depends(get_db)
 ):
-    return insights.get_habit_chart_data(
-        db=db,
+    return await run_db_coalesced(
+        db,
+        _get_insights_engine(engine).get_habit_chart_data,
         habit_id=habit_id,
         view=chart_view,
         start_date=start_date,
@@ -78,19 +109,53 @@ def get_habit_chart(
 
 @router.get(
     "/{habit_id}/heatmap",
-    response_model=schemas.HabitHeatmap
+    response_model=schemas.HabitHeatmap,
+    dependencies=[Depends(etag_guard)]
 )
 @global_rate_limiter.limit("60/minute")
-def get_habit_heatmap(
+async def get_habit_heatmap(
     request: Request,
     habit_id: int,
     start_date: date,
     end_date: date,
-    db: Session = Depends(get_db_session)
+    engine: schemas.InsightsEngine | None = None,
+    db: DbSession = Depends(get_db)
 ):
-    return insights.get_habit_heatmap_data(
-        db=db,
+    return await run_db_coalesced(
+        db,
+        _get_insights_engine(engine).get_habit_heatmap_data,
         habit_id=habit_id,
         start_date=start_date,
         end_date=end_date
+    )
+
+
+@router.get(
+    "/{habit_id}/details",
+    response_model=schemas.HabitDetails,
+    dependencies=[Depends(etag_guard)]
+)
+@global_rate_limiter.limit("60/minute")
+async def get_habit_details(
+    request: Request,
+    habit_id: int,
+    today_date: date,
+    chart_start_date: date,
+    chart_end_date: date,
+    heatmap_start_date: date,
+    heatmap_end_date: date,
+    chart_view: str = "weekly",
+    engine: schemas.InsightsEngine | None = None,
+    db: DbSession = Depends(get_db)
+):
+    return await run_db_coalesced(
+        db,
+        _get_insights_engine(engine).get_habit_details,
+        habit_id=habit_id,
+        today_date=today_date,
+        chart_view=chart_view,
+        chart_start_date=chart_start_date,
+        chart_end_date=chart_end_date,
+        heatmap_start_date=heatmap_start_date,
+        heatmap_end_date=heatmap_end_date
     )
\ No newline at end of file
@@ -1,8 +1,7 @@
 from fastapi import Request, APIRouter, Depends
-from sqlalchemy.orm import Session
 
 from backend.app import schemas
-from backend.app.db_session import get_db_session
+from backend.app.db_session import DbSession, get_db
 from backend.app.services import ai_quote
 from backend.app.rate_limiter import global_rate_limiter
 
@@ -11,10 +10,10 @@ router = APIRouter(
 )
 
 @router.get("", response_model=schemas.QuoteBase)
-@global_rate_limiter.limit("10/minute")
+@global_rate_limiter.limit("10/minute", cost=5)
 async def get_ai_motivational_quote(
         request: Request,
-        db: Session = Depends(get_db_session)
+        db: DbSession = Depends(get_db)
 ):
     quote = await ai_quote.get_motivational_quote(db)
     return quote
\ No newline at end of file
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import date
 from typing import List
 import enum
@@ -10,6 +10,31 @@ class DayStatus(str, enum.Enum):
     MISSED = "missed"
     PENDING = "pending"
 
+class BatchEntryStatus(str, enum.Enum):
+    SAVED = "saved"
+    DELETED = "deleted"
+    SKIPPED = "skipped"
+    FAILED = "failed"
+
+class ExportJobStatus(str, enum.Enum):
+    PENDING = "pending"
+    DONE = "done"
+    FAILED = "failed"
+
+class ReportPeriod(str, enum.Enum):
+    WEEK = "week"
+    MONTH = "month"
+    YEAR = "year"
+
+class InsightsEngine(str, enum.Enum):
+    SQL = "sql"
+    NUMPY = "numpy"
+
+class DashboardSection(str, enum.Enum):
+    WEEK = "week"
+    CALENDAR = "calendar"
+    GRID = "grid"
+
 class WeekDay(str, enum.Enum):
     MON = "mon"
     TUE = "tue"
@@ -49,6 +74,15 @@ class GetHabitEntry(HabitEntryBase):
     id: int
     model_config = ConfigDict(from_attributes=True)
 
+class CreateHabitEntryBatch(BaseModel):
+    entries: List[CreateHabitEntry] = Field(max_length=5000)
+
+class BatchEntryResult(BaseModel):
+    index: int
+    status: BatchEntryStatus
+    entry: GetHabitEntry | None = None
+    detail: str | None = None
+
 
 class SingleWeekDayStat(BaseModel):
     day: WeekDay
@@ -66,6 +100,16 @@ class SidebarWeekInsights(BaseModel):
 class SidebarCalendarInsights(BaseModel):
     calendar_stats: List[SingleCalendarDayStat]
 
+class CacheStats(BaseModel):
+    backend: str
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+
 class ChartDataPoint(BaseModel):
     date: str
     value: float
@@ -86,5 +130,19 @@ class HabitChart(BaseModel):
 class HabitHeatmap(BaseModel):
     heatmap_data: List[HeatmapDataPoint]
 
+class HabitDetails(BaseModel):
+    stats: HabitStats
+    chart: HabitChart
+    heatmap: HabitHeatmap
+
 class HabitTable(GetHabit):
-    entries: List[GetHabitEntry]
\ No newline at end of file
+    entries: List[GetHabitEntry]
+
+class Dashboard(BaseModel):
+    week: SidebarWeekInsights | None = None
+    calendar: SidebarCalendarInsights | None = None
+    grid: List[HabitTable] | None = None
+
+class ExportJob(BaseModel):
+    job_id: str
+    status: ExportJobStatus
\ No newline at end of file
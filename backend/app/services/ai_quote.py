@@ -1,61 +1,214 @@
-import httpx
+import asyncio
 import json
+import time
+from typing import TYPE_CHECKING, Callable
 from fastapi import HTTPException
-import asyncio
-from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
 from backend.app import crud
-from backend.app.config import OPENROUTER_API_KEY, OPENROUTER_MODEL, OPENROUTER_URL
+from backend.app.db_session import DbSession, run_db
+from backend.app.services.quote_cache import QuotePool, quote_cache
+from backend.app.config import (
+    OPENROUTER_API_KEY,
+    OPENROUTER_MODEL,
+    OPENROUTER_URL,
+    QUOTE_CONNECT_TIMEOUT_SECONDS,
+    QUOTE_READ_TIMEOUT_SECONDS,
+    QUOTE_MAX_CONCURRENCY,
+    QUOTE_BREAKER_FAILURES,
+    QUOTE_BREAKER_RESET_SECONDS,
+    QUOTE_CACHE_ENABLED,
+    QUOTE_POOL_SIZE,
+    QUOTE_POOL_LOW_WATERMARK,
+)
+
+if TYPE_CHECKING:
+    import httpx
 
 DEFAULT_QUOTE = "Success is the sum of small efforts, repeated day in and day out."
 DEFAULT_AUTHOR = "Robert Collier"
 
 
-async def get_motivational_quote(db: Session) -> dict:
-    if not OPENROUTER_API_KEY:
-        raise HTTPException(
-            status_code=500,
-            detail="Missing OPENROUTER_API_KEY"
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive upstream failures, then lets one trial call through every `reset_seconds`."""
+
+    def __init__(self, failure_threshold: int, reset_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self._trial_running or self.clock() - self.opened_at < self.reset_seconds:
+            return "open"
+        return "half-open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "half-open":
+            self._trial_running = True
+        return state != "open"
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._trial_running or self.failures >= self.failure_threshold:
+            self.opened_at = self.clock()
+        self._trial_running = False
+
+    def cancel_trial(self):
+        self._trial_running = False
+
+
+_client: "httpx.AsyncClient | None" = None
+# calls beyond the limit fall back right away instead of queueing behind a slow upstream
+_upstream_slots = asyncio.Semaphore(QUOTE_MAX_CONCURRENCY)
+breaker = CircuitBreaker(QUOTE_BREAKER_FAILURES, QUOTE_BREAKER_RESET_SECONDS)
+_refill_tasks: set[asyncio.Task] = set()
+
+
+def _create_client() -> "httpx.AsyncClient":
+    # httpx (with its certifi, click and pygments imports) is loaded on the first quote, not at startup
+    import httpx
+
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(QUOTE_READ_TIMEOUT_SECONDS, connect=QUOTE_CONNECT_TIMEOUT_SECONDS),
+        limits=httpx.Limits(max_connections=QUOTE_MAX_CONCURRENCY, max_keepalive_connections=QUOTE_MAX_CONCURRENCY),
+        headers={"Authorization": f"Bearer {OPENROUTER_API_KEY}"},
+    )
+
+
+async def start_client():
+    global _client
+    if _client is None:
+        _client = _create_client()
+
+
+async def close_client():
+    global _client
+    for task in list(_refill_tasks):
+        task.cancel()
+    await asyncio.gather(*_refill_tasks, return_exceptions=True)
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _default_quote() -> dict:
+    return {"quote": DEFAULT_QUOTE, "author": DEFAULT_AUTHOR}
+
+
+def _build_prompt(habit_names: list[str]) -> str:
+    if not habit_names:
+        return """Give a one-sentence motivational quote said by a real person about starting new habits and being consistent. Also provide the author's name. Respond with ONLY a valid JSON object in the format: {"quote": "Quote here", "author": "Author name here"}"""
+
+    #!
+    habits = ", ".join(habit_names)
+    return f"""The user is tracking habits like: {habits}. Give a one-sentence motivational quote said by a real person quote that relates to these goals. Also provide the author's name. Respond with ONLY a valid JSON object in the format: {{"quote": "Quote here", "author": "Author name here"}}"""
+
+
+async def _request_quote(prompt: str) -> dict | None:
+    # the pooled client is opened by the first call and closed by the app lifespan
+    await start_client()
+    try:
+        response = await _client.post(
+            OPENROUTER_URL,
+            json={
+                "model": OPENROUTER_MODEL,
+                "messages": [{"role": "user", "content": prompt}],
+            }
         )
+        response.raise_for_status()
+    except Exception:
+        breaker.record_failure()
+        return None
+    breaker.record_success()
 
+    # a reply the model got wrong is not an upstream failure
     try:
-        all_habits = await asyncio.to_thread(crud.get_all_habits, db)
-        habit_names = [habit.name for habit in all_habits]
+        data = response.json()
+        json_string = data['choices'][0]['message']['content']
+        quote_data = json.loads(json_string)
+        return {"quote": str(quote_data["quote"]), "author": str(quote_data["author"])}
+    except (ValueError, KeyError, IndexError, TypeError):
+        return None
 
-    except SQLAlchemyError:
-        return {"quote": DEFAULT_QUOTE, "author": DEFAULT_AUTHOR}
 
+async def _fetch_quote(habit_names: list[str], wait_for_slot: bool = False) -> dict | None:
+    # None when the call was shed, the breaker is open or upstream gave no usable quote
+    if (_upstream_slots.locked() and not wait_for_slot) or not breaker.allow():
+        return None
+
+    async with _upstream_slots:
+        try:
+            return await _request_quote(_build_prompt(habit_names))
+        except asyncio.CancelledError:
+            # the caller went away mid call, a half-open breaker must not wait forever for the trial result
+            breaker.cancel_trial()
+            raise
 
-    if not habit_names:
-        prompt = """Give a one-sentence motivational quote said by a real person about starting new habits and being consistent. Also provide the author's name. Respond with ONLY a valid JSON object in the format: {"quote": "Quote here", "author": "Author name here"}"""
-    else:
-        #!
-        habits = ", ".join(habit_names)
-        prompt = f"""The user is tracking habits like: {habits}. Give a one-sentence motivational quote said by a real person quote that relates to these goals. Also provide the author's name. Respond with ONLY a valid JSON object in the format: {{"quote": "Quote here", "author": "Author name here"}}"""
 
+async def _refill(pool: QuotePool):
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                OPENROUTER_URL,
-                headers={
-                    "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": OPENROUTER_MODEL,
-                    "messages": [{"role": "user", "content": prompt}],
-                }
-            )
+        while len(pool.quotes) < QUOTE_POOL_SIZE:
+            quote = await _fetch_quote(pool.habit_names, wait_for_slot=True)
+            if quote is None:
+                # upstream is degraded, the next request that finds the pool low tries again
+                break
+            pool.quotes.append(quote)
+    finally:
+        pool.refilling = False
 
-            response.raise_for_status()
 
-            data = response.json()
-            json_string = data['choices'][0]['message']['content']
+def _schedule_refill(pool: QuotePool):
+    if pool.refilling or len(pool.quotes) >= QUOTE_POOL_LOW_WATERMARK:
+        return
+    pool.refilling = True
+    task = asyncio.create_task(_refill(pool))
+    _refill_tasks.add(task)
+    task.add_done_callback(_refill_tasks.discard)
 
-            quote_data = json.loads(json_string)
-            return quote_data
 
+async def _load_habit_names(db: DbSession) -> list[str]:
+    all_habits = await run_db(db, crud.get_all_habits)
+    return [habit.name for habit in all_habits]
 
-    except Exception:
-        return {"quote": DEFAULT_QUOTE, "author": DEFAULT_AUTHOR}
\ No newline at end of file
+
+async def get_motivational_quote(db: DbSession) -> dict:
+    if not OPENROUTER_API_KEY:
+        raise HTTPException(
+            status_code=500,
+            detail="Missing OPENROUTER_API_KEY"
+        )
+
+    if not QUOTE_CACHE_ENABLED:
+        try:
+            habit_names = await _load_habit_names(db)
+        except SQLAlchemyError:
+            return _default_quote()
+        return await _fetch_quote(habit_names) or _default_quote()
+
+    pool = quote_cache.current_pool()
+    if pool is None:
+        generation = quote_cache.generation()
+        try:
+            habit_names = await _load_habit_names(db)
+        except SQLAlchemyError:
+            return _default_quote()
+        pool = quote_cache.set_habit_names(habit_names, generation)
+
+    if pool.quotes:
+        quote = pool.quotes.popleft()
+    else:
+        quote = await _fetch_quote(pool.habit_names) or _default_quote()
+    _schedule_refill(pool)
+    return quote
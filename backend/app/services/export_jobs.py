@@ -0,0 +1,199 @@
+import asyncio
+import functools
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from backend.app.schemas import ExportJobStatus, ReportPeriod
+from backend.app.config import (
+    EXPORT_DIR,
+    EXPORT_MAX_WORKERS,
+    EXPORT_JOB_TIMEOUT_SECONDS,
+    EXPORT_RETENTION_SECONDS,
+)
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+# A job id is "<today_date>-<period>-<data version>", so identical requests made before the next write
+# share one rendered file, across workers too since the file on disk is the source of truth.
+JOB_ID_PATTERN = re.compile(r"^(\d{4}-\d{2}-\d{2})-(week|month|year)-(\d+)$")
+
+# failed job ids are remembered so polling clients see the failure, the oldest are dropped past this many
+MAX_FAILED_JOBS = 256
+
+_executor: "ProcessPoolExecutor | None" = None
+_running_jobs: dict[str, Future] = {}
+_failed_jobs: OrderedDict[str, None] = OrderedDict()
+_lock = threading.Lock()
+
+
+def _render_report(today_date: date, period: ReportPeriod, target_path: str):
+    # runs in a pool process with its own engine, nothing is inherited from the server process
+    from backend.app.database import SessionLocal
+    from backend.app.services.pdf_report import create_full_report
+
+    partial_path = f"{target_path}.part"
+    db = SessionLocal()
+    try:
+        with open(partial_path, "wb") as partial_file:
+            partial_file.write(create_full_report(db, today_date, period))
+        os.replace(partial_path, target_path)
+    finally:
+        db.close()
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+
+
+def _get_executor() -> "ProcessPoolExecutor":
+    # multiprocessing is loaded with the first export, the pool processes import ReportLab themselves
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    global _executor
+    if _executor is None:
+        EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+        _executor = ProcessPoolExecutor(
+            max_workers=EXPORT_MAX_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def shutdown():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def get_job_id(today_date: date, period: ReportPeriod, data_version: int) -> str:
+    return f"{today_date.isoformat()}-{period.value}-{data_version}"
+
+
+def get_report_path(job_id: str) -> Path:
+    return EXPORT_DIR / f"habit_insights_report_{job_id}.pdf"
+
+
+def get_report_filename(job_id: str) -> str:
+    today_date, period, _data_version = JOB_ID_PATTERN.match(job_id).groups()
+    if period == ReportPeriod.WEEK:
+        return f"habit_insights_report_{today_date}.pdf"
+    return f"habit_{period}_report_{today_date}.pdf"
+
+
+def _remove_expired_reports():
+    if not EXPORT_DIR.exists():
+        return
+    expires_before = time.time() - EXPORT_RETENTION_SECONDS
+    for report_path in EXPORT_DIR.glob("habit_insights_report_*"):
+        try:
+            if report_path.stat().st_mtime < expires_before:
+                report_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _is_rendering_elsewhere(report_path: Path) -> bool:
+    partial_path = Path(f"{report_path}.part")
+    try:
+        return time.time() - partial_path.stat().st_mtime < EXPORT_JOB_TIMEOUT_SECONDS
+    except FileNotFoundError:
+        return False
+
+
+def _has_failed(future: Future) -> bool:
+    # exception() raises on a cancelled future (e.g. dropped by shutdown)
+    return future.cancelled() or future.exception() is not None
+
+
+def get_job_status(job_id: str) -> ExportJobStatus | None:
+    if not JOB_ID_PATTERN.match(job_id):
+        return None
+
+    with _lock:
+        future = _running_jobs.get(job_id)
+        failed = job_id in _failed_jobs
+    if future is not None:
+        if not future.done():
+            return ExportJobStatus.PENDING
+        # finished, _forget_job may not have run yet
+        failed = _has_failed(future)
+
+    report_path = get_report_path(job_id)
+    if report_path.exists():
+        return ExportJobStatus.DONE
+    if failed:
+        return ExportJobStatus.FAILED
+    if _is_rendering_elsewhere(report_path):
+        return ExportJobStatus.PENDING
+    return None
+
+
+def submit_job(today_date: date, period: ReportPeriod, data_version: int) -> str:
+    job_id = get_job_id(today_date, period, data_version)
+    report_path = get_report_path(job_id)
+
+    with _lock:
+        future = _running_jobs.get(job_id)
+        if future is not None and not (future.done() and _has_failed(future)):
+            return job_id
+        if report_path.exists() or _is_rendering_elsewhere(report_path):
+            return job_id
+
+        _failed_jobs.pop(job_id, None)
+        _remove_expired_reports()
+        from concurrent.futures.process import BrokenProcessPool
+        try:
+            future = _get_executor().submit(_render_report, today_date, period, str(report_path))
+        except BrokenProcessPool:
+            # a pool process died (e.g. killed for memory), start over with a fresh pool
+            shutdown()
+            future = _get_executor().submit(_render_report, today_date, period, str(report_path))
+        _running_jobs[job_id] = future
+
+    # outside the lock: a future that is already done runs the callback right here, and _forget_job takes the lock
+    future.add_done_callback(functools.partial(_forget_job, job_id))
+    return job_id
+
+
+def _forget_job(job_id: str, future: Future):
+    # successful jobs are tracked by their file from now on, failures until resubmitted or pushed out by newer ones
+    with _lock:
+        if _running_jobs.get(job_id) is not future:
+            # a failed future whose job was already resubmitted
+            return
+        del _running_jobs[job_id]
+        if _has_failed(future):
+            _failed_jobs[job_id] = None
+            _failed_jobs.move_to_end(job_id)
+            while len(_failed_jobs) > MAX_FAILED_JOBS:
+                _failed_jobs.popitem(last=False)
+
+
+async def wait_for_job(job_id: str, poll_interval: float = 0.25) -> ExportJobStatus | None:
+    with _lock:
+        future = _running_jobs.get(job_id)
+    if future is not None:
+        try:
+            # shielded, a client going away must not cancel the job other requests share
+            await asyncio.shield(asyncio.wrap_future(future))
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise
+            return ExportJobStatus.FAILED
+        except Exception:
+            return ExportJobStatus.FAILED
+
+    deadline = time.monotonic() + EXPORT_JOB_TIMEOUT_SECONDS
+    while True:
+        status = get_job_status(job_id)
+        if status != ExportJobStatus.PENDING or time.monotonic() > deadline:
+            return status
+        await asyncio.sleep(poll_interval)
@@ -1,13 +1,15 @@
+import calendar
 import io
+from xml.sax.saxutils import escape
 from datetime import date, timedelta
 from sqlalchemy.orm import Session
 from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle, PageBreak
 from reportlab.lib.units import inch
-from reportlab.lib import colors
 
-from backend.app import crud, insights
+from backend.app import schemas
+from backend.app.services import report_styles
+from backend.app.services.report_data import HabitReport, ReportData, build_report_data, get_report_window
 
 
 def _get_formated_date(d: date) -> str:
@@ -21,42 +23,165 @@ def _get_formated_date(d: date) -> str:
     return f"{day}{suffix} {d.strftime('%B %Y')}"
 
 
-def _build_habit_table(db: Session, today_date: date) -> Table:
-    today = today_date
+def _get_report_title(period: schemas.ReportPeriod, end_date: date) -> str:
+    if period == schemas.ReportPeriod.MONTH:
+        return f"Monthly Habit Report - {end_date.strftime('%B %Y')}"
+    if period == schemas.ReportPeriod.YEAR:
+        return f"Yearly Habit Report - {end_date.year}"
+    return f"Habit Insights Report - {_get_formated_date(end_date)}"
+
+
+def _build_report_header(period: schemas.ReportPeriod, start_date: date, end_date: date, styles) -> list:
+    # shared by the error page, a failed report still names its period
+    return [
+        Paragraph(_get_report_title(period, end_date), styles['h1']),
+        Paragraph(f"<b>Period:</b> {_get_formated_date(start_date)} - {_get_formated_date(end_date)}"),
+    ]
+
+
+def _build_habit_table(report: ReportData) -> Table:
+    today = report.end_date
     dates = [today - timedelta(days=i) for i in range(7)]
     date_labels = ["Today", "Yesterday"] + [(today - timedelta(days=i)).strftime("%a") for i in range(2, 7)]
 
-    start_date = today - timedelta(days=6)
-    habits = crud.get_habit_table_data(db, start_date=start_date, end_date=today)
-    if not habits:
+    if not report.habits:
         return None
 
     table_data = [["Habit"] + date_labels]
 
-    for habit in habits:
+    for habit in report.habits:
         row = [habit.name] + [""] * 7
         table_data.append(row)
 
-    style = [
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#0077B6")),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor("#3f3f3f")),
-    ]
-
-    for row_idx, habit in enumerate(habits, start=1):
-        completed_dates = {entry.date for entry in habit.entries}
-        for col_idx, d in enumerate(dates, start=1):
-            bg = colors.HexColor("#C8E6C9") if d in completed_dates else colors.HexColor("#FFCDD2")
-            style.append(('BACKGROUND', (col_idx, row_idx), (col_idx, row_idx), bg))
+    style = []
+    for row_idx, habit in enumerate(report.habits, start=1):
+        cell_colors = [
+            report_styles.COMPLETED_COLOR if d in habit.daily_completion else report_styles.MISSED_COLOR
+            for d in dates
+        ]
+        style.extend(report_styles.background_runs(row_idx, cell_colors, first_col=1))
 
     table = Table(table_data, colWidths=[1.5 * inch] + [0.85 * inch] * 7)
+    table.setStyle(report_styles.HEADER_TABLE_STYLE)
+    table.setStyle(TableStyle(style))
+    return table
+
+
+def _build_summary_table(report: ReportData) -> Table:
+    table_data = [["Habit", "Current Streak", "Longest Streak", "Completed Days", "Completion Rate"]]
+    for habit in report.habits:
+        table_data.append([
+            habit.name,
+            f"{habit.current_streak} days",
+            f"{habit.longest_streak} days",
+            f"{habit.completed_days} / {habit.tracked_days}",
+            f"{habit.completion_rate}%",
+        ])
+
+    table = Table(table_data, colWidths=[2.3 * inch] + [1.2 * inch] * 4, repeatRows=1)
+    table.setStyle(report_styles.SUMMARY_TABLE_STYLE)
+    return table
+
+
+def _build_month_heatmap(habit: HabitReport, start_date: date, end_date: date) -> Table:
+    # calendar layout, one row per week starting on Monday
+    table_data = [["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]]
+    style = []
+
+    row = [""] * start_date.weekday()
+    cell_colors = [None] * start_date.weekday()
+    d = start_date
+    while d <= end_date:
+        row.append(str(d.day))
+        cell_colors.append(report_styles.get_heatmap_color(habit.daily_completion.get(d)))
+        if len(row) == 7 or d == end_date:
+            style.extend(report_styles.background_runs(len(table_data), cell_colors))
+            table_data.append(row + [""] * (7 - len(row)))
+            row, cell_colors = [], []
+        d += timedelta(days=1)
+
+    table = Table(table_data, colWidths=[0.7 * inch] * 7, rowHeights=0.45 * inch)
+    table.setStyle(report_styles.MONTH_HEATMAP_STYLE)
+    table.setStyle(TableStyle(style))
+    return table
+
+
+def _build_year_heatmap(habit: HabitReport, start_date: date, end_date: date) -> Table:
+    # one row per month, one column per day of the month
+    table_data = [[""] + [str(day) for day in range(1, 32)]]
+    style = []
+
+    for month in range(start_date.month, end_date.month + 1):
+        last_day = calendar.monthrange(start_date.year, month)[1]
+        if month == end_date.month:
+            last_day = end_date.day
+        cell_colors = [
+            report_styles.get_heatmap_color(habit.daily_completion.get(date(start_date.year, month, day)))
+            for day in range(1, last_day + 1)
+        ]
+        style.extend(report_styles.background_runs(len(table_data), cell_colors, first_col=1))
+        table_data.append([calendar.month_abbr[month]] + [""] * 31)
+
+    table = Table(table_data, colWidths=[0.45 * inch] + [0.22 * inch] * 31, rowHeights=0.22 * inch)
+    table.setStyle(report_styles.YEAR_HEATMAP_STYLE)
     table.setStyle(TableStyle(style))
     return table
 
 
-def create_full_report(db: Session, today_date: date) -> Table:
+def _build_habit_page(report: ReportData, habit: HabitReport, styles) -> list:
+    content = [
+        Paragraph(escape(habit.name), styles['h2']),
+        Paragraph(f"<b>Current Streak:</b> {habit.current_streak} days"),
+        Paragraph(f"<b>Longest Streak:</b> {habit.longest_streak} days"),
+        Paragraph(f"<b>Completed Days:</b> {habit.completed_days} of {habit.tracked_days}"),
+        Paragraph(f"<b>Completion Rate:</b> {habit.completion_rate}%"),
+        Paragraph(f"<b>Average Daily Completion:</b> {habit.average_completion}%"),
+        Paragraph("Heatmap", styles['h3']),
+    ]
+
+    if report.period == schemas.ReportPeriod.YEAR:
+        content.append(_build_year_heatmap(habit, report.start_date, report.end_date))
+    else:
+        content.append(_build_month_heatmap(habit, report.start_date, report.end_date))
+    return content
+
+
+def _build_report_content(report: ReportData, styles) -> list:
+    content = [
+        *_build_report_header(report.period, report.start_date, report.end_date, styles),
+        Paragraph("Overall Statistics", styles['h2']),
+        Paragraph(f"<b>Current Streak:</b> {report.current_overall_streak} days"),
+        Paragraph(f"<b>Longest Streak:</b> {report.longest_overall_streak} days"),
+    ]
+
+    if report.period == schemas.ReportPeriod.WEEK:
+        content.append(Paragraph("Past 7-Day Status", styles['h2']))
+        table = _build_habit_table(report)
+        if table is not None:
+            content.append(table)
+        else:
+            content.append(Paragraph("Error creating table"))
+        return content
+
+    period_days = (report.end_date - report.start_date).days + 1
+    content.append(Paragraph(f"<b>Active Days:</b> {report.completed_days} of {period_days}"))
+    if not report.habits:
+        content.append(Paragraph("No habits to report."))
+        return content
+
+    content.append(Paragraph("Habits", styles['h2']))
+    content.append(_build_summary_table(report))
+    for habit in report.habits:
+        content.append(PageBreak())
+        content.extend(_build_habit_page(report, habit, styles))
+    return content
+
+
+def create_full_report(
+        db: Session,
+        today_date: date,
+        period: schemas.ReportPeriod = schemas.ReportPeriod.WEEK
+) -> bytes:
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(
         buffer,
@@ -67,27 +192,19 @@ def create_full_report(db: Session, today_date: date) -> Table:
         bottomMargin=0.5 * inch
     )
 
-    styles = getSampleStyleSheet()
-    content = []
+    styles = report_styles.get_stylesheet()
 
     try:
-        content.append(Paragraph(f"Habit Insights Report - {_get_formated_date(today_date)}", styles['h1']))
-
-        sidebar_data = insights.get_sidebar_week_insights(db, today_date)
-        content.append(Paragraph("Overall Statistics", styles['h2']))
-        content.append(Paragraph(f"<b>Current Streak:</b> {sidebar_data.current_overall_streak} days"))
-        content.append(Paragraph(f"<b>Longest Streak:</b> {sidebar_data.longest_overall_streak} days"))
-
-        content.append(Paragraph("Past 7-Day Status", styles['h2']))
-        table = _build_habit_table(db, today_date)
-        if table is not None:
-            content.append(table)
-        else:
-            content.append(Paragraph("Error creating table"))
+        report = build_report_data(db, today_date, period)
+        content = _build_report_content(report, styles)
 
     except Exception as e:
-        content.append(Paragraph(f"Error generating pdf report: {str(e)}"))
+        start_date, end_date = get_report_window(period, today_date)
+        content = [
+            *_build_report_header(period, start_date, end_date, styles),
+            Paragraph(f"Error generating pdf report: {escape(str(e))}"),
+        ]
 
     doc.build(content)
     buffer.seek(0)
-    return buffer.getvalue()
\ No newline at end of file
+    return buffer.getvalue()
@@ -0,0 +1,78 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict, deque
+
+from backend.app.config import QUOTE_CACHE_MAX_KEYS, QUOTE_CACHE_KEY_TTL_SECONDS
+
+# The quote prompt only depends on the set of habit names, so pre-generated quotes are pooled per name set.
+# The name set currently in the database is remembered until a habit write in this worker forgets it, or
+# QUOTE_CACHE_KEY_TTL_SECONDS pass (a bound on how long other workers' renames go unseen).
+
+
+class QuotePool:
+    def __init__(self, habit_names: list[str]):
+        self.habit_names = habit_names
+        self.quotes = deque()
+        self.refilling = False
+
+
+def get_habit_names_key(habit_names: list[str]) -> str:
+    return hashlib.sha256("\n".join(habit_names).encode()).hexdigest()
+
+
+class QuoteCache:
+    def __init__(self, max_keys: int, key_ttl_seconds: float):
+        self.max_keys = max_keys
+        self.key_ttl_seconds = key_ttl_seconds
+        self._pools: OrderedDict[str, QuotePool] = OrderedDict()
+        self._current_key = None
+        self._current_key_expires_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def current_pool(self) -> QuotePool | None:
+        # None when the habit names have to be read again
+        with self._lock:
+            if self._current_key is None or time.monotonic() >= self._current_key_expires_at:
+                return None
+            return self._pools.get(self._current_key)
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def set_habit_names(self, habit_names: list[str], generation: int) -> QuotePool:
+        # generation is read before the names were loaded, a habit write in between leaves the key unset
+        habit_names = sorted(habit_names)
+        key = get_habit_names_key(habit_names)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = QuotePool(habit_names)
+                while len(self._pools) > self.max_keys:
+                    self._pools.popitem(last=False)
+            self._pools.move_to_end(key)
+            if generation == self._generation:
+                self._current_key = key
+                self._current_key_expires_at = time.monotonic() + self.key_ttl_seconds
+            return pool
+
+    def invalidate_habit_names(self):
+        # pools stay, a name set that comes back (e.g. a rename undone) finds its quotes again
+        with self._lock:
+            self._current_key = None
+            self._generation += 1
+
+    def clear(self):
+        with self._lock:
+            self._pools.clear()
+            self._current_key = None
+            self._generation += 1
+
+
+quote_cache = QuoteCache(QUOTE_CACHE_MAX_KEYS, QUOTE_CACHE_KEY_TTL_SECONDS)
+
+
+def invalidate_habit_names():
+    quote_cache.invalidate_habit_names()
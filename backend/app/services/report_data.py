@@ -0,0 +1,113 @@
+from datetime import date, timedelta
+from typing import List, NamedTuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.app import models, schemas, streaks
+from backend.app.insights import _get_entry_completion_percentage
+
+
+class HabitReport(NamedTuple):
+    name: str
+    color: str
+    current_streak: int
+    longest_streak: int
+    completed_days: int
+    tracked_days: int  # days of the report window the habit existed
+    completion_rate: float
+    average_completion: float
+    daily_completion: dict[date, float]  # only days with an entry
+
+
+class ReportData(NamedTuple):
+    period: schemas.ReportPeriod
+    start_date: date
+    end_date: date
+    current_overall_streak: int
+    longest_overall_streak: int
+    completed_days: int  # days of the window with at least one completed habit
+    habits: List[HabitReport]
+
+
+def get_report_window(period: schemas.ReportPeriod, today_date: date) -> tuple[date, date]:
+    if period == schemas.ReportPeriod.MONTH:
+        return today_date.replace(day=1), today_date
+    if period == schemas.ReportPeriod.YEAR:
+        return today_date.replace(month=1, day=1), today_date
+    return today_date - timedelta(days=6), today_date
+
+
+def build_report_data(db: Session, today_date: date, period: schemas.ReportPeriod) -> ReportData:
+    # a fixed number of queries whatever the habit count: habits, entries in the window, streak summaries
+    start_date, end_date = get_report_window(period, today_date)
+
+    habits = db.execute(
+        select(
+            models.Habit.id,
+            models.Habit.name,
+            models.Habit.color,
+            models.Habit.type,
+            models.Habit.target,
+            models.Habit.created_date
+        ).order_by(models.Habit.id)
+    ).all()
+
+    entry_rows = db.execute(
+        select(
+            models.HabitEntry.habit_id,
+            models.HabitEntry.date,
+            models.HabitEntry.value,
+            models.HabitEntry.is_completed
+        ).filter(
+            models.HabitEntry.date >= start_date,
+            models.HabitEntry.date <= end_date
+        )
+    )
+
+    habit_by_id = {habit.id: habit for habit in habits}
+    daily_completion = {habit.id: {} for habit in habits}
+    completed_days = {habit.id: 0 for habit in habits}
+    overall_completed_dates = set()
+
+    for habit_id, entry_date, value, is_completed in entry_rows:
+        habit = habit_by_id[habit_id]
+        daily_completion[habit_id][entry_date] = _get_entry_completion_percentage(habit.type, habit.target, value)
+        if is_completed:
+            completed_days[habit_id] += 1
+            overall_completed_dates.add(entry_date)
+
+    all_streaks = streaks.get_all_streaks(db, list(habit_by_id), today_date)
+
+    habit_reports = []
+    for habit in habits:
+        habit_completion = daily_completion[habit.id]
+        # entries can be backfilled before the creation date, those days count as tracked too
+        tracked_from = max(start_date, habit.created_date) if habit.created_date else start_date
+        if habit_completion:
+            tracked_from = min(tracked_from, min(habit_completion))
+        tracked_days = max((end_date - tracked_from).days + 1, 0)
+        current_streak, longest_streak = all_streaks[habit.id]
+
+        habit_reports.append(HabitReport(
+            name=habit.name,
+            color=habit.color,
+            current_streak=current_streak,
+            longest_streak=longest_streak,
+            completed_days=completed_days[habit.id],
+            tracked_days=tracked_days,
+            completion_rate=round(completed_days[habit.id] / tracked_days * 100, 1) if tracked_days else 0.0,
+            average_completion=round(sum(habit_completion.values()) / tracked_days, 1) if tracked_days else 0.0,
+            daily_completion=habit_completion,
+        ))
+
+    current_overall_streak, longest_overall_streak = all_streaks[None]
+
+    return ReportData(
+        period=period,
+        start_date=start_date,
+        end_date=end_date,
+        current_overall_streak=current_overall_streak,
+        longest_overall_streak=longest_overall_streak,
+        completed_days=len(overall_completed_dates),
+        habits=habit_reports,
+    )
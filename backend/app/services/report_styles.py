@@ -0,0 +1,82 @@
+from functools import lru_cache
+from reportlab.lib.styles import getSampleStyleSheet, StyleSheet1
+from reportlab.platypus import TableStyle
+from reportlab.lib import colors
+
+# colour objects are built once, HexColor parsing showed up per cell when reports were built cell by cell
+HEADER_COLOR = colors.HexColor("#0077B6")
+GRID_COLOR = colors.HexColor("#3f3f3f")
+COMPLETED_COLOR = colors.HexColor("#C8E6C9")
+MISSED_COLOR = colors.HexColor("#FFCDD2")
+NO_ENTRY_COLOR = colors.HexColor("#EEEEEE")
+
+# completion percentage lower bounds, the first matching bucket gives the heatmap colour
+HEATMAP_BUCKETS = [
+    (100, colors.HexColor("#2E7D32")),
+    (75, colors.HexColor("#66BB6A")),
+    (50, colors.HexColor("#A5D6A7")),
+    (25, colors.HexColor("#C8E6C9")),
+    (0, colors.HexColor("#E8F5E9")),
+]
+
+HEADER_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), HEADER_COLOR),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('GRID', (0, 0), (-1, -1), 1, GRID_COLOR),
+])
+
+SUMMARY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), HEADER_COLOR),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('GRID', (0, 0), (-1, -1), 1, GRID_COLOR),
+])
+
+MONTH_HEATMAP_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), HEADER_COLOR),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.white),
+])
+
+YEAR_HEATMAP_STYLE = TableStyle([
+    ('FONTSIZE', (0, 0), (-1, -1), 6),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('GRID', (1, 1), (-1, -1), 0.5, colors.white),
+])
+
+
+@lru_cache(maxsize=1)
+def get_stylesheet() -> StyleSheet1:
+    # shared between reports, callers must not modify the returned styles
+    return getSampleStyleSheet()
+
+
+def get_heatmap_color(completion: float | None) -> colors.Color:
+    if completion is None:
+        return NO_ENTRY_COLOR
+    for lower_bound, color in HEATMAP_BUCKETS:
+        if completion >= lower_bound:
+            return color
+    return NO_ENTRY_COLOR
+
+
+def background_runs(row_idx: int, cell_colors: list, first_col: int = 0) -> list:
+    # one BACKGROUND command per run of equal colours in a row instead of one per cell, None leaves a cell as is
+    commands = []
+    run_start, run_color = first_col, None
+    for col_idx, color in enumerate(cell_colors, start=first_col):
+        if color == run_color:
+            continue
+        if run_color is not None:
+            commands.append(('BACKGROUND', (run_start, row_idx), (col_idx - 1, row_idx), run_color))
+        run_start, run_color = col_idx, color
+
+    if run_color is not None:
+        commands.append(('BACKGROUND', (run_start, row_idx), (first_col + len(cell_colors) - 1, row_idx), run_color))
+    return commands
@@ -0,0 +1,64 @@
+import asyncio
+from typing import Callable, TypeVar
+
+from backend.app import metrics
+from backend.app.cache import insight_cache, request_data_version
+from backend.app.config import SINGLE_FLIGHT_ENABLED
+from backend.app.db_session import DbSession, run_db
+
+T = TypeVar("T")
+
+_in_flight: dict[tuple, asyncio.Future] = {}
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _mark_retrieved(future: asyncio.Future):
+    # an exception no follower waited for must not be logged as never retrieved
+    if not future.cancelled():
+        future.exception()
+
+
+async def run_db_coalesced(db: DbSession, fn: Callable[..., T], **kwargs) -> T:
+    # identical concurrent reads share one run_db call. The key holds the insight cache generation, which
+    # every committed write in this worker bumps, and the request's data version, which writes in other
+    # workers bump, so a caller arriving after a write never joins a flight started before it
+    if not SINGLE_FLIGHT_ENABLED:
+        return await run_db(db, fn, **kwargs)
+
+    function_name = f"{fn.__module__}.{fn.__qualname__}"
+    key = (function_name, insight_cache.generation(), request_data_version.get(), tuple(sorted((name, _freeze(value)) for name, value in kwargs.items())))
+
+    in_flight = _in_flight.get(key)
+    if in_flight is not None:
+        metrics.record_single_flight(function_name, coalesced=True)
+        try:
+            return await asyncio.shield(in_flight)
+        except asyncio.CancelledError:
+            if not in_flight.cancelled():
+                raise
+        # the leading request went away before finishing, this caller computes it on its own
+        return await run_db(db, fn, **kwargs)
+
+    future = asyncio.get_running_loop().create_future()
+    future.add_done_callback(_mark_retrieved)
+    _in_flight[key] = future
+    metrics.record_single_flight(function_name, coalesced=False)
+    try:
+        result = await run_db(db, fn, **kwargs)
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    except BaseException:
+        # cancelled, followers notice the cancelled future and run the call themselves
+        future.cancel()
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        del _in_flight[key]
@@ -0,0 +1,144 @@
+import os
+import random
+import shutil
+import statistics
+import time
+from datetime import date, timedelta
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from backend.app import crud, schemas
+from backend.bench.seed import create_bench_database, _enable_foreign_keys
+
+HABITS = 50
+DAYS = 365
+END_DATE = date(2025, 12, 31)
+SINGLE_WRITES = 300
+BATCHES = 20
+BATCH_SIZE = 200
+RAW_UPSERTS = 20000
+ROUNDS = 3
+
+# habit_entries indexes before the covering/partial index migration
+PREVIOUS_INDEXES = [
+    "CREATE INDEX idx_date ON habit_entries (date)",
+    "CREATE INDEX idx_isCompleted ON habit_entries (is_completed)",
+    "CREATE INDEX idx_habitId_completed ON habit_entries (habit_id, is_completed)",
+    "CREATE INDEX idx_habitId_completed_dayOrdinal ON habit_entries (habit_id, is_completed, day_ordinal)",
+    "CREATE INDEX idx_completed_dayOrdinal ON habit_entries (is_completed, day_ordinal)",
+    "CREATE INDEX idx_habitId_weekKey_completed ON habit_entries (habit_id, week_key, is_completed, day_ordinal)",
+    "CREATE INDEX idx_habitId_monthKey_completed ON habit_entries (habit_id, month_key, is_completed, day_ordinal)",
+]
+
+# the covering twin of uq_habitEntry_habitId_date the covering/partial migration added and a later one dropped
+HABIT_DATE_COVERING_INDEX = "CREATE INDEX idx_habitId_date_completed_value ON habit_entries (habit_id, date, is_completed, value)"
+
+
+def _use_previous_indexes(engine):
+    with engine.begin() as connection:
+        index_names = connection.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'habit_entries' "
+            "AND sql IS NOT NULL AND name != 'uq_habitEntry_habitId_date'"
+        )).scalars().all()
+        for index_name in index_names:
+            connection.execute(text(f'DROP INDEX "{index_name}"'))
+        for statement in PREVIOUS_INDEXES:
+            connection.execute(text(statement))
+
+
+def _add_habit_date_covering_index(engine):
+    with engine.begin() as connection:
+        connection.execute(text(HABIT_DATE_COVERING_INDEX))
+
+
+def _index_count(engine) -> int:
+    with engine.connect() as connection:
+        return connection.execute(text(
+            "SELECT count(*) FROM sqlite_master WHERE type = 'index' AND tbl_name = 'habit_entries'"
+        )).scalar()
+
+
+# variant -> how its indexes are made from the current schema
+VARIANTS = {
+    "previous": _use_previous_indexes,
+    "covering": _add_habit_date_covering_index,
+    "current": lambda _engine: None,
+}
+
+
+def _random_entry(rng: random.Random) -> schemas.CreateHabitEntry:
+    # simple and measurable habits both accept 0 (delete) and any value >= 1
+    return schemas.CreateHabitEntry(
+        habit_id=rng.randrange(1, HABITS + 1),
+        date=END_DATE - timedelta(days=rng.randrange(DAYS)),
+        value=rng.choice([0, 1, 1])
+    )
+
+
+def _measure_raw_upserts(session_factory, rng: random.Random) -> float:
+    # the entry upsert alone, no streak or rollup upkeep, so index maintenance dominates
+    rows = [
+        {"habit_id": entry.habit_id, "date": entry.date, "value": entry.value + 1, "is_completed": rng.random() < 0.5}
+        for entry in (_random_entry(rng) for _ in range(RAW_UPSERTS))
+    ]
+    with session_factory() as db:
+        started = time.perf_counter()
+        db.execute(crud._upsert_entries_statement(), rows)
+        db.commit()
+        return RAW_UPSERTS / (time.perf_counter() - started)
+
+
+def _measure(session_factory, seed: int) -> tuple[float, float, float]:
+    rng = random.Random(seed)
+    raw_rate = _measure_raw_upserts(session_factory, rng)
+    with session_factory() as db:
+        started = time.perf_counter()
+        for _ in range(SINGLE_WRITES):
+            crud.create_or_update_entry(db, _random_entry(rng))
+        single_rate = SINGLE_WRITES / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        for _ in range(BATCHES):
+            crud.create_or_update_entries(db, [_random_entry(rng) for _ in range(BATCH_SIZE)])
+        batch_rate = BATCHES * BATCH_SIZE / (time.perf_counter() - started)
+    return raw_rate, single_rate, batch_rate
+
+
+def _run(variant: str, seeded_path: str):
+    raw_rates, single_rates, batch_rates = [], [], []
+    for round_idx in range(ROUNDS):
+        path = f"{seeded_path}.{variant}.db"
+        shutil.copyfile(seeded_path, path)
+        engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+        event.listen(engine, "connect", _enable_foreign_keys)
+        try:
+            VARIANTS[variant](engine)
+            index_count = _index_count(engine)
+            raw_rate, single_rate, batch_rate = _measure(sessionmaker(autocommit=False, autoflush=False, bind=engine), seed=round_idx)
+            raw_rates.append(raw_rate)
+            single_rates.append(single_rate)
+            batch_rates.append(batch_rate)
+            size_kib = os.path.getsize(path) / 1024
+        finally:
+            engine.dispose()
+            os.remove(path)
+
+    print(
+        f"writes {variant:>8} ({index_count} indexes): upserts {statistics.median(raw_rates):8.0f} rows/s  single {statistics.median(single_rates):6.1f}/s  "
+        f"batch {statistics.median(batch_rates):8.1f} entries/s  db {size_kib:8.0f} KiB"
+    )
+
+
+def main():
+    _session_factory, engine, path = create_bench_database(habit_count=HABITS, days=DAYS, end_date=END_DATE)
+    engine.dispose()
+    print(f"{HABITS} habits x {DAYS} days seeded in {path}")
+    try:
+        for variant in VARIANTS:
+            _run(variant, path)
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
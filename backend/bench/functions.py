@@ -0,0 +1,153 @@
+import inspect
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from typing import Callable
+
+from backend.app import crud, insights, models, schemas
+from backend.app.services import pdf_report
+from backend.bench.seed import create_bench_database
+
+HABITS = 50
+YEARS = 2
+END_DATE = date(2025, 12, 31)
+START_DATE = END_DATE - timedelta(days=YEARS * 365 - 1)
+ROUNDS = 10
+MODULES = [insights, crud, pdf_report]
+
+
+def _uncached(fn):
+    return getattr(fn, "__wrapped__", fn)
+
+
+def _random_habit_id(rng: random.Random) -> int:
+    return rng.randrange(1, HABITS + 1)
+
+
+def _random_day(rng: random.Random) -> date:
+    return START_DATE + timedelta(days=rng.randrange(YEARS * 365))
+
+
+def _new_habit(rng: random.Random) -> schemas.CreateHabit:
+    return schemas.CreateHabit(name=f"Bench habit {rng.randrange(10 ** 6)}", type=models.HabitType.simple, color="#3f3f3f")
+
+
+def _prepare_delete_habit(db, rng):
+    habit = crud.create_habit(db, _new_habit(rng))
+    return lambda: crud.delete_habit(db, habit)
+
+
+def _prepare_update_habit(db, rng):
+    habit = crud.get_habit(db, _random_habit_id(rng))
+    update = schemas.CreateHabit(name=habit.name, type=habit.type, color=habit.color, target=habit.target, unit=habit.unit)
+    return lambda: crud.update_habit(db, habit, update)
+
+
+# (module, function name, variant, rounds, prepare) - prepare runs untimed and returns the timed call
+CASES = [
+    (insights, "get_sidebar_week_insights", "", ROUNDS, lambda db, rng: lambda: _uncached(insights.get_sidebar_week_insights)(db, _random_day(rng))),
+    (insights, "get_sidebar_calendar_insights", "", ROUNDS, lambda db, rng: lambda: _uncached(insights.get_sidebar_calendar_insights)(
+        db, END_DATE - timedelta(days=41), END_DATE
+    )),
+    (insights, "get_habit_streaks_and_total_completions", "", ROUNDS, lambda db, rng: lambda: _uncached(insights.get_habit_streaks_and_total_completions)(
+        db, _random_habit_id(rng), END_DATE
+    )),
+    *[
+        (insights, "get_habit_chart_data", view, ROUNDS, lambda db, rng, view=view: lambda: _uncached(insights.get_habit_chart_data)(
+            db, _random_habit_id(rng), view, END_DATE - timedelta(days=364), END_DATE
+        ))
+        for view in ["weekly", "monthly"]
+    ],
+    (insights, "get_habit_heatmap_data", "", ROUNDS, lambda db, rng: lambda: _uncached(insights.get_habit_heatmap_data)(
+        db, _random_habit_id(rng), END_DATE - timedelta(days=364), END_DATE
+    )),
+    (insights, "get_dashboard_data", "", ROUNDS, lambda db, rng: lambda: _uncached(insights.get_dashboard_data)(
+        db, list(schemas.DashboardSection), END_DATE, END_DATE - timedelta(days=41), END_DATE, END_DATE - timedelta(days=6), END_DATE
+    )),
+    (insights, "get_habit_details", "", ROUNDS, lambda db, rng: lambda: _uncached(insights.get_habit_details)(
+        db, _random_habit_id(rng), END_DATE, "weekly", END_DATE - timedelta(days=90), END_DATE, END_DATE - timedelta(days=364), END_DATE
+    )),
+    (crud, "get_data_version", "", ROUNDS, lambda db, rng: lambda: crud.get_data_version(db)),
+    (crud, "get_habit", "", ROUNDS, lambda db, rng: lambda: crud.get_habit(db, _random_habit_id(rng))),
+    (crud, "get_all_habits", "", ROUNDS, lambda db, rng: lambda: crud.get_all_habits(db)),
+    (crud, "get_habit_table_data", "", ROUNDS, lambda db, rng: lambda: crud.get_habit_table_data(db, END_DATE - timedelta(days=6), END_DATE)),
+    (crud, "create_habit", "", ROUNDS, lambda db, rng: lambda: crud.create_habit(db, _new_habit(rng))),
+    (crud, "update_habit", "", ROUNDS, _prepare_update_habit),
+    (crud, "delete_habit", "", ROUNDS, _prepare_delete_habit),
+    (crud, "create_or_update_entry", "", ROUNDS, lambda db, rng: lambda: crud.create_or_update_entry(
+        db, schemas.CreateHabitEntry(habit_id=_random_habit_id(rng), date=_random_day(rng), value=rng.choice([0, 1]))
+    )),
+    (crud, "create_or_update_entries", "", ROUNDS, lambda db, rng: lambda: crud.create_or_update_entries(db, [
+        schemas.CreateHabitEntry(habit_id=_random_habit_id(rng), date=_random_day(rng), value=rng.choice([0, 1]))
+        for _ in range(100)
+    ])),
+    *[
+        (pdf_report, "create_full_report", period.value, 3, lambda db, rng, period=period: lambda: pdf_report.create_full_report(db, END_DATE, period))
+        for period in schemas.ReportPeriod
+    ],
+]
+
+
+def _public_functions(module) -> set[str]:
+    return {
+        name for name, obj in vars(module).items()
+        if inspect.isfunction(obj) and obj.__module__ == module.__name__ and not name.startswith("_")
+    }
+
+
+def _missing_cases() -> list[str]:
+    covered = {(module.__name__, fn_name) for module, fn_name, _variant, _rounds, _prepare in CASES}
+    return sorted(
+        f"{module.__name__}.{name}"
+        for module in MODULES
+        for name in _public_functions(module)
+        if (module.__name__, name) not in covered
+    )
+
+
+def _measure(session_factory, prepare: Callable, rounds: int, rng: random.Random) -> list[float]:
+    timings = []
+    for _ in range(rounds):
+        db = session_factory()
+        try:
+            call = prepare(db, rng)
+            started = time.perf_counter()
+            call()
+            timings.append((time.perf_counter() - started) * 1000)
+        finally:
+            db.close()
+    return timings
+
+
+def main() -> int:
+    missing = _missing_cases()
+    if missing:
+        print(f"no benchmark case for: {', '.join(missing)}")
+        return 1
+
+    name_filters = sys.argv[1:]
+    session_factory, engine, path = create_bench_database(habit_count=HABITS, days=YEARS * 365, end_date=END_DATE)
+    print(f"{HABITS} habits x {YEARS} years seeded in {path}")
+    rng = random.Random(7)
+
+    try:
+        for module, fn_name, variant, rounds, prepare in CASES:
+            label = f"{module.__name__.rsplit('.', 1)[-1]}.{fn_name} {variant}".rstrip()
+            if name_filters and not any(name_filter in label for name_filter in name_filters):
+                continue
+            timings = _measure(session_factory, prepare, rounds, rng)
+            print(
+                f"{label:<50} median {statistics.median(timings):8.2f} ms  "
+                f"min {min(timings):8.2f} ms  max {max(timings):8.2f} ms"
+            )
+    finally:
+        engine.dispose()
+        os.remove(path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
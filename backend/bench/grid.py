@@ -0,0 +1,76 @@
+import os
+import statistics
+import time
+from datetime import date, timedelta
+from sqlalchemy import select
+
+from backend.app import crud, models, schemas
+from backend.bench.seed import create_bench_database
+
+HABITS = 50
+DAYS = 365
+END_DATE = date(2025, 12, 31)
+ROUNDS = 20
+
+
+def _orm_habit_table_data(db, start_date: date, end_date: date):
+    # the previous implementation: full ORM entries assigned onto Habit.entries
+    habits = crud.get_all_habits(db)
+    entries = db.scalars(
+        select(models.HabitEntry).filter(
+            models.HabitEntry.date >= start_date,
+            models.HabitEntry.date <= end_date
+        )
+    ).all()
+
+    habit_entries_map = {}
+    for entry in entries:
+        habit_entries_map.setdefault(entry.habit_id, []).append(entry)
+    for habit in habits:
+        habit.entries = habit_entries_map.get(habit.id, [])
+    return habits
+
+
+def _serialize(habits):
+    # what the response_model does for every request
+    return [schemas.HabitTable.model_validate(habit).model_dump(mode="json") for habit in habits]
+
+
+def _measure(session_factory, fn, start_date: date, end_date: date) -> list[float]:
+    timings = []
+    for _ in range(ROUNDS):
+        db = session_factory()
+        try:
+            started = time.perf_counter()
+            _serialize(fn(db, start_date, end_date))
+            timings.append((time.perf_counter() - started) * 1000)
+        finally:
+            db.close()
+    return timings
+
+
+def _run(session_factory):
+    windows = {"7 days": 6, f"{DAYS} days": DAYS - 1}
+    for label, span in windows.items():
+        start_date = END_DATE - timedelta(days=span)
+        for name, fn in [("orm", _orm_habit_table_data), ("columns", crud.get_habit_table_data)]:
+            timings = _measure(session_factory, fn, start_date, END_DATE)
+            print(
+                f"grid {label:>9} {name:>8}: "
+                f"median {statistics.median(timings):7.2f} ms  min {min(timings):7.2f} ms"
+            )
+
+
+def main():
+    session_factory, engine, path = create_bench_database(habit_count=HABITS, days=DAYS, end_date=END_DATE)
+    print(f"{HABITS} habits x {DAYS} days seeded in {path}")
+
+    try:
+        _run(session_factory)
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
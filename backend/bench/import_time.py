@@ -0,0 +1,80 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+APP_MODULE = "backend.app.main"
+RUNS = 7
+# median cumulative import time of backend.app.main, roughly 1.7x the median measured when the budget was set
+BUDGET_MS = 1500
+# loaded on first use of the quote, export and insights engine code paths, never by the API process at startup
+LAZY_MODULES = ["httpx", "reportlab", "numpy", "multiprocessing"]
+TOP = 12
+
+
+def _import_times() -> list[tuple[int, int, int, str]]:
+    # one fresh interpreter per run, -X importtime writes "import time: self | cumulative | name" to stderr
+    env = {**os.environ, "PYTHONPATH": str(REPO_ROOT)}
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {APP_MODULE}"],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return rows
+
+
+def _app_import_ms(rows) -> float:
+    return next(cumulative_us for _self_us, cumulative_us, _depth, name in rows if name == APP_MODULE) / 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Import time of the Habityu API process (python -X importtime)")
+    parser.add_argument("--runs", type=int, default=RUNS)
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    args = parser.parse_args()
+
+    # the first run compiles bytecode, a deployed image ships it precompiled
+    _import_times()
+    runs = [_import_times() for _ in range(args.runs)]
+    totals = [_app_import_ms(rows) for rows in runs]
+    median_ms = statistics.median(totals)
+    rows = runs[totals.index(sorted(totals)[len(totals) // 2])]
+
+    package_ms = defaultdict(float)
+    for self_us, _cumulative_us, _depth, name in rows:
+        package_ms[name.split(".")[0]] += self_us / 1000
+    print(f"{'package':<24} {'self ms':>8}")
+    for package, ms in sorted(package_ms.items(), key=lambda item: -item[1])[:TOP]:
+        print(f"{package:<24} {ms:>8.1f}")
+
+    print(f"\n{'app module':<40} {'cumulative ms':>13}")
+    app_modules = [row for row in rows if row[3].startswith("backend.")]
+    for _self_us, cumulative_us, _depth, name in sorted(app_modules, key=lambda row: -row[1])[:TOP]:
+        print(f"{name:<40} {cumulative_us / 1000:>13.1f}")
+
+    failed = 0
+    imported = {name for _self_us, _cumulative_us, _depth, name in rows}
+    eager = [module for module in LAZY_MODULES if module in imported]
+    if eager:
+        print(f"\nimported at startup, expected on first use: {', '.join(eager)}")
+        failed += 1
+
+    print(f"\n{APP_MODULE}: median {median_ms:.0f} ms over {args.runs} runs (min {min(totals):.0f}, max {max(totals):.0f}), budget {args.budget_ms:.0f} ms")
+    if median_ms > args.budget_ms:
+        print("import time over budget")
+        failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
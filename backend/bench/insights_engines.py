@@ -0,0 +1,70 @@
+import os
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+from backend.app import insights
+from backend.bench.seed import create_bench_database
+
+try:
+    from backend.app import insights_numpy
+except ImportError:
+    sys.exit("NumPy is not installed, only the sql engine is available")
+
+HABITS = 100
+DAYS = 10 * 365
+END_DATE = date(2025, 12, 31)
+ROUNDS = 3
+
+
+def _calls():
+    history_start = END_DATE - timedelta(days=DAYS - 1)
+    year_start = END_DATE - timedelta(days=364)
+    return {
+        "stats": ("get_habit_streaks_and_total_completions", {"today_date": END_DATE}),
+        "chart weekly 10y": ("get_habit_chart_data", {"view": "weekly", "start_date": history_start, "end_date": END_DATE}),
+        "chart monthly 10y": ("get_habit_chart_data", {"view": "monthly", "start_date": history_start, "end_date": END_DATE}),
+        "heatmap 1y": ("get_habit_heatmap_data", {"start_date": year_start, "end_date": END_DATE}),
+        "details": ("get_habit_details", {
+            "today_date": END_DATE,
+            "chart_view": "weekly",
+            "chart_start_date": year_start,
+            "chart_end_date": END_DATE,
+            "heatmap_start_date": year_start,
+            "heatmap_end_date": END_DATE,
+        }),
+    }
+
+
+def _measure(session_factory, fn, kwargs) -> list[float]:
+    # one timing covers every habit, __wrapped__ skips the response cache
+    timings = []
+    for _ in range(ROUNDS):
+        with session_factory() as db:
+            started = time.perf_counter()
+            for habit_id in range(1, HABITS + 1):
+                fn.__wrapped__(db, habit_id=habit_id, **kwargs)
+            timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main():
+    session_factory, engine, path = create_bench_database(habit_count=HABITS, days=DAYS, end_date=END_DATE)
+    print(f"{HABITS} habits x {DAYS} days seeded in {path}")
+
+    try:
+        for label, (fn_name, kwargs) in _calls().items():
+            for name, module in [("sql", insights), ("numpy", insights_numpy)]:
+                timings = _measure(session_factory, getattr(module, fn_name), kwargs)
+                print(
+                    f"{label:>17} {name:>6}: "
+                    f"median {statistics.median(timings):8.1f} ms  min {min(timings):8.1f} ms  ({HABITS} habits)"
+                )
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+from backend.app import insights
+from backend.bench.seed import create_bench_database
+
+try:
+    from backend.app import insights_numpy
+except ImportError:
+    sys.exit("NumPy is not installed, nothing to compare")
+
+HABITS = 30
+DAYS = 3 * 365
+END_DATE = date(2025, 12, 31)
+CASES_PER_HABIT = 20
+
+
+def _random_window(rng: random.Random) -> tuple[date, date]:
+    start_date = END_DATE - timedelta(days=rng.randrange(DAYS + 60))
+    return start_date, start_date + timedelta(days=rng.randrange(1, 400))
+
+
+def _cases(rng: random.Random, habit_id: int):
+    # __wrapped__ skips the response cache, both engines compute every case
+    for _ in range(CASES_PER_HABIT):
+        today_date = END_DATE - timedelta(days=rng.randrange(-3, DAYS))
+        chart_view = rng.choice(["weekly", "monthly"])
+        (chart_start, chart_end), (heatmap_start, heatmap_end) = _random_window(rng), _random_window(rng)
+
+        yield "stats", "get_habit_streaks_and_total_completions", {"habit_id": habit_id, "today_date": today_date}
+        yield "chart", "get_habit_chart_data", {"habit_id": habit_id, "view": chart_view, "start_date": chart_start, "end_date": chart_end}
+        yield "heatmap", "get_habit_heatmap_data", {"habit_id": habit_id, "start_date": heatmap_start, "end_date": heatmap_end}
+        yield "details", "get_habit_details", {
+            "habit_id": habit_id,
+            "today_date": today_date,
+            "chart_view": chart_view,
+            "chart_start_date": chart_start,
+            "chart_end_date": chart_end,
+            "heatmap_start_date": heatmap_start,
+            "heatmap_end_date": heatmap_end,
+        }
+
+
+def main() -> int:
+    session_factory, engine, path = create_bench_database(habit_count=HABITS, days=DAYS, end_date=END_DATE)
+    rng = random.Random(7)
+    checked, mismatches = 0, 0
+
+    try:
+        with session_factory() as db:
+            # habit ids past the last one check the "habit not found" behaviour of both engines
+            for habit_id in range(1, HABITS + 2):
+                for name, fn_name, kwargs in _cases(rng, habit_id):
+                    if name == "details" and habit_id > HABITS:
+                        continue
+                    sql_result = getattr(insights, fn_name).__wrapped__(db, **kwargs)
+                    numpy_result = getattr(insights_numpy, fn_name).__wrapped__(db, **kwargs)
+                    checked += 1
+                    if sql_result != numpy_result:
+                        mismatches += 1
+                        print(f"mismatch {name} {kwargs}")
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+    print(f"{checked} cases compared, {mismatches} mismatches")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
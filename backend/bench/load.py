@@ -0,0 +1,334 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+import httpx
+
+from backend.bench.quote_stub import StubServer
+
+HABITS = 50
+YEARS = 2
+END_DATE = date(2025, 12, 31)
+START_DATE = END_DATE - timedelta(days=YEARS * 365 - 1)
+REQUESTS = 2000
+CONCURRENCY = 8
+BASELINE_PATH = Path(__file__).with_name("load_baseline.json")
+# a route regresses when its p95 grows past baseline * tolerance and by more than REGRESSION_MIN_MS,
+# throughput when it drops below baseline / tolerance; in-process p95s move by ~20% between identical runs
+REGRESSION_TOLERANCE = 1.5
+REGRESSION_MIN_MS = 5.0
+QUOTE_UPSTREAM_LATENCY_SECONDS = 0.05
+
+
+def _day(rng: random.Random) -> str:
+    return str(START_DATE + timedelta(days=rng.randrange(YEARS * 365)))
+
+
+def _window(rng: random.Random, days: int) -> tuple[str, str]:
+    end = START_DATE + timedelta(days=rng.randrange(days, YEARS * 365))
+    return str(end - timedelta(days=days - 1)), str(end)
+
+
+class LoadState:
+    def __init__(self):
+        self.created_habit_ids = []
+        self.export_job_ids = []
+
+
+def _scenarios():
+    # (route, weight, request builder), builders return (method, url, request kwargs) or None to skip
+    def habit_id(rng):
+        return rng.randrange(1, HABITS + 1)
+
+    def grid(rng, state):
+        start, end = _window(rng, 7)
+        return "GET", "/api/habits/grid", {"params": {"start_date": start, "end_date": end}}
+
+    def create_habit(rng, state):
+        return "POST", "/api/habits", {"json": {"name": f"Load habit {rng.randrange(10 ** 6)}", "type": "simple", "color": "#3f3f3f"}}
+
+    def update_habit(rng, state):
+        if not state.created_habit_ids:
+            return None
+        habit = rng.choice(state.created_habit_ids)
+        return "PUT", f"/api/habits/{habit}", {"json": {"name": f"Load habit {habit}", "type": "simple", "color": "#0077b6"}}
+
+    def delete_habit(rng, state):
+        # only habits this run created, the seeded ones stay for the read routes
+        if not state.created_habit_ids:
+            return None
+        return "DELETE", f"/api/habits/{state.created_habit_ids.pop()}", {}
+
+    def entry(rng, state):
+        return "POST", "/api/entry", {"json": {"habit_id": habit_id(rng), "date": _day(rng), "value": rng.choice([0, 1, 1])}}
+
+    def entry_batch(rng, state):
+        entries = [{"habit_id": habit_id(rng), "date": _day(rng), "value": rng.choice([0, 1, 1])} for _ in range(20)]
+        return "POST", "/api/entry/batch", {"json": {"entries": entries}}
+
+    def week(rng, state):
+        return "GET", "/api/insights/overall/week", {"params": {"today_date": _day(rng)}}
+
+    def calendar(rng, state):
+        start, end = _window(rng, 42)
+        return "GET", "/api/insights/overall/calendar", {"params": {"start_date": start, "end_date": end}}
+
+    def cache_stats(rng, state):
+        return "GET", "/api/insights/cache", {}
+
+    def stats(rng, state):
+        return "GET", f"/api/insights/{habit_id(rng)}/stats", {"params": {"today_date": str(END_DATE)}}
+
+    def chart(rng, state):
+        start, end = _window(rng, 365)
+        view = rng.choice(["weekly", "monthly"])
+        return "GET", f"/api/insights/{habit_id(rng)}/chart", {"params": {"start_date": start, "end_date": end, "chart_view": view}}
+
+    def heatmap(rng, state):
+        start, end = _window(rng, 365)
+        return "GET", f"/api/insights/{habit_id(rng)}/heatmap", {"params": {"start_date": start, "end_date": end}}
+
+    def details(rng, state):
+        chart_start, chart_end = _window(rng, 90)
+        heatmap_start, heatmap_end = _window(rng, 365)
+        return "GET", f"/api/insights/{habit_id(rng)}/details", {"params": {
+            "today_date": str(END_DATE),
+            "chart_start_date": chart_start,
+            "chart_end_date": chart_end,
+            "heatmap_start_date": heatmap_start,
+            "heatmap_end_date": heatmap_end,
+        }}
+
+    def dashboard(rng, state):
+        calendar_start, calendar_end = _window(rng, 42)
+        grid_start, grid_end = _window(rng, 7)
+        return "GET", "/api/dashboard", {"params": {
+            "today_date": str(END_DATE),
+            "calendar_start_date": calendar_start,
+            "calendar_end_date": calendar_end,
+            "grid_start_date": grid_start,
+            "grid_end_date": grid_end,
+        }}
+
+    def export_submit(rng, state):
+        return "POST", "/api/export/pdf", {"params": {"today_date": str(END_DATE), "period": rng.choice(["week", "month"])}}
+
+    def export_status(rng, state):
+        if not state.export_job_ids:
+            return None
+        return "GET", f"/api/export/pdf/{rng.choice(state.export_job_ids)}", {}
+
+    def health(rng, state):
+        return "GET", "/health", {}
+
+    def quote(rng, state):
+        return "GET", "/api/quote", {}
+
+    return [
+        ("GET /api/habits/grid", 10, grid),
+        ("POST /api/habits", 2, create_habit),
+        ("PUT /api/habits/{id}", 1, update_habit),
+        ("DELETE /api/habits/{id}", 1, delete_habit),
+        ("POST /api/entry", 10, entry),
+        ("POST /api/entry/batch", 2, entry_batch),
+        ("GET /api/insights/overall/week", 8, week),
+        ("GET /api/insights/overall/calendar", 8, calendar),
+        ("GET /api/insights/cache", 1, cache_stats),
+        ("GET /api/insights/{id}/stats", 8, stats),
+        ("GET /api/insights/{id}/chart", 8, chart),
+        ("GET /api/insights/{id}/heatmap", 8, heatmap),
+        ("GET /api/insights/{id}/details", 6, details),
+        ("GET /api/dashboard", 10, dashboard),
+        ("POST /api/export/pdf", 1, export_submit),
+        ("GET /api/export/pdf/{job_id}", 2, export_status),
+        ("GET /health", 2, health),
+        ("GET /api/quote", 2, quote),
+    ]
+
+
+def _remember(route: str, response: httpx.Response, state: LoadState):
+    if route == "POST /api/habits" and response.status_code == 200:
+        state.created_habit_ids.append(response.json()["id"])
+    elif route == "POST /api/export/pdf" and response.status_code == 202:
+        state.export_job_ids.append(response.json()["job_id"])
+
+
+async def _worker(client: httpx.AsyncClient, rng: random.Random, state: LoadState, remaining: list, samples: dict, errors: dict):
+    scenarios = _scenarios()
+    weights = [weight for _route, weight, _build in scenarios]
+    while remaining[0] > 0:
+        route, _weight, build = rng.choices(scenarios, weights)[0]
+        request = build(rng, state)
+        if request is None:
+            continue
+        remaining[0] -= 1
+        method, url, kwargs = request
+
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        samples[route].append((time.perf_counter() - started) * 1000)
+        if response.status_code >= 500:
+            errors[route] += 1
+        _remember(route, response, state)
+
+
+def _host() -> dict:
+    # timings only compare between runs on the same machine and interpreter
+    return {"node": platform.node(), "cpus": os.cpu_count(), "python": platform.python_version()}
+
+
+def _percentiles(timings: list[float]) -> dict:
+    if len(timings) < 2:
+        value = timings[0] if timings else 0.0
+        return {"p50": value, "p95": value, "p99": value}
+    cuts = statistics.quantiles(timings, n=100, method="inclusive")
+    return {"p50": cuts[49], "p95": cuts[94], "p99": cuts[98]}
+
+
+async def _run_load(app, requests: int, concurrency: int, seed: int) -> dict:
+    from backend.app.services import ai_quote
+
+    samples, errors = defaultdict(list), defaultdict(int)
+    state, remaining = LoadState(), [requests]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*[
+            _worker(client, random.Random(seed + worker_idx), state, remaining, samples, errors)
+            for worker_idx in range(concurrency)
+        ])
+        elapsed = time.perf_counter() - started
+        # the pooled quote client belongs to this event loop
+        await ai_quote.close_client()
+
+    return {
+        "config": {"habits": HABITS, "years": YEARS, "requests": requests, "concurrency": concurrency, "seed": seed},
+        "host": _host(),
+        "throughput": sum(len(timings) for timings in samples.values()) / elapsed,
+        "routes": {
+            route: {"count": len(timings), "errors": errors[route], **_percentiles(timings)}
+            for route, timings in sorted(samples.items())
+        },
+    }
+
+
+def _print_results(results: dict, baseline: dict | None, tolerance: float = REGRESSION_TOLERANCE) -> list[str]:
+    regressions = []
+    baseline_routes = baseline["routes"] if baseline else {}
+    print(f"{'route':<36} {'count':>6} {'errors':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  vs baseline p95")
+    for route, route_results in results["routes"].items():
+        comparison = ""
+        if route in baseline_routes and baseline_routes[route]["p95"] > 0:
+            baseline_p95 = baseline_routes[route]["p95"]
+            ratio = route_results["p95"] / baseline_p95
+            comparison = f"x{ratio:.2f}"
+            if ratio > tolerance and route_results["p95"] - baseline_p95 > REGRESSION_MIN_MS:
+                comparison += "  <-- regression"
+                regressions.append(route)
+        print(
+            f"{route:<36} {route_results['count']:>6} {route_results['errors']:>6} "
+            f"{route_results['p50']:>8.2f} {route_results['p95']:>8.2f} {route_results['p99']:>8.2f}  {comparison}"
+        )
+
+    throughput = f"throughput {results['throughput']:.1f} requests/s"
+    if baseline:
+        throughput += f" (baseline {baseline['throughput']:.1f})"
+        if results["throughput"] < baseline["throughput"] / tolerance:
+            throughput += "  <-- regression"
+            regressions.append("throughput")
+    print(throughput)
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="In-process load test of the Habityu API")
+    parser.add_argument("--requests", type=int, default=REQUESTS)
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE)
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline instead of comparing")
+    parser.add_argument(
+        "--check", action="store_true",
+        help="exit non-zero on a regression against a baseline recorded on this host with the same config",
+    )
+    args = parser.parse_args()
+
+    # the app and the export worker processes read these when backend.app is first imported
+    work_dir = Path(tempfile.mkdtemp(prefix="habityu-load-"))
+    db_path = work_dir / "load.db"
+    os.environ["DB_PATH"] = str(db_path)
+    os.environ["EXPORT_DIR"] = str(work_dir / "exports")
+    # writers queue on the SQLite lock under this load, every wait would be logged as a slow query
+    os.environ["SLOW_QUERY_THRESHOLD_MS"] = "0"
+    # the quote route talks to a local stub of the model API
+    quote_stub = StubServer().start()
+    quote_stub.behaviour.latency_seconds = QUOTE_UPSTREAM_LATENCY_SECONDS
+    os.environ["OPENROUTER_API_KEY"] = "stub-key"
+    os.environ["OPENROUTER_URL"] = quote_stub.url
+
+    from backend.app.main import app
+    from backend.app.rate_limiter import global_rate_limiter
+    from backend.app.services import export_jobs
+    from backend.bench.seed import create_bench_database
+
+    _session_factory, seed_engine, _path = create_bench_database(
+        habit_count=HABITS, days=YEARS * 365, end_date=END_DATE, path=str(db_path)
+    )
+    seed_engine.dispose()
+    global_rate_limiter.enabled = False
+    print(f"{HABITS} habits x {YEARS} years seeded in {db_path}, {args.requests} requests at concurrency {args.concurrency}")
+
+    try:
+        results = asyncio.run(_run_load(app, args.requests, args.concurrency, args.seed))
+    finally:
+        export_jobs.shutdown()
+        quote_stub.stop()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.save_baseline:
+        _print_results(results, None)
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else None
+    comparable = False
+    if baseline is None:
+        print(f"no baseline at {args.baseline}, run with --save-baseline to create one")
+    elif baseline["config"] != results["config"]:
+        # other request counts, concurrency or seeds give other route mixes and queueing, the numbers do not compare
+        print(f"baseline recorded with {baseline['config']}, this run {results['config']}: not compared")
+        baseline = None
+    elif baseline.get("host") != results["host"]:
+        print(f"baseline recorded on {baseline.get('host', 'an unrecorded host')}, this run on {results['host']}: "
+              f"shown for reference only, re-record with --save-baseline on this host before using --check")
+    else:
+        comparable = True
+    regressions = _print_results(results, baseline, args.tolerance)
+
+    failed = False
+    server_errors = sum(route_results["errors"] for route_results in results["routes"].values())
+    if server_errors:
+        print(f"{server_errors} server errors")
+        failed = True
+    if args.check and not comparable:
+        print("--check needs a baseline recorded on this host with the same config")
+        failed = True
+    elif args.check and regressions:
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+import os
+import re
+import sys
+from collections import Counter
+from datetime import date, timedelta
+from sqlalchemy import event
+
+from backend.app import crud, insights, rollups, schemas, streaks
+from backend.bench.seed import create_bench_database
+
+HABITS = 50
+DAYS = 365
+END_DATE = date(2025, 12, 31)
+START_DATE = END_DATE - timedelta(days=DAYS - 1)
+
+# only real tables count, a SCAN of a CTE or subquery is read from memory
+TABLES = {"habits", "habit_entries", "streak_summaries", "daily_rollups", "data_version"}
+# tables that grow with the data, any other full scan of them is flagged
+INDEXED_TABLES = {"habit_entries", "streak_summaries"}
+# whole table work by design, these rebuild or aggregate every entry
+FULL_SCAN_CASES = {"streaks.rebuild_all_summaries", "rollups.rebuild_all_rollups", "streaks.get_streaks overall"}
+PLAN_LINE = re.compile(r"^(SCAN|SEARCH) (\S+)(?: AS \S+)?(?: USING (COVERING INDEX \S+|INDEX \S+|INTEGER PRIMARY KEY|PRIMARY KEY))?")
+
+
+def _uncached(fn):
+    return getattr(fn, "__wrapped__", fn)
+
+
+def _cases():
+    # every public read in insights.py and crud.py, and the write paths with their rollup/streak upkeep
+    chart_start = END_DATE - timedelta(days=90)
+    return [
+        ("insights.get_sidebar_week_insights", lambda db: _uncached(insights.get_sidebar_week_insights)(db, END_DATE)),
+        ("insights.get_sidebar_calendar_insights", lambda db: _uncached(insights.get_sidebar_calendar_insights)(db, END_DATE.replace(day=1), END_DATE)),
+        ("insights.get_habit_streaks_and_total_completions", lambda db: _uncached(insights.get_habit_streaks_and_total_completions)(db, 7, END_DATE)),
+        ("insights.get_habit_chart_data weekly", lambda db: _uncached(insights.get_habit_chart_data)(db, 7, "weekly", chart_start, END_DATE)),
+        ("insights.get_habit_chart_data monthly", lambda db: _uncached(insights.get_habit_chart_data)(db, 7, "monthly", START_DATE, END_DATE)),
+        ("insights.get_habit_heatmap_data", lambda db: _uncached(insights.get_habit_heatmap_data)(db, 7, START_DATE, END_DATE)),
+        ("insights.get_dashboard_data", lambda db: _uncached(insights.get_dashboard_data)(
+            db, list(schemas.DashboardSection), END_DATE, END_DATE.replace(day=1), END_DATE, END_DATE - timedelta(days=6), END_DATE
+        )),
+        ("insights.get_habit_details", lambda db: _uncached(insights.get_habit_details)(
+            db, 7, END_DATE, "weekly", chart_start, END_DATE, START_DATE, END_DATE
+        )),
+        ("streaks.get_streaks overall", lambda db: streaks._calculate_streaks(db, None, END_DATE)),
+        ("crud.get_habit_table_data", lambda db: crud.get_habit_table_data(db, END_DATE - timedelta(days=6), END_DATE)),
+        ("crud.get_all_habits", lambda db: crud.get_all_habits(db)),
+        ("crud.create_or_update_entry", lambda db: crud.create_or_update_entry(
+            db, schemas.CreateHabitEntry(habit_id=3, date=END_DATE, value=1)
+        )),
+        ("crud.create_or_update_entry delete", lambda db: crud.create_or_update_entry(
+            db, schemas.CreateHabitEntry(habit_id=3, date=END_DATE, value=0)
+        )),
+        ("crud.create_or_update_entries", lambda db: crud.create_or_update_entries(db, [
+            schemas.CreateHabitEntry(habit_id=habit_id, date=END_DATE - timedelta(days=offset), value=value)
+            for habit_id in (4, 5) for offset, value in ((0, 1), (1, 0), (2, 1))
+        ])),
+        ("crud.delete_habit", lambda db: crud.delete_habit(db, crud.get_habit(db, HABITS))),
+        ("streaks.rebuild_all_summaries", lambda db: streaks.rebuild_all_summaries(db)),
+        ("rollups.rebuild_all_rollups", lambda db: rollups.rebuild_all_rollups(db)),
+    ]
+
+
+def _parse_plan(plan_rows) -> list[tuple[str, str]]:
+    # (table, access, index name) for every real table the statement reads
+    accesses = []
+    for *_ids, detail in plan_rows:
+        match = PLAN_LINE.match(detail)
+        if not match or match.group(2) not in TABLES:
+            continue
+        operation, table, using = match.groups()
+        if operation == "SCAN":
+            access = "covering index scan" if using else "full scan"
+        elif using.startswith("INDEX"):
+            access = "index"
+        else:
+            access = "covering index"
+        index_name = using.split()[-1] if using and "INDEX" in using else ""
+        accesses.append((table, access, index_name))
+    return accesses
+
+
+def _capture(engine, case):
+    statements = []
+
+    def _before_cursor_execute(_conn, _cursor, statement, parameters, _context, executemany):
+        # executemany passes a list of rows, the plan only needs the first one
+        if executemany and isinstance(parameters, list):
+            parameters = parameters[0] if parameters else ()
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        case()
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+    return statements
+
+
+def audit(session_factory, engine) -> int:
+    """Print the table accesses of every captured statement, returns the number of unexpected full scans."""
+    unexpected = 0
+    totals = Counter()
+    for label, case in _cases():
+        with session_factory() as db:
+            statements = _capture(engine, lambda: case(db))
+
+        print(f"\n{label}")
+        # the raw sqlite3 connection takes the parameters exactly as the driver received them
+        connection = engine.raw_connection()
+        try:
+            lines = Counter()
+            for statement, parameters in statements:
+                if statement.lstrip().upper().startswith(("PRAGMA", "SAVEPOINT", "RELEASE")):
+                    continue
+                plan = connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+                for table, access, index_name in _parse_plan(plan):
+                    totals[access] += 1
+                    lines[(table, access, index_name, " ".join(statement.split())[:60])] += 1
+        finally:
+            connection.close()
+
+        for (table, access, index_name, statement), count in lines.items():
+            flag = ""
+            if table in INDEXED_TABLES and access == "full scan" and label not in FULL_SCAN_CASES:
+                unexpected += count
+                flag = "  <-- unexpected"
+            print(f"  {count:>3}x {table:<16} {access:<20} {index_name:<36} {statement}{flag}")
+
+    print("\n" + ", ".join(f"{count} {access}" for access, count in totals.most_common()))
+    print(f"{unexpected} unexpected full scans of {' or '.join(sorted(INDEXED_TABLES))}")
+    return unexpected
+
+
+def main():
+    session_factory, engine, path = create_bench_database(habit_count=HABITS, days=DAYS, end_date=END_DATE)
+    try:
+        unexpected = audit(session_factory, engine)
+    finally:
+        engine.dispose()
+        os.remove(path)
+    sys.exit(1 if unexpected else 0)
+
+
+if __name__ == "__main__":
+    main()
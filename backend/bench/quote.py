@@ -0,0 +1,174 @@
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+from backend.bench.quote_stub import STUB_QUOTE, StubServer
+
+READ_TIMEOUT_SECONDS = 0.5
+BREAKER_FAILURES = 3
+BREAKER_RESET_SECONDS = 1.0
+MAX_CONCURRENCY = 4
+POOL_SIZE = 5
+POOL_LOW_WATERMARK = 2
+
+
+class Checks:
+    def __init__(self):
+        self.failed = 0
+
+    def expect(self, condition: bool, description: str):
+        print(f"  {'ok  ' if condition else 'FAIL'} {description}")
+        if not condition:
+            self.failed += 1
+
+
+async def _timed_quote(ai_quote, db) -> tuple[dict, float]:
+    started = time.perf_counter()
+    quote = await ai_quote.get_motivational_quote(db)
+    return quote, (time.perf_counter() - started) * 1000
+
+
+def _reset(ai_quote, stub: StubServer, latency_seconds: float = 0.0, status_code: int = 200):
+    ai_quote.breaker = ai_quote.CircuitBreaker(BREAKER_FAILURES, BREAKER_RESET_SECONDS)
+    stub.behaviour.latency_seconds = latency_seconds
+    stub.behaviour.status_code = status_code
+    stub.behaviour.requests = 0
+    stub.behaviour.connections.clear()
+
+
+async def _run(ai_quote, db, stub: StubServer) -> int:
+    checks = Checks()
+    default = {"quote": ai_quote.DEFAULT_QUOTE, "author": ai_quote.DEFAULT_AUTHOR}
+    await ai_quote.start_client()
+    # the client checks call upstream on every request, the quote pool has its own checks below
+    ai_quote.QUOTE_CACHE_ENABLED = False
+
+    print("healthy upstream, 50 sequential calls at 20 ms")
+    _reset(ai_quote, stub, latency_seconds=0.02)
+    results = [await _timed_quote(ai_quote, db) for _ in range(50)]
+    checks.expect(all(quote == STUB_QUOTE for quote, _ in results), "every call gets the upstream quote")
+    checks.expect(len(stub.behaviour.connections) == 1, f"one pooled connection reused ({len(stub.behaviour.connections)} opened)")
+    print(f"  median {statistics.median(ms for _, ms in results):.1f} ms")
+
+    print(f"20 concurrent calls at 200 ms, limit {MAX_CONCURRENCY}")
+    _reset(ai_quote, stub, latency_seconds=0.2)
+    results = await asyncio.gather(*[_timed_quote(ai_quote, db) for _ in range(20)])
+    checks.expect(stub.behaviour.requests == MAX_CONCURRENCY, f"only {MAX_CONCURRENCY} calls reach upstream ({stub.behaviour.requests})")
+    checks.expect(sum(quote == default for quote, _ in results) == 20 - MAX_CONCURRENCY, "the rest fall back without waiting")
+
+    print(f"upstream slower than the {READ_TIMEOUT_SECONDS}s read timeout")
+    _reset(ai_quote, stub, latency_seconds=READ_TIMEOUT_SECONDS * 4)
+    results = [await _timed_quote(ai_quote, db) for _ in range(BREAKER_FAILURES)]
+    checks.expect(all(quote == default for quote, _ in results), "timed out calls fall back")
+    checks.expect(max(ms for _, ms in results) < READ_TIMEOUT_SECONDS * 1000 * 2, f"no call waits past the timeout ({max(ms for _, ms in results):.0f} ms)")
+    checks.expect(ai_quote.breaker.state == "open", f"breaker opens after {BREAKER_FAILURES} failures")
+    quote, ms = await _timed_quote(ai_quote, db)
+    checks.expect(quote == default and stub.behaviour.requests == BREAKER_FAILURES, f"open breaker skips upstream ({ms:.1f} ms)")
+
+    print("upstream recovers")
+    stub.behaviour.latency_seconds = 0.0
+    await asyncio.sleep(BREAKER_RESET_SECONDS)
+    checks.expect(ai_quote.breaker.state == "half-open", "breaker half-opens after the reset window")
+    quote, _ = await _timed_quote(ai_quote, db)
+    checks.expect(quote == STUB_QUOTE and ai_quote.breaker.state == "closed", "trial call succeeds and closes the breaker")
+
+    print("upstream answers 503")
+    _reset(ai_quote, stub, status_code=503)
+    results = [await _timed_quote(ai_quote, db) for _ in range(BREAKER_FAILURES + 2)]
+    checks.expect(all(quote == default for quote, _ in results), "5xx answers fall back")
+    checks.expect(stub.behaviour.requests == BREAKER_FAILURES, f"breaker stops calls after {BREAKER_FAILURES} failures ({stub.behaviour.requests})")
+    await asyncio.sleep(BREAKER_RESET_SECONDS)
+    await _timed_quote(ai_quote, db)
+    checks.expect(ai_quote.breaker.state == "open", "failed trial reopens the breaker")
+
+    print("model answers with malformed content")
+    _reset(ai_quote, stub)
+    stub.behaviour.content = "not json"
+    results = [await _timed_quote(ai_quote, db) for _ in range(BREAKER_FAILURES + 1)]
+    checks.expect(all(quote == default for quote, _ in results), "malformed quotes fall back")
+    checks.expect(ai_quote.breaker.state == "closed", "malformed quotes do not open the breaker")
+
+    await _run_pool_checks(ai_quote, db, stub, checks)
+    await ai_quote.close_client()
+    return checks.failed
+
+
+async def _wait_for_refills(ai_quote):
+    while ai_quote._refill_tasks:
+        await asyncio.gather(*ai_quote._refill_tasks)
+
+
+async def _run_pool_checks(ai_quote, db, stub: StubServer, checks: Checks):
+    from backend.app import crud, models, schemas
+    from backend.app.services.quote_cache import quote_cache
+
+    print(f"quote pool of {POOL_SIZE}, refilled below {POOL_LOW_WATERMARK}")
+    _reset(ai_quote, stub, latency_seconds=0.02)
+    stub.behaviour.content = json.dumps(STUB_QUOTE)
+    ai_quote.QUOTE_CACHE_ENABLED = True
+    quote_cache.clear()
+
+    quote, ms = await _timed_quote(ai_quote, db)
+    checks.expect(quote == STUB_QUOTE and stub.behaviour.requests == 1, f"a cold pool calls upstream inline ({ms:.1f} ms)")
+    await _wait_for_refills(ai_quote)
+    checks.expect(stub.behaviour.requests == 1 + POOL_SIZE, f"the pool is refilled in the background ({stub.behaviour.requests - 1} calls)")
+
+    # db=None: a pooled quote must not touch the database
+    served = POOL_SIZE - POOL_LOW_WATERMARK + 1
+    results = [await _timed_quote(ai_quote, None) for _ in range(served)]
+    checks.expect(all(quote == STUB_QUOTE for quote, _ in results), "pooled quotes are served without the database")
+    checks.expect(stub.behaviour.requests == 1 + POOL_SIZE, "pooled quotes are served without upstream calls")
+    print(f"  median pooled quote {statistics.median(ms for _, ms in results) * 1000:.0f} us")
+    await _wait_for_refills(ai_quote)
+    checks.expect(stub.behaviour.requests == 1 + POOL_SIZE + served, "dropping below the watermark tops the pool up")
+
+    print("habit writes change the name set")
+    requests_before = stub.behaviour.requests
+    habit = crud.create_habit(db, schemas.CreateHabit(name="Quote bench habit", type=models.HabitType.simple, color="#3f3f3f"))
+    quote, _ = await _timed_quote(ai_quote, db)
+    checks.expect(stub.behaviour.requests == requests_before + 1, "a new habit starts a new pool")
+    checks.expect("Quote bench habit" in stub.behaviour.last_prompt, "the new pool's prompt has the new habit name")
+    await _wait_for_refills(ai_quote)
+
+    requests_before = stub.behaviour.requests
+    crud.delete_habit(db, habit)
+    quote, _ = await _timed_quote(ai_quote, db)
+    checks.expect(quote == STUB_QUOTE and stub.behaviour.requests == requests_before, "the previous name set finds its pool again")
+    await _wait_for_refills(ai_quote)
+
+
+def main() -> int:
+    stub = StubServer().start()
+    # read by backend.app.config when backend.app is first imported
+    os.environ.update({
+        "OPENROUTER_API_KEY": "stub-key",
+        "OPENROUTER_URL": stub.url,
+        "QUOTE_READ_TIMEOUT_SECONDS": str(READ_TIMEOUT_SECONDS),
+        "QUOTE_BREAKER_FAILURES": str(BREAKER_FAILURES),
+        "QUOTE_BREAKER_RESET_SECONDS": str(BREAKER_RESET_SECONDS),
+        "QUOTE_MAX_CONCURRENCY": str(MAX_CONCURRENCY),
+        "QUOTE_POOL_SIZE": str(POOL_SIZE),
+        "QUOTE_POOL_LOW_WATERMARK": str(POOL_LOW_WATERMARK),
+    })
+    from backend.app.services import ai_quote
+    from backend.bench.seed import create_bench_database
+
+    session_factory, engine, path = create_bench_database(habit_count=5, days=30)
+    db = session_factory()
+    try:
+        failed = asyncio.run(_run(ai_quote, db, stub))
+    finally:
+        db.close()
+        engine.dispose()
+        os.remove(path)
+        stub.stop()
+
+    print(f"{failed} failed checks" if failed else "all checks passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
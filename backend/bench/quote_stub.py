@@ -0,0 +1,63 @@
+import asyncio
+import json
+import socket
+import threading
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+STUB_QUOTE = {"quote": "Stub quote", "author": "Stub author"}
+
+
+class StubBehaviour:
+    def __init__(self):
+        self.latency_seconds = 0.0
+        self.status_code = 200
+        self.content = json.dumps(STUB_QUOTE)
+        self.requests = 0
+        self.connections = set()
+        self.last_prompt = None
+
+
+def create_stub_app(behaviour: StubBehaviour) -> FastAPI:
+    # answers like the OpenRouter chat completions API, with the latency, status and content the bench sets
+    app = FastAPI()
+
+    @app.post("/chat/completions")
+    async def chat_completions(request: Request):
+        behaviour.requests += 1
+        behaviour.connections.add((request.client.host, request.client.port))
+        behaviour.last_prompt = (await request.json())["messages"][0]["content"]
+        await asyncio.sleep(behaviour.latency_seconds)
+        if behaviour.status_code != 200:
+            return JSONResponse(status_code=behaviour.status_code, content={"error": "stubbed failure"})
+        return {"choices": [{"message": {"content": behaviour.content}}]}
+
+    return app
+
+
+class StubServer:
+    """Serves the stub upstream on a free localhost port from a background thread, over real TCP connections."""
+
+    def __init__(self):
+        self.behaviour = StubBehaviour()
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # accepted connections inherit it, the stub's split header/body writes would otherwise wait on delayed ACKs
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._socket.bind(("127.0.0.1", 0))
+        self.url = f"http://127.0.0.1:{self._socket.getsockname()[1]}/chat/completions"
+        self._server = uvicorn.Server(uvicorn.Config(create_stub_app(self.behaviour), log_level="warning"))
+        self._thread = threading.Thread(target=self._server.run, kwargs={"sockets": [self._socket]}, daemon=True)
+
+    def start(self) -> "StubServer":
+        self._thread.start()
+        while not self._server.started:
+            if not self._thread.is_alive():
+                raise RuntimeError("quote stub server failed to start")
+            threading.Event().wait(0.01)
+        return self
+
+    def stop(self):
+        self._server.should_exit = True
+        self._thread.join()
+        self._socket.close()
@@ -0,0 +1,79 @@
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from backend.app.rate_limiter import Acquire, MemoryRateLimitStore, SqliteRateLimitStore, parse_rate
+
+CHECKS = 20000
+KEY_COUNTS = [10, 100000]
+WORKERS = 4
+ATTEMPTS_PER_WORKER = 200
+SHARED_LIMIT = parse_rate("100/hour")
+
+
+def _checks_per_second(store, key_count: int) -> float:
+    rate = parse_rate("1000000/minute")
+    budget = parse_rate("1000000/minute")
+    started = time.perf_counter()
+    for check_idx in range(CHECKS):
+        client = f"10.0.{check_idx % key_count}"
+        store.acquire([Acquire(f"{client}:route", rate, 1), Acquire(f"{client}:*", budget, 3)])
+    return CHECKS / (time.perf_counter() - started)
+
+
+def _hammer(path: str, allowed_counts):
+    # a separate worker process, as under uvicorn --workers
+    store = SqliteRateLimitStore(path)
+    allowed = sum(store.acquire([Acquire("203.0.113.7:route", SHARED_LIMIT, 1)])[0] < 0 for _ in range(ATTEMPTS_PER_WORKER))
+    allowed_counts.put(allowed)
+
+
+def main() -> int:
+    failed = 0
+    work_dir = tempfile.mkdtemp(prefix="habityu-rate-limits-")
+    path = os.path.join(work_dir, "rate-limits.db")
+
+    for key_count in KEY_COUNTS:
+        memory_rate = _checks_per_second(MemoryRateLimitStore(max_keys=key_count), key_count)
+        sqlite_store = SqliteRateLimitStore(path)
+        sqlite_store.reset()
+        sqlite_rate = _checks_per_second(sqlite_store, key_count)
+        print(f"{key_count:>7} clients: memory {memory_rate:>9.0f} checks/s  sqlite {sqlite_rate:>7.0f} checks/s")
+
+    bounded = MemoryRateLimitStore(max_keys=1000)
+    _checks_per_second(bounded, 50000)
+    print(f"memory store holds {len(bounded._tats)} keys after 50000 clients (max 1000)")
+    failed += len(bounded._tats) > 1000
+
+    # a failing limit must not charge the other keys of the same acquire
+    store = MemoryRateLimitStore(max_keys=100)
+    tight, loose = parse_rate("1/minute"), parse_rate("100/minute")
+    store.acquire([Acquire("a", tight, 1), Acquire("b", loose, 1)])
+    rejected_idx, retry_after = store.acquire([Acquire("a", tight, 1), Acquire("b", loose, 1)])
+    store.reset()
+    print(f"multi-key acquire rejected by limit {rejected_idx}, retry after {retry_after:.1f}s")
+    failed += rejected_idx != 0
+
+    SqliteRateLimitStore(path).reset()
+    context = multiprocessing.get_context("spawn")
+    allowed_counts = context.Queue()
+    workers = [context.Process(target=_hammer, args=(path, allowed_counts)) for _ in range(WORKERS)]
+    for worker in workers:
+        worker.start()
+    allowed = sum(allowed_counts.get() for _ in workers)
+    for worker in workers:
+        worker.join()
+    print(f"{WORKERS} processes x {ATTEMPTS_PER_WORKER} attempts against {SHARED_LIMIT.text}: {allowed} allowed")
+    failed += allowed != SHARED_LIMIT.limit
+
+    for name in os.listdir(work_dir):
+        os.remove(os.path.join(work_dir, name))
+    os.rmdir(work_dir)
+    print(f"{failed} failed checks" if failed else "all checks passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+import os
+import statistics
+import sys
+import time
+from datetime import date
+from reportlab.lib.styles import getSampleStyleSheet
+
+from backend.app import schemas
+from backend.app.services import report_styles
+from backend.app.services.pdf_report import create_full_report
+from backend.bench.seed import create_bench_database
+
+HABIT_COUNTS = [10, 100, 500]
+DAYS = 365
+END_DATE = date(2025, 12, 31)
+ROUNDS = 3
+
+
+def _per_cell_background_runs(row_idx: int, cell_colors: list, first_col: int = 0) -> list:
+    # the previous rendering: one BACKGROUND command per cell
+    return [
+        ('BACKGROUND', (col_idx, row_idx), (col_idx, row_idx), color)
+        for col_idx, color in enumerate(cell_colors, start=first_col)
+        if color is not None
+    ]
+
+
+def _measure(session_factory, period: schemas.ReportPeriod) -> list[float]:
+    timings = []
+    for _ in range(ROUNDS):
+        db = session_factory()
+        try:
+            started = time.perf_counter()
+            create_full_report(db, END_DATE, period)
+            timings.append((time.perf_counter() - started) * 1000)
+        finally:
+            db.close()
+    return timings
+
+
+def _run(session_factory, habit_count: int):
+    merged_runs, cached_stylesheet = report_styles.background_runs, report_styles.get_stylesheet
+    variants = {
+        "per-cell": (_per_cell_background_runs, getSampleStyleSheet),
+        "runs": (merged_runs, cached_stylesheet),
+    }
+
+    try:
+        for period in schemas.ReportPeriod:
+            for name, (background_runs, get_stylesheet) in variants.items():
+                report_styles.background_runs, report_styles.get_stylesheet = background_runs, get_stylesheet
+                timings = _measure(session_factory, period)
+                print(
+                    f"report {habit_count:>4} habits {period.value:>5} {name:>8}: "
+                    f"median {statistics.median(timings):8.1f} ms  min {min(timings):8.1f} ms"
+                )
+    finally:
+        report_styles.background_runs, report_styles.get_stylesheet = merged_runs, cached_stylesheet
+
+
+def main():
+    habit_counts = [int(arg) for arg in sys.argv[1:]] or HABIT_COUNTS
+    for habit_count in habit_counts:
+        session_factory, engine, path = create_bench_database(habit_count=habit_count, days=DAYS, end_date=END_DATE)
+        try:
+            _run(session_factory, habit_count)
+        finally:
+            engine.dispose()
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import argparse
+import random
+import tempfile
+from datetime import date, timedelta
+from sqlalchemy import create_engine, event, insert, select, func
+from sqlalchemy.orm import sessionmaker
+
+from backend.app import models, rollups, streaks
+from backend.app.database import Base
+
+
+def _enable_foreign_keys(dbapi_connection, _connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def _generate_habits(rng: random.Random, habit_count: int, start_date: date) -> list[dict]:
+    habits = []
+    for habit_id in range(1, habit_count + 1):
+        measurable = rng.random() < 0.4
+        habits.append({
+            "id": habit_id,
+            "name": f"Habit {habit_id}",
+            "created_date": start_date,
+            "type": models.HabitType.measurable if measurable else models.HabitType.simple,
+            "color": f"#{rng.randrange(0x1000000):06x}",
+            "target": float(rng.choice([5, 10, 20, 30, 60])) if measurable else None,
+            "unit": rng.choice(["min", "pages", "km"]) if measurable else None,
+        })
+    return habits
+
+
+def _generate_entries(rng: random.Random, habit: dict, start_date: date, days: int) -> list[dict]:
+    # adherence differs per habit, weekends are weaker and completing yesterday makes today more likely
+    adherence = rng.uniform(0.35, 0.9)
+    entries = []
+    completed_yesterday = False
+
+    for offset in range(days):
+        day = start_date + timedelta(days=offset)
+        chance = adherence * (0.75 if day.weekday() >= 5 else 1.0)
+        chance = min(0.97, chance + (0.15 if completed_yesterday else -0.1))
+
+        if habit["type"] == models.HabitType.simple:
+            if rng.random() >= chance:
+                completed_yesterday = False
+                continue
+            value = 1.0
+        else:
+            if rng.random() >= min(1.0, chance + 0.15):
+                completed_yesterday = False
+                continue
+            value = round(max(1.0, rng.gauss(habit["target"] * (chance + 0.2), habit["target"] * 0.3)), 1)
+
+        completed = value >= (habit["target"] or 1)
+        completed_yesterday = completed
+        entries.append({
+            "habit_id": habit["id"],
+            "date": day,
+            "value": value,
+            "is_completed": completed,
+        })
+    return entries
+
+
+def create_bench_database(
+        habit_count: int = 50,
+        days: int = 365,
+        end_date: date = date(2025, 12, 31),
+        seed: int = 42,
+        path: str | None = None
+):
+    """Create a SQLite file with habit_count habits and up to days entries each, same seed gives same data."""
+    path = path or tempfile.mkstemp(prefix="habityu-bench-", suffix=".db")[1]
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    event.listen(engine, "connect", _enable_foreign_keys)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    rng = random.Random(seed)
+    start_date = end_date - timedelta(days=days - 1)
+    habits = _generate_habits(rng, habit_count, start_date)
+
+    with engine.begin() as connection:
+        connection.execute(insert(models.Habit), habits)
+        for habit in habits:
+            entries = _generate_entries(rng, habit, start_date, days)
+            if entries:
+                connection.execute(insert(models.HabitEntry), entries)
+
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    # entries are inserted directly, the derived tables are filled like the maintenance commands do,
+    # so streak summaries are not built lazily inside the first timed call
+    with session_factory() as db:
+        rollups.rebuild_all_rollups(db)
+        streaks.rebuild_all_summaries(db)
+    return session_factory, engine, path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a deterministic Habityu database for benchmarks or manual testing")
+    parser.add_argument("path", help="SQLite file to create, an existing file is overwritten")
+    parser.add_argument("--habits", type=int, default=50)
+    parser.add_argument("--years", type=int, default=1)
+    parser.add_argument("--end-date", type=date.fromisoformat, default=date(2025, 12, 31))
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    _session_factory, engine, path = create_bench_database(
+        habit_count=args.habits,
+        days=args.years * 365,
+        end_date=args.end_date,
+        seed=args.seed,
+        path=args.path
+    )
+    with engine.connect() as connection:
+        entry_count = connection.execute(select(func.count()).select_from(models.HabitEntry)).scalar()
+    engine.dispose()
+    print(f"{args.habits} habits x {args.years} years, {entry_count} entries written to {path}")
+
+
+if __name__ == "__main__":
+    main()
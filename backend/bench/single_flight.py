@@ -0,0 +1,97 @@
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+import httpx
+
+HABITS = 50
+YEARS = 2
+END_DATE = date(2025, 12, 31)
+HERD_SIZE = 50
+ROUTES = {
+    "overall week": ("/api/insights/overall/week", {"today_date": str(END_DATE)}),
+    "habit grid": ("/api/habits/grid", {"start_date": str(END_DATE - timedelta(days=6)), "end_date": str(END_DATE)}),
+    "dashboard": ("/api/dashboard", {
+        "today_date": str(END_DATE),
+        "calendar_start_date": str(END_DATE - timedelta(days=41)),
+        "calendar_end_date": str(END_DATE),
+        "grid_start_date": str(END_DATE - timedelta(days=6)),
+        "grid_end_date": str(END_DATE),
+    }),
+    "habit details": ("/api/insights/1/details", {
+        "today_date": str(END_DATE),
+        "chart_start_date": str(END_DATE - timedelta(days=89)),
+        "chart_end_date": str(END_DATE),
+        "heatmap_start_date": str(END_DATE - timedelta(days=364)),
+        "heatmap_end_date": str(END_DATE),
+    }),
+}
+
+
+async def _herd(client: httpx.AsyncClient, url: str, params: dict) -> tuple[float, set[bytes]]:
+    # every request of the herd misses the insight cache at the same moment, like the first hit of the day
+    started = time.perf_counter()
+    responses = await asyncio.gather(*[client.get(url, params=params) for _ in range(HERD_SIZE)])
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if any(response.status_code != 200 for response in responses):
+        raise RuntimeError(f"{url} answered {sorted({response.status_code for response in responses})}")
+    return elapsed_ms, {response.content for response in responses}
+
+
+async def _run(app) -> int:
+    from backend.app import metrics, single_flight
+    from backend.app.cache import insight_cache
+
+    mismatches = 0
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{'route':<16} {'single flight':>13} {'statements':>10} {'coalesced':>9} {'herd ms':>8}")
+        for label, (url, params) in ROUTES.items():
+            bodies = set()
+            for enabled in (False, True):
+                single_flight.SINGLE_FLIGHT_ENABLED = enabled
+                insight_cache.clear()
+                statements_before = metrics._sql_totals["statements"]
+                coalesced_before = sum(count for (_fn, result), count in metrics._single_flight_calls.items() if result == "coalesced")
+                elapsed_ms, herd_bodies = await _herd(client, url, params)
+                statements = metrics._sql_totals["statements"] - statements_before
+                coalesced = sum(count for (_fn, result), count in metrics._single_flight_calls.items() if result == "coalesced") - coalesced_before
+                bodies |= herd_bodies
+                print(f"{label:<16} {'on' if enabled else 'off':>13} {statements:>10} {coalesced:>9} {elapsed_ms:>8.1f}")
+            if len(bodies) != 1:
+                print(f"  {label}: {len(bodies)} different responses")
+                mismatches += 1
+    return mismatches
+
+
+def main() -> int:
+    work_dir = Path(tempfile.mkdtemp(prefix="habityu-single-flight-"))
+    db_path = work_dir / "single_flight.db"
+    # read when backend.app is first imported
+    os.environ["DB_PATH"] = str(db_path)
+    os.environ["SLOW_QUERY_THRESHOLD_MS"] = "0"
+
+    from backend.app.main import app
+    from backend.app.rate_limiter import global_rate_limiter
+    from backend.bench.seed import create_bench_database
+
+    _session_factory, seed_engine, _path = create_bench_database(
+        habit_count=HABITS, days=YEARS * 365, end_date=END_DATE, path=str(db_path)
+    )
+    seed_engine.dispose()
+    global_rate_limiter.enabled = False
+    print(f"{HABITS} habits x {YEARS} years seeded, herds of {HERD_SIZE} identical requests")
+
+    try:
+        mismatches = asyncio.run(_run(app))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
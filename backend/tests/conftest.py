@@ -0,0 +1,38 @@
+import os
+import tempfile
+
+import pytest
+
+# read when backend.app is first imported, the suite never touches habit-tracker.db
+_work_dir = tempfile.mkdtemp(prefix="habityu-tests-")
+os.environ["DB_PATH"] = os.path.join(_work_dir, "tests.db")
+os.environ["EXPORT_DIR"] = os.path.join(_work_dir, "exports")
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ.pop("OPENROUTER_API_KEY", None)
+
+
+@pytest.fixture
+def db():
+    from backend.app import models  # noqa: F401  registers the tables with Base.metadata
+    from backend.app.cache import insight_cache
+    from backend.app.database import Base, SessionLocal, engine
+    from backend.app.services.quote_cache import quote_cache
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    insight_cache.clear()
+    quote_cache.clear()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(db):
+    from fastapi.testclient import TestClient
+    from backend.app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,186 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from backend.app.services import ai_quote
+from backend.app.services.ai_quote import CircuitBreaker
+
+QUOTE_REPLY = {"choices": [{"message": {"content": json.dumps({"quote": "Keep going.", "author": "Someone"})}}]}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+class StubUpstream:
+    """Answers quote requests from the test instead of the network, counting the calls that reach it."""
+
+    def __init__(self, fail_with: type[httpx.TransportError] | None = None):
+        self.fail_with = fail_with
+        self.calls = 0
+        # when set, requests wait for it, holding their upstream slot
+        self.release: asyncio.Event | None = None
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        if self.release is not None:
+            await self.release.wait()
+        if self.fail_with is not None:
+            raise self.fail_with("upstream unavailable", request=request)
+        return httpx.Response(200, json=QUOTE_REPLY)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(monkeypatch, clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=30, clock=clock)
+    monkeypatch.setattr(ai_quote, "breaker", breaker)
+    return breaker
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    upstream = StubUpstream()
+    monkeypatch.setattr(ai_quote, "OPENROUTER_URL", "https://upstream.test/chat")
+    monkeypatch.setattr(ai_quote, "_client", httpx.AsyncClient(transport=httpx.MockTransport(upstream.handle)))
+    return upstream
+
+
+def test_breaker_opens_after_consecutive_failures(breaker):
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_open_breaker_lets_one_trial_through_after_the_reset_time(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+
+    clock.advance(29.9)
+    assert breaker.state == "open"
+    clock.advance(0.1)
+    assert breaker.state == "half-open"
+
+    assert breaker.allow()
+    # the trial is running, everyone else keeps getting the fallback
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_successful_trial_closes_the_breaker(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.advance(30)
+    assert breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+
+
+def test_failed_trial_reopens_the_breaker_for_another_reset_time(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.advance(30)
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    clock.advance(29.9)
+    assert breaker.state == "open"
+    clock.advance(0.1)
+    assert breaker.state == "half-open"
+
+
+def test_cancelled_trial_frees_the_half_open_slot(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.advance(30)
+    assert breaker.allow()
+
+    breaker.cancel_trial()
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+
+
+@pytest.mark.parametrize("error", [httpx.ReadTimeout, httpx.ConnectTimeout, httpx.ConnectError])
+def test_upstream_timeouts_open_the_breaker_and_stop_reaching_upstream(breaker, clock, upstream, error):
+    upstream.fail_with = error
+
+    async def fetch_quotes(count):
+        return [await ai_quote._fetch_quote(["Run"]) for _ in range(count)]
+
+    assert asyncio.run(fetch_quotes(5)) == [None] * 5
+    assert breaker.state == "open"
+    assert upstream.calls == 3
+
+    # the half-open trial reaches upstream again and closes the breaker once it answers
+    upstream.fail_with = None
+    clock.advance(30)
+    assert asyncio.run(fetch_quotes(2)) == [{"quote": "Keep going.", "author": "Someone"}] * 2
+    assert breaker.state == "closed"
+    assert upstream.calls == 5
+
+
+def test_cancelled_call_ends_the_half_open_trial(breaker, clock, upstream):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.advance(30)
+
+    async def cancel_trial():
+        upstream.release = asyncio.Event()
+        trial = asyncio.create_task(ai_quote._fetch_quote(["Run"]))
+        while upstream.calls == 0:
+            await asyncio.sleep(0)
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+    asyncio.run(cancel_trial())
+    assert breaker.state == "half-open"
+
+
+def test_calls_past_the_concurrency_limit_are_shed(monkeypatch, breaker, upstream):
+    async def fetch_while_upstream_is_slow():
+        monkeypatch.setattr(ai_quote, "_upstream_slots", asyncio.Semaphore(2))
+        upstream.release = asyncio.Event()
+        slow = [asyncio.create_task(ai_quote._fetch_quote(["Run"])) for _ in range(2)]
+        while upstream.calls < 2:
+            await asyncio.sleep(0)
+
+        # bounded, a call that queued for a slot instead would wait for the slow ones forever
+        shed = await asyncio.wait_for(ai_quote._fetch_quote(["Run"]), timeout=1)
+        # a background refill waits for a slot instead of falling back
+        queued = asyncio.create_task(ai_quote._fetch_quote(["Run"], wait_for_slot=True))
+        await asyncio.sleep(0)
+        calls_while_full = upstream.calls
+
+        upstream.release.set()
+        return shed, calls_while_full, await asyncio.gather(*slow, queued)
+
+    shed, calls_while_full, answered = asyncio.run(fetch_while_upstream_is_slow())
+    assert shed is None
+    assert calls_while_full == 2
+    assert answered == [{"quote": "Keep going.", "author": "Someone"}] * 3
+    assert upstream.calls == 3
+    assert breaker.state == "closed"
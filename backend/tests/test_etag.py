@@ -0,0 +1,33 @@
+from datetime import date
+
+from sqlalchemy import update
+
+from backend.app import models
+
+TODAY = "2025-03-10"
+
+
+def _write_in_another_worker(db, habit_id: int):
+    # commits and bumps the data version like crud does, but this worker's insight cache is never invalidated
+    db.add(models.HabitEntry(habit_id=habit_id, date=date(2025, 3, 9), value=1, is_completed=True))
+    db.execute(update(models.DataVersion).values(version=models.DataVersion.version + 1))
+    db.commit()
+
+
+def test_body_is_never_older_than_its_etag(client, db):
+    habit = client.post("/api/habits", json={"name": "Run", "type": "simple", "color": "#1677ff"}).json()
+    client.post("/api/entry", json={"habit_id": habit["id"], "date": TODAY, "value": 1})
+    url = f"/api/insights/{habit['id']}/stats"
+
+    first = client.get(url, params={"today_date": TODAY})
+    assert first.json()["total_completions"] == 1
+
+    _write_in_another_worker(db, habit["id"])
+
+    second = client.get(url, params={"today_date": TODAY}, headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 200
+    assert second.headers["ETag"] != first.headers["ETag"]
+    assert second.json()["total_completions"] == 2
+
+    third = client.get(url, params={"today_date": TODAY}, headers={"If-None-Match": second.headers["ETag"]})
+    assert third.status_code == 304
@@ -0,0 +1,67 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import date
+
+import pytest
+
+from backend.app.schemas import ExportJobStatus, ReportPeriod
+from backend.app.services import export_jobs
+
+TODAY = date(2025, 3, 10)
+
+
+class FinishedExecutor:
+    """Hands back futures that are already done, like a job failing while the pool spawns."""
+
+    def __init__(self, cancel: bool = False):
+        self.cancel = cancel
+        self.submitted = 0
+
+    def submit(self, _fn, *_args) -> Future:
+        self.submitted += 1
+        future = Future()
+        if self.cancel:
+            future.cancel()
+        else:
+            future.set_exception(RuntimeError("pool process died"))
+        return future
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    executor = FinishedExecutor()
+    monkeypatch.setattr(export_jobs, "_get_executor", lambda: executor)
+    monkeypatch.setattr(export_jobs, "_running_jobs", {})
+    monkeypatch.setattr(export_jobs, "_failed_jobs", OrderedDict())
+    return executor
+
+
+def _submit_with_timeout(data_version: int) -> str:
+    job_ids = []
+    submitter = threading.Thread(target=lambda: job_ids.append(export_jobs.submit_job(TODAY, ReportPeriod.WEEK, data_version)), daemon=True)
+    submitter.start()
+    submitter.join(timeout=5)
+    assert not submitter.is_alive(), "submit_job deadlocked on a job that finished at submission"
+    return job_ids[0]
+
+
+@pytest.mark.parametrize("cancel", [False, True])
+def test_job_done_at_submission_is_forgotten_and_reported_failed(executor, cancel):
+    executor.cancel = cancel
+    job_id = _submit_with_timeout(1)
+
+    assert export_jobs._running_jobs == {}
+    assert export_jobs.get_job_status(job_id) == ExportJobStatus.FAILED
+
+    # resubmitting retries the job
+    assert _submit_with_timeout(1) == job_id
+    assert executor.submitted == 2
+
+
+def test_failed_jobs_are_bounded(executor, monkeypatch):
+    monkeypatch.setattr(export_jobs, "MAX_FAILED_JOBS", 3)
+    job_ids = [_submit_with_timeout(data_version) for data_version in range(5)]
+
+    assert list(export_jobs._failed_jobs) == job_ids[-3:]
+    assert export_jobs.get_job_status(job_ids[0]) is None
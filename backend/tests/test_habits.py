@@ -0,0 +1,44 @@
+import pytest
+
+from backend.app import crud, models
+from backend.app.database import SessionLocal
+
+
+@pytest.fixture
+def delete_after_next_load(monkeypatch):
+    # another request deletes the habit between the router loading it and the update committing
+    get_habit = crud.get_habit
+
+    def arm():
+        def get_then_delete(db, habit_id: int):
+            monkeypatch.setattr(crud, "get_habit", get_habit)
+            habit = get_habit(db, habit_id)
+            with SessionLocal() as other_db:
+                crud.delete_habit(other_db, get_habit(other_db, habit_id))
+            return habit
+
+        monkeypatch.setattr(crud, "get_habit", get_then_delete)
+
+    return arm
+
+
+@pytest.mark.parametrize("habit, update", [
+    (
+        {"name": "Run", "type": "simple", "color": "#1677ff"},
+        {"name": "Jog", "type": "simple", "color": "#000000"},
+    ),
+    (
+        {"name": "Read", "type": "measurable", "color": "#1677ff", "target": 20, "unit": "pages"},
+        {"name": "Read", "type": "measurable", "color": "#1677ff", "target": 30, "unit": "pages"},
+    ),
+])
+def test_update_of_a_habit_deleted_meanwhile_is_not_found(client, db, habit, update, delete_after_next_load):
+    habit_id = client.post("/api/habits", json=habit).json()["id"]
+    client.post("/api/entry", json={"habit_id": habit_id, "date": "2025-03-10", "value": 25})
+
+    delete_after_next_load()
+    response = client.put(f"/api/habits/{habit_id}", json=update)
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Habit not found"}
+    assert db.get(models.Habit, habit_id) is None
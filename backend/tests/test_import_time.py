@@ -0,0 +1,20 @@
+import statistics
+
+from backend.bench import import_time
+
+RUNS = 3
+# loaded by the quote client, the export pool processes and the numpy engine, never by the API process at startup
+FIRST_USE_MODULES = ["httpx", "reportlab", "numpy"]
+
+
+def test_app_imports_within_budget_without_first_use_modules():
+    # a fresh `python -X importtime -c "import backend.app.main"` per run, the first one compiles bytecode
+    import_time._import_times()
+    runs = [import_time._import_times() for _ in range(RUNS)]
+
+    median_ms = statistics.median(import_time._app_import_ms(rows) for rows in runs)
+    assert median_ms < import_time.BUDGET_MS
+
+    for rows in runs:
+        imported = {name for _self_us, _cumulative_us, _depth, name in rows}
+        assert [module for module in FIRST_USE_MODULES if module in imported] == []
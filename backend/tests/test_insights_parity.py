@@ -0,0 +1,80 @@
+import os
+import random
+from datetime import date, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from backend.app import insights, insights_numpy
+from backend.bench.seed import create_bench_database
+
+HABITS = 6
+DAYS = 400
+END_DATE = date(2025, 12, 31)
+CASES = 25
+
+
+@pytest.fixture(scope="module")
+def seeded_db():
+    session_factory, engine, path = create_bench_database(habit_count=HABITS, days=DAYS, end_date=END_DATE, seed=11)
+    try:
+        with session_factory() as session:
+            yield session
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+def _window(rng: random.Random) -> tuple[date, date]:
+    # may start before the first entry and end after the last one
+    start_date = END_DATE - timedelta(days=rng.randrange(DAYS + 30))
+    return start_date, start_date + timedelta(days=rng.randrange(1, 120))
+
+
+def _cases(fn_name: str):
+    rng = random.Random(fn_name)
+    # the id past the last habit checks the "habit not found" behaviour of both engines
+    for habit_id in range(1, HABITS + 2):
+        for _ in range(CASES):
+            start_date, end_date = _window(rng)
+            if fn_name == "get_habit_streaks_and_total_completions":
+                yield {"habit_id": habit_id, "today_date": END_DATE - timedelta(days=rng.randrange(-3, DAYS))}
+            elif fn_name == "get_habit_chart_data":
+                yield {"habit_id": habit_id, "view": rng.choice(["weekly", "monthly"]), "start_date": start_date, "end_date": end_date}
+            elif fn_name == "get_habit_details":
+                # the numpy engine loads every entry once and filters both windows itself
+                heatmap_start_date, heatmap_end_date = _window(rng)
+                today_date = END_DATE - timedelta(days=rng.randrange(-3, DAYS))
+                for chart_view in ["weekly", "monthly"]:
+                    yield {
+                        "habit_id": habit_id,
+                        "today_date": today_date,
+                        "chart_view": chart_view,
+                        "chart_start_date": start_date,
+                        "chart_end_date": end_date,
+                        "heatmap_start_date": heatmap_start_date,
+                        "heatmap_end_date": heatmap_end_date,
+                    }
+            else:
+                yield {"habit_id": habit_id, "start_date": start_date, "end_date": end_date}
+
+
+def _outcome(fn, db, kwargs):
+    # the response, or the status and detail of the error both engines must raise alike
+    try:
+        return fn(db, **kwargs)
+    except HTTPException as error:
+        return error.status_code, error.detail
+
+
+@pytest.mark.parametrize("fn_name", [
+    "get_habit_streaks_and_total_completions",
+    "get_habit_chart_data",
+    "get_habit_heatmap_data",
+    "get_habit_details",
+])
+def test_numpy_engine_matches_sql_engine(seeded_db, fn_name):
+    # __wrapped__ skips the response cache, both engines compute every case
+    sql_fn, numpy_fn = getattr(insights, fn_name).__wrapped__, getattr(insights_numpy, fn_name).__wrapped__
+    for kwargs in _cases(fn_name):
+        assert _outcome(numpy_fn, seeded_db, kwargs) == _outcome(sql_fn, seeded_db, kwargs), kwargs
@@ -0,0 +1,45 @@
+from datetime import date
+
+import pytest
+
+from backend.app import schemas
+from backend.app.services import pdf_report
+
+TODAY = date(2025, 3, 10)
+
+
+@pytest.fixture
+def built_paragraphs(monkeypatch):
+    paragraphs = []
+
+    class RecordingDocTemplate(pdf_report.SimpleDocTemplate):
+        def build(self, flowables, *args, **kwargs):
+            paragraphs.extend(flowable.text for flowable in flowables if isinstance(flowable, pdf_report.Paragraph))
+            return super().build(flowables, *args, **kwargs)
+
+    monkeypatch.setattr(pdf_report, "SimpleDocTemplate", RecordingDocTemplate)
+    return paragraphs
+
+
+@pytest.mark.parametrize("period, title", [
+    (schemas.ReportPeriod.WEEK, "Habit Insights Report - 10th March 2025"),
+    (schemas.ReportPeriod.MONTH, "Monthly Habit Report - March 2025"),
+    (schemas.ReportPeriod.YEAR, "Yearly Habit Report - 2025"),
+])
+def test_error_page_keeps_the_report_header(db, monkeypatch, built_paragraphs, period, title):
+    def fail(*_args):
+        raise RuntimeError("database is locked <busy>")
+
+    monkeypatch.setattr(pdf_report, "build_report_data", fail)
+    pdf = pdf_report.create_full_report(db, TODAY, period)
+
+    assert pdf.startswith(b"%PDF")
+    assert built_paragraphs[0] == title
+    assert built_paragraphs[1].startswith("<b>Period:</b>")
+    assert "database is locked &lt;busy&gt;" in built_paragraphs[-1]
+
+
+def test_report_starts_with_the_same_header(db, built_paragraphs):
+    pdf_report.create_full_report(db, TODAY, schemas.ReportPeriod.MONTH)
+
+    assert built_paragraphs[:2] == ["Monthly Habit Report - March 2025", "<b>Period:</b> 1st March 2025 - 10th March 2025"]
@@ -0,0 +1,39 @@
+import pytest
+
+from backend.app import profiling
+
+TOKEN = "s3cret"
+
+
+@pytest.fixture(autouse=True)
+def profiling_token(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILING_TOKEN", TOKEN)
+
+
+def _scope(client="127.0.0.1", headers=(), query=b""):
+    return {"type": "http", "client": (client, 50000), "headers": list(headers), "query_string": query}
+
+
+@pytest.mark.parametrize("scope", [
+    _scope(headers=[(b"x-profile", b"1"), (b"x-profile-token", b"s3cret")]),
+    _scope(headers=[(b"x-profile-token", b"s3cret")], query=b"profile=1"),
+])
+def test_flagged_request_with_the_token_is_profiled(scope):
+    assert profiling._profile_requested(scope)
+
+
+@pytest.mark.parametrize("scope", [
+    # the peer address of a proxied request is the proxy's, an allowed IP alone is not enough
+    _scope(headers=[(b"x-profile", b"1")]),
+    _scope(query=b"profile=1"),
+    _scope(headers=[(b"x-profile", b"1"), (b"x-profile-token", b"wrong")]),
+    _scope(headers=[(b"x-profile-token", b"s3cret")]),
+    _scope(client="203.0.113.7", headers=[(b"x-profile", b"1"), (b"x-profile-token", b"s3cret")]),
+])
+def test_request_without_flag_token_or_allowed_peer_is_not_profiled(scope):
+    assert not profiling._profile_requested(scope)
+
+
+def test_nothing_is_profiled_without_a_configured_token(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILING_TOKEN", "")
+    assert not profiling._profile_requested(_scope(headers=[(b"x-profile", b"1"), (b"x-profile-token", b"")]))
@@ -0,0 +1,101 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from backend.app import rate_limiter
+from backend.app.rate_limiter import (
+    Acquire,
+    RateLimiter,
+    RateLimitExceeded,
+    RateLimitStoreUnavailable,
+    SqliteRateLimitStore,
+    parse_rate,
+)
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    monkeypatch.setattr(SqliteRateLimitStore, "BUSY_TIMEOUT_SECONDS", 0.2)
+    store = SqliteRateLimitStore(str(tmp_path / "rate-limits.db"))
+    store.reset()
+    return store
+
+
+@pytest.fixture
+def locked_store(store):
+    # another worker holding the write lock for longer than the busy timeout
+    other_worker = sqlite3.connect(store.path, isolation_level=None)
+    other_worker.execute("BEGIN IMMEDIATE")
+    yield store
+    other_worker.execute("ROLLBACK")
+    other_worker.close()
+
+
+def _limited_route(limiter: RateLimiter):
+    @limiter.limit("10/minute")
+    async def route(request):
+        return "served"
+
+    return route
+
+
+def test_contended_store_is_unavailable_instead_of_erroring(locked_store):
+    with pytest.raises(RateLimitStoreUnavailable):
+        locked_store.acquire([Acquire("203.0.113.7:route", parse_rate("10/minute"), 1)])
+    assert not locked_store._connection().in_transaction
+
+
+def test_limiter_waits_for_a_contended_store_off_the_event_loop(locked_store):
+    route = _limited_route(RateLimiter(lambda request: "203.0.113.7", locked_store, "300/minute", fail_open=True))
+
+    async def serve_while_ticking():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        served = await route(request=None)
+        ticker.cancel()
+        return served, ticks
+
+    served, ticks = asyncio.run(serve_while_ticking())
+    assert served == "served"
+    # the loop kept running other work for most of the 0.2 s busy timeout
+    assert ticks >= 5
+
+
+def test_limiter_failing_closed_rejects_with_a_retry_after(locked_store):
+    route = _limited_route(RateLimiter(lambda request: "203.0.113.7", locked_store, "300/minute", fail_open=False))
+
+    with pytest.raises(RateLimitExceeded) as exc_info:
+        asyncio.run(route(request=None))
+    assert exc_info.value.retry_after == 1
+
+
+@pytest.mark.parametrize("fail_open, status_code", [(True, 200), (False, 429)])
+def test_limited_route_with_a_contended_store(monkeypatch, client, locked_store, fail_open, status_code):
+    monkeypatch.setattr(rate_limiter.global_rate_limiter, "store", locked_store)
+    monkeypatch.setattr(rate_limiter.global_rate_limiter, "enabled", True)
+    monkeypatch.setattr(rate_limiter.global_rate_limiter, "fail_open", fail_open)
+
+    response = client.post("/api/habits", json={"name": "Run", "type": "simple", "color": "#1677ff"})
+
+    assert response.status_code == status_code, response.text
+    if status_code == 429:
+        assert response.headers["Retry-After"] == "1"
+
+
+def test_limiter_charges_the_sqlite_store_once_it_is_free(store):
+    route = _limited_route(RateLimiter(lambda request: "203.0.113.7", store, "300/minute"))
+
+    async def serve(count):
+        return [await route(request=None) for _ in range(count)]
+
+    assert asyncio.run(serve(10)) == ["served"] * 10
+    with pytest.raises(RateLimitExceeded):
+        asyncio.run(serve(1))
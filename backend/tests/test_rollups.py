@@ -0,0 +1,16 @@
+from datetime import date
+
+from backend.app import models
+
+DAY = "2025-03-10"
+
+
+def test_rollup_counts_the_entries_of_the_day(client, db):
+    run = client.post("/api/habits", json={"name": "Run", "type": "simple", "color": "#1677ff"}).json()
+    read = client.post("/api/habits", json={"name": "Read", "type": "measurable", "color": "#1677ff", "target": 20, "unit": "pages"}).json()
+    client.post("/api/habits", json={"name": "Idle", "type": "simple", "color": "#1677ff"})
+    client.post("/api/entry", json={"habit_id": run["id"], "date": DAY, "value": 1})
+    client.post("/api/entry", json={"habit_id": read["id"], "date": DAY, "value": 5})
+
+    rollup = db.get(models.DailyRollup, date.fromisoformat(DAY))
+    assert (rollup.entry_count, rollup.completed_count, rollup.completion_sum) == (2, 1, 125.0)
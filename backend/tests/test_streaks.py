@@ -0,0 +1,42 @@
+from datetime import date
+
+from sqlalchemy import event, func, select
+
+from backend.app import models, streaks
+
+TODAY = date(2025, 3, 10)
+
+
+def _summary_count(db) -> int:
+    return db.scalar(select(func.count()).select_from(models.StreakSummary))
+
+
+def test_unknown_habit_reads_write_nothing(db):
+    statements = []
+    engine = db.get_bind()
+
+    def record(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        assert streaks.get_summary(db, 999) is None
+        assert streaks.get_streaks(db, 999, TODAY) == (0, 0)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert statements and all(statement.lstrip().upper().startswith(("SELECT", "WITH")) for statement in statements)
+    assert _summary_count(db) == 0
+
+
+def test_created_habit_has_a_summary_kept_by_writes(client, db):
+    habit = client.post("/api/habits", json={"name": "Read", "type": "simple", "color": "#1677ff"}).json()
+    assert streaks.get_summary(db, habit["id"]).longest_run_length == 0
+
+    for day in (8, 9, 10):
+        response = client.post("/api/entry", json={"habit_id": habit["id"], "date": f"2025-03-{day:02d}", "value": 1})
+        assert response.status_code == 200
+
+    db.expire_all()
+    assert streaks.get_streaks(db, habit["id"], TODAY) == (3, 3)
+    assert streaks.get_streaks(db, None, TODAY) == (3, 3)